@@ -0,0 +1,23 @@
+import pytest
+
+# pytest puts this directory on sys.path (no package __init__ here), so tests import `src.<module>` like the scripts do
+
+
+def make_graph(backend: str = "csr", num_nodes: int = 400, avg_degree: float = 10.0, public_fraction: float = 0.2,
+               seed: int = 3):
+    """
+    SocialGraph over a seeded power-law graph, on either backend, with the
+    highest-degree `public_fraction` of nodes public.
+    """
+    from src.model import SocialGraph
+    from src.utils import generate_power_law_graph
+    base = generate_power_law_graph(num_nodes, avg_degree=avg_degree, seed=seed)
+    graph = SocialGraph(public_fraction=public_fraction, backend=backend)
+    graph.graph = base if backend == "csr" else base.to_networkx()
+    graph._select_public_nodes()
+    return graph
+
+
+@pytest.fixture(params=["networkx", "csr"])
+def social_graph(request):
+    return make_graph(request.param)
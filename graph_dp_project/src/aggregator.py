@@ -0,0 +1,45 @@
+import sys
+import os
+import asyncio
+
+# Add src to path when run as a script
+if not __package__:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.collection import AggregatorServer, run_load
+
+
+async def serve(host: str, port: int, path, budget):
+    server = AggregatorServer(budget=budget)
+    address = await server.start(host, port, path)
+    print(f"Aggregator listening on {address}")
+    await server.serve_forever()
+
+
+def load(clients: int, connections: int, batch_size: int, linger: float, policy: str, epsilon: float, address,
+         seed):
+    from src.model import SocialGraph, VisibilityOracle
+    from src.utils import generate_power_law_graph
+    # One simulated user per node of a synthetic power-law graph
+    graph = SocialGraph(public_fraction=0.2, backend="csr", seed=seed)
+    graph.graph = generate_power_law_graph(clients, seed=seed)
+    graph._select_public_nodes()
+    stats = graph.local_statistics(VisibilityOracle(policy=policy))
+    queries = [{"query": "edge_count", "epsilon": epsilon}, {"query": "triangle_count", "epsilon": epsilon},
+               {"query": "k_star_count_smooth", "epsilon": epsilon, "k": 2},
+               {"query": "degree_histogram", "epsilon": epsilon}, {"query": "max_degree", "epsilon": epsilon}]
+    stats.prefetch([("degree",), ("triangles", 50), ("k_stars", 2, None), ("k_stars", 1, None)])
+    report = asyncio.run(run_load(stats, queries, connections, batch_size, linger, address, seed))
+    print(f"{report['clients']} clients over {connections} connections: {report['reports']} reports, "
+          f"{report['reports_per_s']:.0f} reports/s")
+    for spec, result, latency in zip(queries, report["results"], report["latency_s"]):
+        estimate = sum(result["estimate"]) if isinstance(result["estimate"], list) else result["estimate"]
+        print(f"  {spec['query']:<22} {result['reports']:>8} reports  open-to-release {latency * 1e3:8.1f}ms  "
+              f"estimate {estimate:.1f}")
+    return report
+
+
+if __name__ == "__main__":
+    # Same subcommands as `graphdp serve` and `graphdp load`
+    from src.cli import main
+    sys.exit(main(sys.argv[1:]))
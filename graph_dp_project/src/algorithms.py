@@ -1,38 +1,90 @@
 import numpy as np
-import networkx as nx
-from typing import Dict, List, Callable, Tuple
+from typing import TYPE_CHECKING, Dict, List, Callable, Optional, Tuple
 from .model import SocialGraph, VisibilityOracle
-from .utils import laplace_mechanism
+from .utils import laplace_mechanism_batch, histogram_counts
+from .kstars import clipped_sensitivity, k_star_counts
+from .local_stats import NEIGHBORHOOD_POLICIES
+from .parallel import ParallelExecutor, DEFAULT_SHARD_SIZE
+from .profiling import PhaseProfiler, timed_phase
+from . import analytic
+from .analytic import DEFAULT_QUANTILES
 import math
 
+if TYPE_CHECKING:
+    import networkx as nx
+
+# Queries accepted by GraphDPAlgorithms.run_queries
+QUERY_METHODS = ("edge_count", "degree_histogram", "triangle_count", "triangle_count_smooth", "k_star_count",
+                 "k_star_count_smooth", "max_degree", "k_star_count_two_round")
+
 class GraphDPAlgorithms:
-    def __init__(self, graph: SocialGraph, oracle: VisibilityOracle):
+    def __init__(self, graph: SocialGraph, oracle: VisibilityOracle, seed: Optional[int] = None,
+                 workers: Optional[int] = None, shard_size: int = DEFAULT_SHARD_SIZE,
+                 profiler: Optional[PhaseProfiler] = None):
         self.graph = graph
         self.oracle = oracle
+        # Single generator for all noise draws; a fixed seed makes releases reproducible
+        self.rng = np.random.default_rng(seed)
+        # workers=N shards nodes across N processes (see parallel.py); None runs in-process
+        self.workers = workers
+        self.shard_size = shard_size
+        self._executor = None
+        self._executor_key = None
+        # Optional per-phase timing (profiling.py); None keeps every query on its untimed path
+        self.profiler = profiler
+        # Variance breakdown of the last sampled triangle release (wedge_samples=...)
+        self.last_error: Optional[Dict] = None
+
+    def close(self):
+        """
+        Shuts down the worker pool and frees its shared memory, if one was started.
+        """
+        if self._executor is not None:
+            self._executor.close()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _run_parallel(self, kind: str, epsilon: float, **params) -> Dict:
+        if self.oracle.policy not in NEIGHBORHOOD_POLICIES:
+            raise ValueError(f"Parallel execution supports the {NEIGHBORHOOD_POLICIES} policies, got {self.oracle.policy}")
+        key = self.graph._fingerprint()
+        if self._executor is None or self._executor_key != key:
+            self.close()
+            self._executor = ParallelExecutor(self.graph, self.oracle, self.workers, self.shard_size)
+            self._executor_key = key
+        # Per-call root seed drawn from self.rng; shards spawn their streams from it
+        seed = np.random.SeedSequence(int(self.rng.integers(2**63)))
+        with timed_phase(self.profiler, "parallel"):
+            return self._executor.run(kind, epsilon, seed, **params)
 
-    def _aggregate_local_queries(self, query_func: Callable[[nx.Graph, int], float], epsilon: float, sensitivity: float) -> float:
+    @property
+    def stats(self):
+        """
+        Shared per-graph/per-oracle local statistics (computed once, reused across queries).
+        """
+        return self.graph.local_statistics(self.oracle)
+
+    def _release(self, true_vals: np.ndarray, sensitivity, epsilon: float) -> np.ndarray:
+        # Noise step shared by every query: Laplace on private nodes, exact public values
+        with timed_phase(self.profiler, "noise", len(true_vals)):
+            return laplace_mechanism_batch(true_vals, sensitivity, epsilon, self.stats.public_mask, self.rng)
+
+    def _aggregate_local_queries(self, query_func: Callable[["nx.Graph", int], float], epsilon: float, sensitivity: float) -> float:
         """
         Generic aggregator for local queries.
         """
-        total_estimate = 0.0
-        nodes = list(self.graph.graph.nodes())
-        
-        for node in nodes:
-            # 1. Get visible subgraph
-            subgraph = self.graph.get_visible_subgraph(node, self.oracle)
-            
-            # 2. Compute local function
-            true_val = query_func(subgraph, node)
-            
-            # 3. Add noise (ONLY if node is PRIVATE)
-            if self.graph.is_public(node):
-                noisy_val = true_val
-            else:
-                noisy_val = laplace_mechanism(true_val, sensitivity, epsilon)
-            
-            total_estimate += noisy_val
-            
-        return total_estimate
+        stats = self.stats
+        # 1. Get visible subgraph, 2. compute local function (timed per observer when profiling)
+        true_vals = np.array(stats.map_views(lambda i, node, subgraph: query_func(subgraph, node), self.profiler),
+                             dtype=float)
+
+        # 3. Add noise (ONLY to PRIVATE nodes) in one vectorized draw
+        return float(self._release(true_vals, sensitivity, epsilon).sum())
 
     def edge_count(self, epsilon: float) -> Tuple[float, float]:
         """
@@ -40,11 +92,11 @@ class GraphDPAlgorithms:
         Returns (estimate, sensitivity).
         """
         sensitivity = 1.0
-        
-        def local_degree(subgraph: nx.Graph, node: int) -> float:
-            return float(subgraph.degree(node)) if node in subgraph else 0.0
+        if self.workers is not None:
+            return self._run_parallel("edge_count", epsilon)["sum"] / 2.0, sensitivity
 
-        total_degree_noisy = self._aggregate_local_queries(local_degree, epsilon, sensitivity)
+        true_degrees = self.stats.degrees(self.profiler).astype(float)
+        total_degree_noisy = float(self._release(true_degrees, sensitivity, epsilon).sum())
         return total_degree_noisy / 2.0, sensitivity
 
     def degree_histogram(self, epsilon: float, max_degree: int = 50) -> Tuple[List[float], float]:
@@ -52,188 +104,296 @@ class GraphDPAlgorithms:
         Estimates degree histogram.
         Returns (histogram, sensitivity).
         """
-        # Simplified: Each user reports their degree (clamped).
-        # We build a histogram from these noisy degrees.
-        # Sensitivity of reporting degree is 1.
+        # Each user reports their degree clamped to max_degree (sensitivity 1);
+        # the noisy reports are binned into unit bins 0..max_degree.
         sensitivity = 1.0
-        
-        noisy_degrees = []
-        nodes = list(self.graph.graph.nodes())
-        
-        for node in nodes:
-            # 1. Get visible subgraph
-            subgraph = self.graph.get_visible_subgraph(node, self.oracle)
-            
-            # 2. Compute local degree
-            true_d = subgraph.degree(node) if node in subgraph else 0
-            true_d = min(true_d, max_degree)
-            
-            # 3. Add noise
-            if self.graph.is_public(node):
-                noisy_d = true_d
-            else:
-                noisy_d = laplace_mechanism(true_d, sensitivity, epsilon)
-            
-            noisy_degrees.append(noisy_d)
-            
-        # Build histogram
-        hist, _ = np.histogram(noisy_degrees, bins=range(max_degree + 2))
-        return hist.tolist(), sensitivity
-
-    def k_star_count(self, k: int, epsilon: float) -> Tuple[float, float]:
-        """
-        Estimates number of k-stars.
+        if self.workers is not None:
+            result = self._run_parallel("degree_histogram", epsilon, max_degree=max_degree)
+            return result["hist"].tolist(), sensitivity
+
+        true_degrees = np.minimum(self.stats.degrees(self.profiler), max_degree).astype(float)
+        noisy_degrees = self._release(true_degrees, sensitivity, epsilon)
+
+        return histogram_counts(noisy_degrees, max_degree).tolist(), sensitivity
+
+    def k_star_count(self, k: int, epsilon: float, D_max: int = 50) -> Tuple[float, float]:
+        """
+        Estimates number of k-stars with a fixed degree bound D_max
+        (see k_star_count_two_round for a data-dependent bound).
         Returns (estimate, sensitivity).
         """
-        D_max = 50 
-        sensitivity = math.comb(D_max - 1, k - 1)
-        
-        def local_k_star(subgraph: nx.Graph, node: int) -> float:
-            d = subgraph.degree(node) if node in subgraph else 0
-            
-            # Optimization: No clipping for public nodes
-            if not self.graph.is_public(node):
-                d = min(d, D_max)
-                
-            if d < k:
-                return 0.0
-            return math.comb(d, k)
-
-        total_k_stars = self._aggregate_local_queries(local_k_star, epsilon, sensitivity)
+        sensitivity = clipped_sensitivity(D_max, k)
+        if self.workers is not None:
+            return self._run_parallel("k_star_count", epsilon, k=k, D_max=D_max)["sum"], sensitivity
+
+        # Optimization: No clipping for public nodes
+        true_vals = self.stats.k_stars(k, clip=D_max, profiler=self.profiler)
+
+        total_k_stars = float(self._release(true_vals, sensitivity, epsilon).sum())
         return total_k_stars, sensitivity
 
+    def _noisy_degrees(self, epsilon: float, nodes: Optional[np.ndarray] = None) -> np.ndarray:
+        # One batched release of visible degrees (sensitivity 1); public degrees stay exact
+        stats = self.stats
+        degrees = stats.degrees(self.profiler).astype(float)
+        public = stats.public_mask
+        if nodes is not None:
+            degrees, public = degrees[nodes], public[nodes]
+        with timed_phase(self.profiler, "noise", len(degrees)):
+            return laplace_mechanism_batch(degrees, 1.0, epsilon, public, self.rng)
+
+    def max_degree(self, epsilon: float, num_candidates: int = 10, round1_fraction: float = 0.5) -> Tuple[float, float]:
+        """
+        Two-round max degree (algorithms.md §4, node-level Laplace form).
+        Round 1 spends round1_fraction * epsilon on noisy degrees for all nodes and
+        keeps the top `num_candidates`; round 2 spends the rest on fresh noisy
+        degrees of those candidates only and returns their maximum.
+        Returns (estimate, sensitivity).
+        """
+        eps1 = epsilon * round1_fraction
+        eps2 = epsilon - eps1
+        n = len(self.stats.nodes)
+        if n == 0:
+            return 0.0, 1.0
+        noisy = self._noisy_degrees(eps1)
+        num_candidates = min(num_candidates, n)
+        candidates = np.argpartition(-noisy, num_candidates - 1)[:num_candidates]
+        confirmed = self._noisy_degrees(eps2, candidates)
+        return float(np.clip(confirmed.max(), 0, n - 1)), 1.0
+
+    def noisy_degree_bound(self, epsilon: float, quantile: float = 1.0) -> int:
+        """
+        Round 1 of the two-round k-star protocol: a clipping bound taken as the
+        `quantile` of the private nodes' degrees, released with budget `epsilon`.
+        Public nodes are never clipped, so their exact degrees (often the hubs)
+        play no part in the bound and spend no budget. A graph without private
+        nodes takes the quantile of its exact public degrees instead.
+        """
+        private = np.flatnonzero(~self.stats.public_mask)
+        noisy = self._noisy_degrees(epsilon, private if len(private) else None)
+        if len(noisy) == 0:
+            return 1
+        return max(1, int(np.ceil(np.quantile(noisy, quantile))))
+
+    def k_star_count_two_round(self, k: int, epsilon: float, round1_fraction: float = 0.5,
+                               quantile: float = 1.0) -> Tuple[float, float]:
+        """
+        Two-round k-stars (algorithms.md §6, node-level Laplace form).
+        Round 1 (round1_fraction * epsilon) picks the degree bound D from the
+        private nodes' noisy degrees (noisy_degree_bound);
+        round 2 (the remaining budget) releases clipped k-stars C(min(d, D), k)
+        with sensitivity C(D-1, k-1). Public nodes are never clipped.
+        Returns (estimate, sensitivity).
+        """
+        eps1 = epsilon * round1_fraction
+        eps2 = epsilon - eps1
+        D_max = max(k, self.noisy_degree_bound(eps1, quantile))
+        sensitivity = clipped_sensitivity(D_max, k)
+
+        stats = self.stats
+        degrees = stats.degrees(self.profiler)
+        with timed_phase(self.profiler, "local_compute", len(degrees)):
+            true_vals = k_star_counts(degrees, k, D_max, stats.public_mask)
+        return float(self._release(true_vals, sensitivity, eps2).sum()), sensitivity
+
     def k_star_count_smooth(self, k: int, epsilon: float) -> Tuple[float, float]:
         """
         Estimates k-stars using Instance-Specific Sensitivity.
         Sensitivity for node u is comb(degree(u), k-1).
         For k=2, Sensitivity = degree(u).
         """
-        import math
-        
-        def local_k_star_smooth(subgraph: nx.Graph, node: int) -> float:
-            d = subgraph.degree(node) if node in subgraph else 0
-            # No clipping
-            if d < k:
-                return 0.0
-            return math.comb(d, k)
-
-        total_estimate = 0.0
-        nodes = list(self.graph.graph.nodes())
-        avg_sensitivity = 0.0
-        
-        for node in nodes:
-            subgraph = self.graph.get_visible_subgraph(node, self.oracle)
-            true_val = local_k_star_smooth(subgraph, node)
-            
-            # Calculate Instance-Specific Sensitivity
-            d = subgraph.degree(node) if node in subgraph else 0
-            if d < k - 1:
-                local_sens = 1.0 # Min sensitivity
-            else:
-                local_sens = float(math.comb(d, k - 1))
-            
-            local_sens = max(1.0, local_sens)
-            avg_sensitivity += local_sens
-            
-            if self.graph.is_public(node):
-                noisy_val = true_val
-            else:
-                noisy_val = laplace_mechanism(true_val, local_sens, epsilon)
-            
-            total_estimate += noisy_val
-            
-        return total_estimate, avg_sensitivity / len(nodes)
-
-    def triangle_count_smooth(self, epsilon: float) -> Tuple[float, float]:
+        if self.workers is not None:
+            result = self._run_parallel("k_star_count_smooth", epsilon, k=k)
+            return result["sum"], result["sens_sum"] / result["n"]
+
+        # No clipping
+        true_vals = self.stats.k_stars(k, profiler=self.profiler)
+
+        with timed_phase(self.profiler, "sensitivity", len(true_vals)):
+            # Instance-Specific Sensitivity: comb(d, k-1), at least 1
+            local_sens = np.maximum(1.0, self.stats.k_stars(k - 1, profiler=self.profiler))
+
+        noisy_vals = self._release(true_vals, local_sens, epsilon)
+        return float(noisy_vals.sum()), float(local_sens.sum()) / len(true_vals)
+
+    def _sampled_triangle_release(self, epsilon: float, wedge_samples: int, clip: Optional[int],
+                                  sensitivity) -> Tuple[float, float]:
+        """
+        Approximate path of triangle_count / triangle_count_smooth: local counts
+        are estimated from at most `wedge_samples` neighbor pairs per node
+        (LocalStatistics.sampled_triangles), always in-process. Private nodes'
+        sensitivity is scaled by their weight W/checked, the estimate's change
+        when one checked pair flips. NOT differentially private: an edge change
+        also alters an endpoint's W and with it the weight and the pairs that can
+        be drawn, which no scaled sensitivity bounds, so this is an accuracy/speed
+        experiment only and is not offered by the CLI. Records the variance
+        breakdown of the released total in self.last_error.
+        Returns (estimate, mean per-node sensitivity).
+        """
+        stats = self.stats
+        estimates, sampling_var, weights = stats.sampled_triangles(wedge_samples, self.rng, clip, self.profiler)
+        with timed_phase(self.profiler, "sensitivity", len(estimates)):
+            local_sens = np.broadcast_to(np.asarray(sensitivity, dtype=float), estimates.shape) * weights
+        noisy_vals = self._release(estimates, local_sens, epsilon)
+
+        # Sampling draws and Laplace noise are independent, so variances add (total = sum / 3)
+        private = ~stats.public_mask
+        laplace_var = float((2.0 * (local_sens[private] / epsilon) ** 2).sum()) / 9.0
+        sample_var = float(sampling_var.sum()) / 9.0
+        self.last_error = {
+            "wedge_samples": wedge_samples,
+            "sampled_nodes": int((weights > 1.0).sum()),
+            "sampling_variance": sample_var,
+            "laplace_variance": laplace_var,
+            "variance": sample_var + laplace_var,
+            "std": math.sqrt(sample_var + laplace_var),
+        }
+        return float(noisy_vals.sum()) / 3.0, float(local_sens.sum()) / max(len(local_sens), 1)
+
+    def triangle_count_smooth(self, epsilon: float, wedge_samples: Optional[int] = None) -> Tuple[float, float]:
         """
         Estimates triangles using a "Smooth Sensitivity"-like approach for LDP.
-        Instead of clipping at D_max (Global Sensitivity), we scale noise 
+        Instead of clipping at D_max (Global Sensitivity), we scale noise
         based on the user's ACTUAL local sensitivity.
+        With `wedge_samples`, local counts are sampled and max common neighbors,
+        which costs as much as exact counting, is replaced by its upper bound
+        degree - 1; that release is not DP (see _sampled_triangle_release).
+        """
+        if wedge_samples is not None:
+            degrees = self.stats.degrees(self.profiler)
+            return self._sampled_triangle_release(epsilon, wedge_samples, None, np.maximum(1.0, degrees - 1.0))
+        if self.workers is not None:
+            result = self._run_parallel("triangle_count_smooth", epsilon)
+            return result["sum"] / 3.0, result["sens_sum"] / result["n"]
+
+        stats = self.stats
+        # NO CLIPPING! We use the full degree.
+        true_vals = stats.triangles(profiler=self.profiler).astype(float)
+
+        # Instance-Specific Sensitivity: max common neighbors with any neighbor.
+        # Ensure sensitivity is at least 1 to avoid div by zero
+        with timed_phase(self.profiler, "sensitivity", len(true_vals)):
+            local_sens = np.maximum(1.0, stats.max_common_neighbors(self.profiler).astype(float))
+
+        # Add noise scaled by LOCAL sensitivity
+        noisy_vals = self._release(true_vals, local_sens, epsilon)
+        return float(noisy_vals.sum()) / 3.0, float(local_sens.sum()) / len(true_vals)
+
+    def triangle_count(self, epsilon: float, D_max: int = 50, wedge_samples: Optional[int] = None) -> Tuple[float, float]:
         """
-        
-        def local_triangles_smooth(subgraph: nx.Graph, node: int) -> float:
-            if node not in subgraph:
-                return 0.0
-            
-            neighbors = list(subgraph.neighbors(node))
-            # NO CLIPPING! We use the full degree.
-            
-            tri_count = 0
-            # Calculate local triangles
-            for i in range(len(neighbors)):
-                for j in range(i + 1, len(neighbors)):
-                    u = neighbors[i]
-                    v = neighbors[j]
-                    if subgraph.has_edge(u, v):
-                        tri_count += 1
-            
-            return float(tri_count)
-
-        # Aggregation with Instance-Specific Noise
-        total_estimate = 0.0
-        nodes = list(self.graph.graph.nodes())
-        avg_sensitivity = 0.0
-        
-        for node in nodes:
-            subgraph = self.graph.get_visible_subgraph(node, self.oracle)
-            true_val = local_triangles_smooth(subgraph, node)
-            
-            # Calculate Instance-Specific Sensitivity
-            neighbors = list(subgraph.neighbors(node))
-            if not neighbors:
-                local_sens = 1.0
-            else:
-                max_common = 0
-                for v in neighbors:
-                    v_neighbors = set(subgraph.neighbors(v))
-                    common = 0
-                    for w in neighbors:
-                        if w in v_neighbors:
-                            common += 1
-                    if common > max_common:
-                        max_common = common
-                local_sens = float(max_common)
-            
-            # Ensure sensitivity is at least 1 to avoid div by zero
-            local_sens = max(1.0, local_sens)
-            avg_sensitivity += local_sens
-            
-            # Add noise scaled by LOCAL sensitivity
-            if self.graph.is_public(node):
-                noisy_val = true_val
-            else:
-                noisy_val = laplace_mechanism(true_val, local_sens, epsilon)
-            
-            total_estimate += noisy_val
-            
-        return total_estimate / 3.0, avg_sensitivity / len(nodes)
-
-    def triangle_count(self, epsilon: float) -> Tuple[float, float]:
-        """
-        Estimates number of triangles.
+        Estimates number of triangles; private nodes are clipped to D_max neighbors.
+        With `wedge_samples`, local counts are sampled; that release is not DP
+        (see _sampled_triangle_release).
         Returns (estimate, sensitivity).
         """
-        D_max = 50
-        sensitivity = D_max 
-        
-        def local_triangles(subgraph: nx.Graph, node: int) -> float:
-            if node not in subgraph:
-                return 0.0
-            
-            neighbors = list(subgraph.neighbors(node))
-            
-            if not self.graph.is_public(node):
-                neighbors = neighbors[:D_max]
-            
-            tri_count = 0
-            # Simple iteration
-            for i in range(len(neighbors)):
-                for j in range(i + 1, len(neighbors)):
-                    u = neighbors[i]
-                    v = neighbors[j]
-                    if subgraph.has_edge(u, v):
-                        tri_count += 1
-            return float(tri_count)
-
-        total_triangles = self._aggregate_local_queries(local_triangles, epsilon, sensitivity)
+        sensitivity = D_max
+        if wedge_samples is not None:
+            return self._sampled_triangle_release(epsilon, wedge_samples, D_max, sensitivity)
+        if self.workers is not None:
+            return self._run_parallel("triangle_count", epsilon, D_max=D_max)["sum"] / 3.0, sensitivity
+
+        # Private nodes only count triangles among their first D_max neighbors
+        true_vals = self.stats.triangles(clip=D_max, profiler=self.profiler).astype(float)
+
+        total_triangles = float(self._release(true_vals, sensitivity, epsilon).sum())
         return total_triangles / 3.0, sensitivity
+
+    def release_inputs(self, query: str, **params) -> Tuple[np.ndarray, np.ndarray, float]:
+        """
+        (per-node true values, per-node sensitivities, divisor) of an exact
+        summed query: its release is sum(true + Laplace(sensitivity / epsilon) on
+        private nodes) / divisor, so these three determine its error distribution.
+        """
+        stats = self.stats
+        n = len(stats.nodes)
+        D_max = params.get("D_max", 50)
+        if query == "edge_count":
+            return stats.degrees(self.profiler).astype(float), np.ones(n), 2.0
+        if query == "triangle_count":
+            return stats.triangles(clip=D_max, profiler=self.profiler).astype(float), np.full(n, float(D_max)), 3.0
+        if query == "triangle_count_smooth":
+            return (stats.triangles(profiler=self.profiler).astype(float),
+                    np.maximum(1.0, stats.max_common_neighbors(self.profiler).astype(float)), 3.0)
+        if query == "k_star_count":
+            k = params["k"]
+            return (stats.k_stars(k, clip=D_max, profiler=self.profiler),
+                    np.full(n, clipped_sensitivity(D_max, k)), 1.0)
+        if query == "k_star_count_smooth":
+            k = params["k"]
+            return (stats.k_stars(k, profiler=self.profiler),
+                    np.maximum(1.0, stats.k_stars(k - 1, profiler=self.profiler)), 1.0)
+        raise ValueError(f"No closed-form error profile for query: {query}")
+
+    def error_profile(self, query: str, epsilon: float, truth: Optional[float] = None,
+                      quantiles=DEFAULT_QUANTILES, **params) -> Dict:
+        """
+        Error distribution of `query` at `epsilon` without drawing any noise
+        (analytic.error_profile): bias against `truth`, variance, expected
+        absolute error and exact quantiles. The local statistics are cached, so
+        sweeping epsilon or D_max only repeats the millisecond-scale convolution.
+        """
+        true_vals, sensitivities, divisor = self.release_inputs(query, **params)
+        return analytic.error_profile(true_vals, sensitivities, divisor, self.stats.public_mask, epsilon,
+                                      truth, quantiles)
+
+    def _statistics_for(self, query: str, params: Dict) -> List[Tuple]:
+        # Local statistics each query reads from LocalStatistics
+        if query == "k_star_count":
+            return [("k_stars", params["k"], params.get("D_max", 50))]
+        if query == "k_star_count_smooth":
+            return [("k_stars", params["k"], None), ("k_stars", params["k"] - 1, None)]
+        if params.get("wedge_samples") is not None:
+            # Sampled triangle queries draw fresh pairs; only degrees are shared
+            return [("degree",)]
+        if query == "triangle_count":
+            return [("triangles", params.get("D_max", 50))]
+        if query == "triangle_count_smooth":
+            return [("triangles",), ("max_common",)]
+        return [("degree",)]
+
+    def run_queries(self, queries: List[Dict], budget: Optional[float] = None) -> Dict:
+        """
+        Answers a batch of queries from one pass over the local statistics.
+        Each spec is {"query": <method name>, "epsilon": eps, **method kwargs},
+        e.g. {"query": "k_star_count", "epsilon": 0.5, "k": 2}.
+
+        Every statistic any query needs is computed first (a single traversal of
+        the visible subgraphs under per-view policies), then each query draws its
+        own noise in order, so results are distributed exactly as if the methods
+        were called one after another (and identical for the same seed).
+        The queries compose sequentially: the total budget is the sum of the
+        epsilons and, if `budget` is given, must not exceed it.
+        Returns {"results": [...], "budget": {...}}.
+        """
+        specs = []
+        for spec in queries:
+            spec = dict(spec)
+            query = spec.pop("query")
+            epsilon = float(spec.pop("epsilon"))
+            if query not in QUERY_METHODS:
+                raise ValueError(f"Unknown query: {query}")
+            if epsilon <= 0:
+                raise ValueError(f"Query {query} needs a positive epsilon, got {epsilon}")
+            specs.append((query, epsilon, spec))
+        total = sum(epsilon for _, epsilon, _ in specs)
+        if budget is not None and total > budget + 1e-12:
+            raise ValueError(f"Queries spend epsilon={total}, more than the budget {budget}")
+
+        if self.workers is None:
+            needed = [key for query, _, params in specs for key in self._statistics_for(query, params)]
+            self.stats.prefetch(needed, self.profiler)
+
+        results = []
+        accounting = []
+        for query, epsilon, params in specs:
+            estimate, sensitivity = getattr(self, query)(epsilon=epsilon, **params)
+            results.append({"query": query, "epsilon": epsilon, "params": params,
+                            "estimate": estimate, "sensitivity": sensitivity})
+            entry = {"query": query, "epsilon": epsilon}
+            if query in ("max_degree", "k_star_count_two_round"):
+                eps1 = epsilon * params.get("round1_fraction", 0.5)
+                entry["rounds"] = [eps1, epsilon - eps1]
+            accounting.append(entry)
+        return {"results": results,
+                "budget": {"total_epsilon": total, "limit": budget,
+                           "remaining": None if budget is None else budget - total, "queries": accounting}}
@@ -0,0 +1,515 @@
+import os
+import math
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+
+# Run from graph_dp_project as `python -m src.benchmark`; networkx is imported
+# only by the benchmarks that compare against it.
+from src.model import SocialGraph, VisibilityOracle
+from src.algorithms import GraphDPAlgorithms
+from src.utils import laplace_mechanism, laplace_mechanism_batch, generate_power_law_graph
+from src.edgelist import read_edgelist_csr
+from src.edge_ldp import EdgeLDPAlgorithms
+from src.streaming import StreamingRelease, tumbling_windows
+from src.sampling import SAMPLERS, sample_nodes, sample_subgraphs
+from src.monte_carlo import run_trials
+from src.kstars import k_star_terms
+
+DEFAULT_DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'facebook_combined.txt')
+
+
+def _timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def compare_backends(data_path: str = DEFAULT_DATA_PATH, num_lookups: int = 20000, num_observers: int = 200, seed: int = 0):
+    """
+    Memory/latency comparison of the networkx and CSR SocialGraph backends.
+    Reports load time, graph memory (tracemalloc peak), per-call latency of
+    neighbors/degree/has_edge, and the time of an edge_count run restricted to
+    `num_observers` nodes.
+    """
+    rng = np.random.default_rng(seed)
+    report = {}
+
+    for backend in ("networkx", "csr"):
+        tracemalloc.start()
+        graph, load_s = _timed(SocialGraph, data_path, public_fraction=0.2, backend=backend)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        g = graph.graph
+        nodes = np.array(list(g.nodes()))
+        probe = rng.choice(nodes, size=num_lookups).tolist()
+        probe_other = rng.choice(nodes, size=num_lookups).tolist()
+
+        _, t_nbrs = _timed(lambda: [list(g.neighbors(u)) for u in probe])
+        _, t_deg = _timed(lambda: [g.degree(u) for u in probe])
+        _, t_edge = _timed(lambda: [g.has_edge(u, v) for u, v in zip(probe, probe_other)])
+
+        # Time the full per-node algorithm path on a node subset
+        subset = SocialGraph(backend=backend)
+        subset.graph = g.subgraph(rng.choice(nodes, size=min(num_observers, len(nodes)), replace=False).tolist())
+        subset.public_nodes = {n for n in subset.graph.nodes() if n in graph.public_nodes}
+        algo = GraphDPAlgorithms(subset, VisibilityOracle(policy="2-hop"))
+        _, t_algo = _timed(algo.triangle_count_smooth, epsilon=1.0)
+
+        report[backend] = {
+            "load_s": load_s,
+            "peak_mem_mb": peak / 2**20,
+            "neighbors_us": 1e6 * t_nbrs / num_lookups,
+            "degree_us": 1e6 * t_deg / num_lookups,
+            "has_edge_us": 1e6 * t_edge / num_lookups,
+            "triangle_count_smooth_s": t_algo,
+        }
+
+    print(f"{'metric':<26}{'networkx':>14}{'csr':>14}")
+    for key in report["networkx"]:
+        print(f"{key:<26}{report['networkx'][key]:>14.3f}{report['csr'][key]:>14.3f}")
+    return report
+
+
+def bench_batch_noise(num_nodes: int = 10**6, public_fraction: float = 0.2, epsilon: float = 1.0, seed: int = 0):
+    """
+    Microbenchmark: per-node laplace_mechanism calls vs one laplace_mechanism_batch draw.
+    """
+    rng = np.random.default_rng(seed)
+    true_vals = rng.integers(0, 100, size=num_nodes).astype(float)
+    sens = np.maximum(1.0, rng.integers(0, 50, size=num_nodes).astype(float))
+    public = rng.random(num_nodes) < public_fraction
+
+    def per_node():
+        return [v if p else laplace_mechanism(v, s, epsilon) for v, s, p in zip(true_vals, sens, public)]
+
+    _, t_loop = _timed(per_node)
+    _, t_batch = _timed(laplace_mechanism_batch, true_vals, sens, epsilon, public, np.random.default_rng(seed))
+    print(f"{num_nodes} nodes: per-node {t_loop:.3f}s, batch {t_batch:.4f}s, speedup {t_loop / t_batch:.0f}x")
+    return {"per_node_s": t_loop, "batch_s": t_batch}
+
+
+def bench_visibility_views(data_path: str = DEFAULT_DATA_PATH, num_observers: int = 300, seed: int = 0):
+    """
+    Per-observer cost of a degree query through the zero-copy view vs a materialized
+    copy of the visible subgraph (the previous get_visible_subgraph behavior).
+    """
+    graph = SocialGraph(data_path)
+    rng = np.random.default_rng(seed)
+    observers = rng.choice(np.array(list(graph.graph.nodes())), size=num_observers, replace=False).tolist()
+    report = {}
+    for policy in ("1-hop", "2-hop"):
+        oracle = VisibilityOracle(policy=policy)
+        views = [graph.get_visible_subgraph(obs, oracle) for obs in observers]
+
+        def through_view():
+            return [graph.get_visible_subgraph(obs, oracle).degree(obs) for obs in observers]
+
+        def through_copy():
+            return [view.to_networkx().degree(obs) for view, obs in zip(views, observers)]
+
+        tracemalloc.start()
+        _, t_view = _timed(through_view)
+        _, peak_view = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        tracemalloc.start()
+        _, t_copy = _timed(through_copy)
+        _, peak_copy = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        report[policy] = {"view_us": 1e6 * t_view / num_observers, "copy_us": 1e6 * t_copy / num_observers,
+                          "view_peak_kb": peak_view / 1024, "copy_peak_kb": peak_copy / 1024}
+        print(f"{policy}: view {report[policy]['view_us']:.1f}us/{report[policy]['view_peak_kb']:.0f}KB, "
+              f"materialized {report[policy]['copy_us']:.1f}us/{report[policy]['copy_peak_kb']:.0f}KB per observer")
+    return report
+
+
+def bench_parallel_scaling(data_path: str = DEFAULT_DATA_PATH, max_workers: int = None, epsilon: float = 1.0, seed: int = 0):
+    """
+    Wall time of triangle_count_smooth with workers=1..max_workers (defaults to the CPU count),
+    against the in-process path. Estimates are identical for every worker count.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    graph = SocialGraph(data_path, public_fraction=0.2, backend="csr")
+    oracle = VisibilityOracle(policy="2-hop")
+    _, t_serial = _timed(GraphDPAlgorithms(graph, oracle, seed=seed).triangle_count_smooth, epsilon)
+    print(f"in-process: {t_serial:.2f}s")
+    report = {"serial_s": t_serial, "workers": {}}
+    for workers in range(1, max_workers + 1):
+        with GraphDPAlgorithms(graph, oracle, seed=seed, workers=workers, shard_size=256) as algo:
+            algo.edge_count(epsilon)  # start the pool outside the timed region
+            (estimate, _), elapsed = _timed(algo.triangle_count_smooth, epsilon)
+        report["workers"][workers] = elapsed
+        print(f"workers={workers}: {elapsed:.2f}s (speedup {report['workers'][1] / elapsed:.2f}x), estimate {estimate:.1f}")
+    return report
+
+
+def write_synthetic_edgelist(path: str, num_edges: int, num_nodes: int, seed: int = 0, chunk: int = 10**6):
+    """
+    Writes `num_edges` random (possibly duplicate) edges in SNAP text format.
+    """
+    rng = np.random.default_rng(seed)
+    with open(path, "w") as f:
+        f.write("# synthetic edge list\n")
+        for start in range(0, num_edges, chunk):
+            size = min(chunk, num_edges - start)
+            np.savetxt(f, rng.integers(0, num_nodes, size=(size, 2)), fmt="%d")
+
+
+def _load_with_peak(loader, path):
+    tracemalloc.start()
+    graph, elapsed = _timed(loader, path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return graph, elapsed, peak / 2**20
+
+
+def bench_loader(data_path: str = DEFAULT_DATA_PATH, synthetic_edges: int = 10**7, synthetic_nodes: int = 2 * 10**6,
+                 networkx_on_synthetic: bool = False):
+    """
+    nx.read_edgelist vs the streaming read_edgelist_csr on the bundled dataset (plain and .gz)
+    and on a synthetic edge list. networkx is skipped on the synthetic file by default since
+    a dict-of-dicts for 10M edges needs several GB.
+    """
+    import networkx as nx
+
+    inputs = [data_path, data_path + ".gz"]
+    tmpdir = tempfile.mkdtemp()
+    if synthetic_edges:
+        synthetic = os.path.join(tmpdir, "synthetic.txt")
+        write_synthetic_edgelist(synthetic, synthetic_edges, synthetic_nodes)
+        inputs.append(synthetic)
+    report = {}
+    for path in inputs:
+        if not os.path.exists(path):
+            continue
+        row = {}
+        if path != inputs[-1] or not synthetic_edges or networkx_on_synthetic:
+            graph, row["networkx_s"], row["networkx_peak_mb"] = _load_with_peak(lambda p: nx.read_edgelist(p, nodetype=int), path)
+            del graph
+        graph, row["streaming_s"], row["streaming_peak_mb"] = _load_with_peak(read_edgelist_csr, path)
+        row["edges"] = graph.number_of_edges()
+        report[os.path.basename(path)] = row
+        print(os.path.basename(path), {k: round(v, 3) for k, v in row.items()})
+    for name in os.listdir(tmpdir):
+        os.remove(os.path.join(tmpdir, name))
+    os.rmdir(tmpdir)
+    return report
+
+
+def bench_snapshot(data_path: str = DEFAULT_DATA_PATH, public_fraction: float = 0.2, repeats: int = 5):
+    """
+    Startup time: parsing the text edge list plus public node selection vs
+    opening a binary snapshot through np.memmap (with and without checksums).
+    """
+    tmpdir = tempfile.mkdtemp()
+    snapshot_path = os.path.join(tmpdir, "graph.gdps")
+    report = {}
+    for backend in ("networkx", "csr"):
+        graph, text_s = _timed(SocialGraph, data_path, public_fraction, backend=backend)
+        graph.save_snapshot(snapshot_path)
+        verified_s = min(_timed(SocialGraph, snapshot_path, backend=backend)[1] for _ in range(repeats))
+        unverified_s = min(_timed(lambda: SocialGraph(backend=backend).open_snapshot(snapshot_path, verify=False))[1]
+                           for _ in range(repeats))
+        report[backend] = {"text_s": text_s, "snapshot_s": verified_s, "snapshot_noverify_s": unverified_s}
+        print(backend, {k: round(v, 4) for k, v in report[backend].items()})
+    os.remove(snapshot_path)
+    os.rmdir(tmpdir)
+    return report
+
+
+def bench_edge_ldp(data_path: str = DEFAULT_DATA_PATH, epsilons=(8.0, 4.0, 2.0), public_fraction: float = 0.2, seed: int = 0):
+    """
+    Randomized-response engine: time and number of noisy edges per epsilon.
+    Noisy edges grow as n_private^2 / (1 + e^eps), so low epsilons dominate.
+    """
+    graph = SocialGraph(data_path, public_fraction, backend="csr")
+    report = {}
+    for eps in epsilons:
+        algo = EdgeLDPAlgorithms(graph, seed=seed)
+        (edges, _), edge_s = _timed(algo.edge_count, eps)
+        (triangles, _), triangle_s = _timed(algo.triangle_count, eps)
+        report[eps] = {"edge_count": edges, "edge_count_s": edge_s, "triangle_count": triangles, "triangle_count_s": triangle_s}
+        print(f"eps={eps}", {k: round(v, 3) for k, v in report[eps].items()})
+    return report
+
+
+def bench_incremental_updates(data_path: str = DEFAULT_DATA_PATH, batches: int = 20, batch_size: int = 10,
+                              policy: str = "2-hop", backend: str = "csr", seed: int = 0):
+    """
+    apply_edge_updates + a triangle query per batch vs invalidating and recomputing
+    everything; the last batch is checked against a full recomputation.
+    """
+    rng = np.random.default_rng(seed)
+    graph = SocialGraph(data_path, public_fraction=0.2, backend=backend)
+    algo = GraphDPAlgorithms(graph, VisibilityOracle(policy=policy), seed=seed)
+    algo.triangle_count_smooth(1.0)
+    nodes = np.array(graph.graph.nodes())
+    incremental = full = 0.0
+    for b in range(batches):
+        edges = np.array(list(graph.graph.edges()))
+        deletions = edges[rng.choice(len(edges), batch_size // 2, replace=False)]
+        additions = rng.choice(nodes, size=(batch_size - len(deletions), 2))
+        start = time.perf_counter()
+        graph.apply_edge_updates(additions, deletions, verify=(b == batches - 1))
+        algo.triangle_count_smooth(1.0)
+        incremental += time.perf_counter() - start
+        start = time.perf_counter()
+        graph.invalidate()
+        algo.triangle_count_smooth(1.0)
+        full += time.perf_counter() - start
+    print(f"{batches} batches of {batch_size}: incremental {incremental / batches:.4f}s, full recompute {full / batches:.4f}s per batch")
+    return {"incremental_s": incremental / batches, "full_s": full / batches}
+
+
+def bench_streaming(data_path: str = DEFAULT_DATA_PATH, window_size: int = 10000, publish_s: float = 0.05,
+                    epsilon: float = 1.0, seed: int = 0):
+    """
+    End-to-end time of the windowed release pipeline against releasing the same
+    windows one after another, with a consumer that spends `publish_s` per window.
+    """
+    edges = np.loadtxt(data_path, dtype=np.int64)
+    release = StreamingRelease(epsilon, window_size=window_size, public_fraction=0.2, seed=seed)
+
+    def publish_all(releases):
+        count = 0
+        for _ in releases:
+            time.sleep(publish_s)
+            count += 1
+        return count
+
+    num_windows, t_pipeline = _timed(publish_all, release.releases(map(tuple, edges)))
+    # Same ingestion and per-window seeds, but cut, release and publish in one thread
+    seeds = np.random.SeedSequence(seed).spawn(num_windows)
+    windows = tumbling_windows(map(tuple, edges), window_size, None)
+    _, t_serial = _timed(publish_all, (release.release_window(w, s) for w, s in zip(windows, seeds)))
+    print(f"{num_windows} windows of {window_size} edges, {publish_s * 1000:.0f} ms publish each: "
+          f"pipelined {t_pipeline:.3f}s, serial {t_serial:.3f}s")
+    return {"windows": num_windows, "pipelined_s": t_pipeline, "serial_s": t_serial}
+
+
+def bench_public_selection(num_nodes: int = 10**6, public_fraction: float = 0.2, epsilon: float = 1.0, seed: int = 0):
+    """
+    Public-node selection per strategy and a degree_histogram release on a
+    generated power-law graph of `num_nodes` nodes (CSR backend).
+    """
+    graph = SocialGraph(public_fraction=public_fraction, backend="csr", seed=seed)
+    graph.graph = generate_power_law_graph(num_nodes, seed=seed)
+    report = {}
+    for strategy in ("degree_top_k", "random", "degree_probabilistic"):
+        graph.public_strategy = strategy
+        _, report[strategy] = _timed(graph._select_public_nodes)
+    algo = GraphDPAlgorithms(graph, VisibilityOracle(policy="1-hop"), seed=seed)
+    _, report["degree_histogram"] = _timed(algo.degree_histogram, epsilon)
+    print(f"{num_nodes} nodes: " + ", ".join(f"{name} {seconds:.3f}s" for name, seconds in report.items()))
+    return report
+
+
+def bench_sampled_triangles(data_path: str = DEFAULT_DATA_PATH, budgets=(10, 50, 200, 1000, 5000), policy: str = "2-hop",
+                            epsilon: float = 1.0, repeats: int = 5, seed: int = 0):
+    """
+    Accuracy/throughput curve of triangle_count(wedge_samples=...) against the
+    exact bulk count. Each budget reports mean release time, the mean absolute
+    error of the sampled local counts alone (noise-free), and the reported
+    sampling / Laplace standard deviations of the released total.
+    """
+    graph = SocialGraph(data_path, public_fraction=0.2, backend="csr")
+    oracle = VisibilityOracle(policy=policy)
+    algo = GraphDPAlgorithms(graph, oracle, seed=seed)
+    graph.invalidate()
+    _, t_exact = _timed(algo.triangle_count, epsilon)
+    truth = float(algo.stats.triangles(clip=50).sum()) / 3.0
+    laplace_std = (2.0 * (~algo.stats.public_mask).sum()) ** 0.5 * 50 / epsilon / 3.0
+    print(f"exact: {t_exact:.3f}s, {truth:.0f} triangles (clipped), Laplace std {laplace_std / truth:.2%}")
+    report = {"exact_s": t_exact, "truth": truth, "budgets": {}}
+    rng = np.random.default_rng(seed)
+    for budget in budgets:
+        times, errors = [], []
+        for _ in range(repeats):
+            _, seconds = _timed(algo.triangle_count, epsilon, wedge_samples=budget)
+            times.append(seconds)
+            estimates, _, _ = algo.stats.sampled_triangles(budget, rng, clip=50)
+            errors.append(abs(estimates.sum() / 3.0 - truth))
+        error = algo.last_error
+        row = {"seconds": float(np.mean(times)), "sampling_abs_error": float(np.mean(errors)),
+               "sampling_std": error["sampling_variance"] ** 0.5, "laplace_std": error["laplace_variance"] ** 0.5,
+               "sampled_nodes": error["sampled_nodes"]}
+        report["budgets"][budget] = row
+        print(f"wedge_samples={budget:>6}: {row['seconds']:.3f}s ({t_exact / row['seconds']:.1f}x), "
+              f"sampling error {row['sampling_abs_error'] / truth:.2%} (std {row['sampling_std'] / truth:.2%}), "
+              f"Laplace std {row['laplace_std'] / truth:.2%}, {row['sampled_nodes']} nodes sampled")
+    return report
+
+
+def bench_sampling(data_path: str = DEFAULT_DATA_PATH, size: int = 1000, num_samples: int = 200, seed: int = 0):
+    """
+    Samples per second of every sampler in sampling.py on the CSR graph, for
+    node sets alone and for node sets plus their induced subgraphs.
+    """
+    graph = read_edgelist_csr(data_path)
+    report = {}
+    for method in SAMPLERS:
+        _, t_nodes = _timed(sample_nodes, graph, method, size, num_samples, seed)
+        _, t_subgraphs = _timed(lambda: sum(1 for _ in sample_subgraphs(graph, method, size, num_samples, seed)))
+        report[method] = {"nodes_per_s": num_samples / t_nodes, "subgraphs_per_s": num_samples / t_subgraphs}
+        print(f"{method:>13}: {num_samples / t_nodes:8.1f} samples/s, {num_samples / t_subgraphs:8.1f} subgraphs/s "
+              f"({size} nodes each)")
+    return report
+
+
+def bench_monte_carlo(data_path: str = DEFAULT_DATA_PATH, trials: int = 1000, epsilon: float = 1.0, seed: int = 0):
+    """
+    Trials per second of monte_carlo.run_trials (noise-only repetitions) against
+    repeated triangle_count_smooth calls, on the full graph under 2-hop.
+    """
+    graph = SocialGraph(data_path, public_fraction=0.2, backend="csr")
+    algo = GraphDPAlgorithms(graph, VisibilityOracle(policy="2-hop"), seed=seed)
+    algo.triangle_count_smooth(epsilon)
+    calls = max(trials // 10, 1)
+    _, t_calls = _timed(lambda: [algo.triangle_count_smooth(epsilon) for _ in range(calls)])
+    _, t_trials = _timed(run_trials, graph, [epsilon], trials=trials, metrics=["TriangleCount_Smooth"], seed=seed)
+    print(f"triangle_count_smooth: {calls / t_calls:.0f} calls/s, run_trials: {trials / t_trials:.0f} trials/s")
+    return {"calls_per_s": calls / t_calls, "trials_per_s": trials / t_trials}
+
+
+def bench_analytic(data_path: str = DEFAULT_DATA_PATH, trials: int = 1000, seed: int = 0):
+    """
+    Epsilon sweep and D_max search with GraphDPAlgorithms.error_profile against
+    the same sweep by Monte Carlo (run_trials), on the full graph under 2-hop.
+    """
+    graph = SocialGraph(data_path, public_fraction=0.2, backend="csr")
+    algo = GraphDPAlgorithms(graph, VisibilityOracle(policy="2-hop"), seed=seed)
+    epsilons = [0.1, 0.25, 0.5, 1.0, 2.0, 5.0]
+    algo.error_profile("triangle_count_smooth", 1.0)
+    _, t_sweep = _timed(lambda: [algo.error_profile("triangle_count_smooth", eps) for eps in epsilons])
+    _, t_mc = _timed(run_trials, graph, epsilons, trials=trials, metrics=["TriangleCount_Smooth"], seed=seed)
+
+    # D_max minimizing the expected absolute error of clipped triangles (clipping bias included)
+    truth = float(algo.stats.triangles().sum()) / 3.0
+    candidates = [5, 10, 20, 50, 100, 200]
+    algo.stats.prefetch([("triangles", d) for d in candidates])
+    profiles, t_search = _timed(lambda: {d: algo.error_profile("triangle_count", 1.0, truth=truth, D_max=d)
+                                         for d in candidates})
+    best = min(candidates, key=lambda d: profiles[d]["expected_abs_error"])
+    print(f"epsilon sweep ({len(epsilons)} points): analytic {t_sweep * 1e3:.1f}ms, "
+          f"Monte Carlo ({trials} trials each) {t_mc * 1e3:.1f}ms")
+    print(f"D_max search ({len(candidates)} candidates): {t_search * 1e3:.1f}ms, best D_max={best}")
+    return {"sweep": t_sweep, "monte_carlo": t_mc, "search": t_search, "best_D_max": best}
+
+
+def bench_visibility_batch(data_path: str = DEFAULT_DATA_PATH, policy: str = "2-hop", scalar_edges: int = 500,
+                           seed: int = 0):
+    """
+    VisibilityOracle.visible_mask over every edge for one observer, and
+    observers_seeing for one edge, against per-pair is_visible calls
+    (the scalar rate is measured on `scalar_edges` edges and extrapolated).
+    """
+    graph = SocialGraph(data_path)
+    csr = graph.as_csr()
+    oracle = VisibilityOracle(policy=policy)
+    rng = np.random.default_rng(seed)
+    edges = np.array(csr.edges(), dtype=np.int64)
+    observer = int(rng.choice(csr.node_ids))
+    sample = edges[rng.choice(len(edges), scalar_edges, replace=False)]
+    scalar, t_scalar = _timed(lambda: [oracle.is_visible(graph.graph, observer, (u, v)) for u, v in sample.tolist()])
+    mask, t_mask = _timed(oracle.visible_mask, csr, observer, edges)
+    assert mask[np.searchsorted(edges[:, 0] * len(csr.node_ids) + edges[:, 1],
+                                sample[:, 0] * len(csr.node_ids) + sample[:, 1])].tolist() == scalar
+    edge = tuple(int(x) for x in edges[rng.integers(len(edges))])
+    seen, t_seen = _timed(oracle.observers_seeing, csr, edge)
+    per_edge = t_scalar / scalar_edges
+    print(f"{policy} visible_mask: {len(edges)} edges in {t_mask * 1e3:.1f}ms "
+          f"(is_visible: ~{per_edge * len(edges) * 1e3:.0f}ms), {int(mask.sum())} visible")
+    print(f"{policy} observers_seeing: {len(seen)} observers in {t_seen * 1e3:.1f}ms "
+          f"(is_visible over all nodes: ~{per_edge * len(csr.node_ids) * 1e3:.0f}ms)")
+    return {"visible_mask": t_mask, "observers_seeing": t_seen, "scalar_per_edge": per_edge}
+
+
+def bench_view_statistics(data_path: str = DEFAULT_DATA_PATH, sample_observers: int = 200,
+                          synthetic_nodes: int = 100000, seed: int = 0):
+    """
+    All-observer 2-hop view sizes from the blocked sparse products
+    (neighborhoods.view_statistics) against one materialized view per observer
+    (rate measured on `sample_observers` and extrapolated), then the node-only
+    pass on a synthetic power-law graph of `synthetic_nodes` nodes.
+    """
+    from src.neighborhoods import view_statistics
+    graph = SocialGraph(data_path, backend="csr")
+    csr = graph.as_csr()
+    rng = np.random.default_rng(seed)
+    observers = rng.choice(csr.node_ids, sample_observers, replace=False).tolist()
+    oracle = VisibilityOracle(policy="2-hop")
+    _, t_views = _timed(lambda: [graph.get_visible_subgraph(obs, oracle).to_networkx().number_of_edges()
+                                 for obs in observers])
+    _, t_nodes = _timed(view_statistics, csr, "2-hop")
+    _, t_edges = _timed(view_statistics, csr, "2-hop", count_edges=True)
+    per_view = t_views / sample_observers * len(csr.node_ids)
+    print(f"2-hop views of {len(csr.node_ids)} observers: per-observer ~{per_view:.1f}s, "
+          f"sparse nodes {t_nodes:.2f}s, sparse nodes+edges {t_edges:.2f}s")
+    synthetic = generate_power_law_graph(synthetic_nodes, seed=seed)
+    _, t_synthetic = _timed(view_statistics, synthetic, "2-hop")
+    print(f"2-hop view sizes of {synthetic_nodes} power-law nodes: {t_synthetic:.2f}s")
+    return {"per_observer": per_view, "nodes": t_nodes, "edges": t_edges, "synthetic": t_synthetic}
+
+
+def bench_collection(num_clients: int = 100000, connections: int = 8, epsilon: float = 1.0, seed: int = 0):
+    """
+    Reports/sec and open-to-release latency of the aggregator protocol
+    (collection.run_load): one concurrent local client per node of a synthetic
+    power-law graph, multiplexed over `connections` connections to an
+    in-process AggregatorServer.
+    """
+    import asyncio
+    from src.collection import run_load
+    graph = SocialGraph(public_fraction=0.2, backend="csr", seed=seed)
+    graph.graph = generate_power_law_graph(num_clients, seed=seed)
+    graph._select_public_nodes()
+    stats = graph.local_statistics(VisibilityOracle(policy="1-hop"))
+    queries = [{"query": "edge_count", "epsilon": epsilon}, {"query": "triangle_count_smooth", "epsilon": epsilon}]
+    stats.prefetch([("degree",), ("triangles",)])
+    report = asyncio.run(run_load(stats, queries, connections=connections, seed=seed))
+    latencies = ", ".join(f"{spec['query']} {t * 1e3:.0f}ms" for spec, t in zip(queries, report["latency_s"]))
+    print(f"{num_clients} clients / {connections} connections: {report['reports_per_s']:.0f} reports/s; {latencies}")
+    return report
+
+
+def bench_k_stars(num_nodes: int = 10**6, ks=(2, 3, 5, 10, 50), seed: int = 0):
+    """
+    k-star counts and instance-specific sensitivities of a power-law degree
+    vector for several k: kstars.k_star_terms in one call against the per-node
+    math.comb loop it replaced (run on k <= 5 only; larger k are bignum-bound).
+    """
+    rng = np.random.default_rng(seed)
+    degrees = np.minimum(rng.zipf(2.1, num_nodes), num_nodes - 1).astype(np.int64)
+    (values, sens), t_engine = _timed(k_star_terms, degrees, list(ks), overflow="inf")
+    small = [k for k in ks if k <= 5]
+    exact, t_loop = _timed(lambda: [[float(math.comb(d, k)) if d >= k else 0.0 for d in degrees.tolist()]
+                                    for k in small])
+    assert all(np.array_equal(values[list(ks).index(k)], row) for k, row in zip(small, exact))
+    overflowed = int(np.isinf(values).any(axis=1).sum())
+    print(f"k-stars of {num_nodes} nodes, k={list(ks)}: engine {t_engine * 1e3:.1f}ms "
+          f"(values + sensitivities, {overflowed} k beyond float64); math.comb loop for k={small} {t_loop * 1e3:.1f}ms")
+    return {"engine": t_engine, "comb_loop": t_loop}
+
+
+if __name__ == "__main__":
+    compare_backends()
+    bench_batch_noise()
+    bench_visibility_views()
+    bench_parallel_scaling()
+    bench_loader()
+    bench_snapshot()
+    bench_edge_ldp()
+    bench_incremental_updates()
+    bench_streaming()
+    bench_public_selection()
+    bench_sampled_triangles()
+    bench_sampling()
+    bench_monte_carlo()
+    bench_analytic()
+    bench_visibility_batch()
+    bench_visibility_batch(policy="1-hop")
+    bench_view_statistics()
+    bench_collection()
+    bench_k_stars()
@@ -0,0 +1,172 @@
+import sys
+import os
+import argparse
+import json
+import multiprocessing
+import platform
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Run from graph_dp_project as `python -m src.benchmark_suite`
+from src.model import SocialGraph, VisibilityOracle
+from src.algorithms import GraphDPAlgorithms
+from src.utils import generate_power_law_graph
+
+DEFAULT_DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'facebook_combined.txt')
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+ORACLES = ("1-hop", "2-hop")
+
+# Every GraphDPAlgorithms query, called as fn(algo, epsilon)
+METHODS = {
+    "edge_count": lambda algo, eps: algo.edge_count(eps),
+    "degree_histogram": lambda algo, eps: algo.degree_histogram(eps),
+    "triangle_count": lambda algo, eps: algo.triangle_count(eps),
+    "triangle_count_smooth": lambda algo, eps: algo.triangle_count_smooth(eps),
+    "k_star_count": lambda algo, eps: algo.k_star_count(2, eps),
+    "k_star_count_smooth": lambda algo, eps: algo.k_star_count_smooth(2, eps),
+}
+
+# Graph of the current suite run; forked case processes inherit it
+_graphs: Dict[str, SocialGraph] = {}
+
+
+def _reset_peak_rss() -> bool:
+    # Linux: writing 5 to clear_refs resets VmHWM, so the peak covers one case only
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    if resource is None:
+        return float("nan")
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    scale = 1.0 if sys.platform == "darwin" else 1024.0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20
+
+
+def _run_case(graph_name: str, oracle_policy: str, method: str, epsilon: float, seed: int) -> Dict:
+    """
+    Times one (graph, oracle, method) case from cold caches, then once more warm.
+    """
+    graph = _graphs[graph_name]
+    graph.invalidate()
+    isolated_peak = _reset_peak_rss()
+    algo = GraphDPAlgorithms(graph, VisibilityOracle(policy=oracle_policy), seed=seed)
+    start = time.perf_counter()
+    METHODS[method](algo, epsilon)
+    wall = time.perf_counter() - start
+    start = time.perf_counter()
+    METHODS[method](algo, epsilon)
+    warm = time.perf_counter() - start
+    nodes = graph.graph.number_of_nodes()
+    return {
+        "wall_s": wall,
+        "warm_s": warm,
+        "peak_rss_mb": _peak_rss_mb(),
+        "peak_rss_scope": "case" if isolated_peak else "process",
+        "nodes_per_s": nodes / wall if wall > 0 else float("inf"),
+    }
+
+
+def _run_isolated(*args) -> Dict:
+    # One forked child per case: caches and the RSS high-water mark start from the parent's state
+    context = multiprocessing.get_context("fork")
+    with context.Pool(1) as pool:
+        return pool.apply(_run_case, args)
+
+
+def build_graphs(sizes, data_path: Optional[str], public_fraction: float, backend: str, seed: int) -> Dict[str, SocialGraph]:
+    graphs = {}
+    if data_path and os.path.exists(data_path):
+        graphs["facebook"] = SocialGraph(data_path, public_fraction, backend=backend)
+    for size in sizes:
+        graph = SocialGraph(public_fraction=public_fraction, backend=backend)
+        csr = generate_power_law_graph(size, seed=seed)
+        graph.graph = csr if backend == "csr" else csr.to_networkx()
+        graph._select_public_nodes()
+        graphs[f"power_law_{size}"] = graph
+    return graphs
+
+
+def run_suite(sizes=DEFAULT_SIZES, data_path: Optional[str] = DEFAULT_DATA_PATH, oracles=ORACLES, methods=None,
+              epsilon: float = 1.0, public_fraction: float = 0.2, backend: str = "csr", seed: int = 0,
+              isolate: bool = True) -> Dict:
+    """
+    Runs every method under every oracle on the Facebook graph and on generated
+    power-law graphs. Returns a JSON-serializable report; `isolate` runs each
+    case in its own forked process so timings start cold and peak RSS is per case.
+    """
+    methods = list(methods or METHODS)
+    isolate = isolate and "fork" in multiprocessing.get_all_start_methods()
+    results: List[Dict] = []
+    for graph_name, graph in build_graphs(sizes, data_path, public_fraction, backend, seed).items():
+        _graphs.clear()
+        _graphs[graph_name] = graph
+        for policy in oracles:
+            for method in methods:
+                args = (graph_name, policy, method, epsilon, seed)
+                row = {"graph": graph_name, "nodes": graph.graph.number_of_nodes(),
+                       "edges": graph.graph.number_of_edges(), "oracle": policy, "method": method}
+                row.update(_run_isolated(*args) if isolate else _run_case(*args))
+                results.append(row)
+                print(f"{graph_name:>18} {policy} {method:<22} {row['wall_s']:8.3f}s "
+                      f"{row['peak_rss_mb']:8.1f} MB {row['nodes_per_s']:12.0f} nodes/s", flush=True)
+    _graphs.clear()
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "backend": backend,
+            "epsilon": epsilon,
+            "public_fraction": public_fraction,
+            "seed": seed,
+            "isolated": isolate,
+        },
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every GraphDPAlgorithms query across graph sizes.")
+    parser.add_argument("--sizes", type=int, nargs="*", default=list(DEFAULT_SIZES), help="power-law graph sizes")
+    parser.add_argument("--data", default=DEFAULT_DATA_PATH, help="edge list to include (empty string to skip)")
+    parser.add_argument("--oracles", nargs="*", default=list(ORACLES))
+    parser.add_argument("--methods", nargs="*", default=list(METHODS), choices=list(METHODS))
+    parser.add_argument("--epsilon", type=float, default=1.0)
+    parser.add_argument("--public-fraction", type=float, default=0.2)
+    parser.add_argument("--backend", choices=("csr", "networkx"), default="csr")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-isolate", action="store_true", help="run all cases in this process")
+    parser.add_argument("--output", default="benchmark_results.json")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.sizes, args.data or None, args.oracles, args.methods, args.epsilon,
+                       args.public_fraction, args.backend, args.seed, isolate=not args.no_isolate)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(report['results'])} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import argparse
+import json
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Every subcommand imports what it needs when it runs: `query` touches only
+# NumPy and the CSR backend, while networkx (experiment), matplotlib/seaborn/
+# pandas (plot) and asyncio (serve, load) load on their own paths alone.
+
+# (GraphDPAlgorithms query, CLI options it takes) of every --metric
+METRICS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "edges": ("edge_count", ()),
+    "degree-histogram": ("degree_histogram", ("max_degree",)),
+    "max-degree": ("max_degree", ()),
+    "triangles": ("triangle_count", ("D_max",)),
+    "triangles-smooth": ("triangle_count_smooth", ()),
+    "kstars": ("k_star_count", ("k", "D_max")),
+    "kstars-smooth": ("k_star_count_smooth", ("k",)),
+    "kstars-two-round": ("k_star_count_two_round", ("k",)),
+}
+
+
+def _query_specs(args) -> List[Dict]:
+    specs = []
+    for metric in args.metric:
+        query, options = METRICS[metric]
+        spec = {"query": query, "epsilon": args.eps}
+        spec.update({name: getattr(args, name) for name in options if getattr(args, name) is not None})
+        specs.append(spec)
+    return specs
+
+
+def _json_default(value):
+    # NumPy scalars and arrays in release results
+    return value.tolist() if hasattr(value, "tolist") else str(value)
+
+
+def query(args) -> int:
+    from .model import SocialGraph, VisibilityOracle
+    from .algorithms import GraphDPAlgorithms
+
+    start = time.perf_counter()
+    graph = SocialGraph(args.graph, public_fraction=args.public_fraction, public_strategy=args.public_strategy,
+                        backend="csr", snapshot=args.snapshot, seed=args.seed)
+    loaded = time.perf_counter()
+    specs = _query_specs(args)
+    with GraphDPAlgorithms(graph, VisibilityOracle(policy=args.policy), seed=args.seed, workers=args.workers) as algo:
+        if args.analytic:
+            rows = []
+            for spec in specs:
+                params = {name: value for name, value in spec.items() if name not in ("query", "epsilon")}
+                profile = algo.error_profile(spec["query"], args.eps, **params)
+                rows.append({"query": spec["query"], "epsilon": args.eps, "params": params, **profile})
+            output = {"results": rows}
+        else:
+            output = algo.run_queries(specs)
+        n = len(algo.stats.nodes)
+    done = time.perf_counter()
+
+    if args.json:
+        output["timing_s"] = {"load": loaded - start, "query": done - loaded}
+        json.dump(output, sys.stdout, default=_json_default)
+        sys.stdout.write("\n")
+        return 0
+    print(f"{n} nodes, {len(graph.public_nodes)} public; "
+          f"loaded in {loaded - start:.3f}s, answered in {done - loaded:.3f}s")
+    for row in output["results"]:
+        if args.analytic:
+            print(f"  {row['query']:<24} eps={row['epsilon']:<6g} estimate={row['estimate']:.6g}  "
+                  f"std={row['std']:.6g}  p95 |error|={row['abs_error_quantiles'][0.95]:.6g}")
+            continue
+        estimate = row["estimate"]
+        shown = f"[{', '.join(f'{v:.1f}' for v in estimate)}]" if isinstance(estimate, list) else f"{estimate:.6g}"
+        print(f"  {row['query']:<24} eps={row['epsilon']:<6g} estimate={shown}  sensitivity={row['sensitivity']:.6g}")
+    return 0
+
+
+def experiment(args) -> int:
+    from .experiment import run_experiments
+    run_experiments(args.trials, args.workers, args.seed, args.analytic)
+    return 0
+
+
+def plot(args) -> int:
+    from .plot_results import plot_results
+    plot_results()
+    return 0
+
+
+def serve(args) -> int:
+    import asyncio
+    from .aggregator import serve as run_server
+    asyncio.run(run_server(args.host, args.port, args.unix, args.budget))
+    return 0
+
+
+def load(args) -> int:
+    from .aggregator import load as run_load
+    address = args.unix or ((args.host, args.port) if args.port else None)
+    run_load(args.clients, args.connections, args.batch_size, args.linger, args.policy, args.epsilon, address,
+             args.seed)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    # Defaults are spelled out here rather than imported, so building the parser loads no module of the package
+    parser = argparse.ArgumentParser(prog="graphdp", description="Visibility-aware DP releases of social graph statistics.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    query_cmd = commands.add_parser("query", help="release statistics of one graph")
+    query_cmd.add_argument("graph", help="edge list (plain or .gz) or .gdps snapshot")
+    query_cmd.add_argument("--metric", action="append", choices=sorted(METRICS), required=True,
+                           help="statistic to release; repeat to answer several from one pass")
+    query_cmd.add_argument("--eps", type=float, required=True, help="epsilon spent on each metric")
+    query_cmd.add_argument("--policy", default="1-hop", help="visibility policy of every observer")
+    query_cmd.add_argument("--public-fraction", type=float, default=0.0)
+    query_cmd.add_argument("--public-strategy", default="degree_top_k",
+                           choices=("random", "degree_top_k", "degree_probabilistic"))
+    query_cmd.add_argument("--D-max", dest="D_max", type=int, default=None, help="degree clip of clipped releases")
+    query_cmd.add_argument("--k", type=int, default=2, help="star size of k-star releases")
+    query_cmd.add_argument("--max-degree", dest="max_degree", type=int, default=None,
+                           help="last bin of the degree histogram")
+    query_cmd.add_argument("--seed", type=int, default=None)
+    query_cmd.add_argument("--workers", type=int, default=None, help="processes sharing the node shards")
+    query_cmd.add_argument("--snapshot", action="store_true", help="convert the edge list to a .gdps snapshot once and reuse it")
+    query_cmd.add_argument("--analytic", action="store_true", help="exact error profile instead of a noisy release")
+    query_cmd.add_argument("--json", action="store_true", help="print the full result as one JSON object")
+    query_cmd.set_defaults(run=query)
+
+    experiment_cmd = commands.add_parser("experiment", help="Monte Carlo error curves on a Facebook sample")
+    experiment_cmd.add_argument("--trials", type=int, default=1000, help="repetitions per (metric, epsilon)")
+    experiment_cmd.add_argument("--workers", type=int, default=None, help="processes running configurations")
+    experiment_cmd.add_argument("--seed", type=int, default=None)
+    experiment_cmd.add_argument("--analytic", action="store_true", help="exact error profiles instead of trials")
+    experiment_cmd.set_defaults(run=experiment)
+
+    plot_cmd = commands.add_parser("plot", help="plot the stored experiment trials")
+    plot_cmd.set_defaults(run=plot)
+
+    serve_cmd = commands.add_parser("serve", help="run an aggregator")
+    serve_cmd.add_argument("--host", default="127.0.0.1")
+    serve_cmd.add_argument("--port", type=int, default=9400)
+    serve_cmd.add_argument("--unix", default=None, help="listen on this Unix socket instead of TCP")
+    serve_cmd.add_argument("--budget", type=float, default=None, help="total epsilon the server will spend")
+    serve_cmd.set_defaults(run=serve)
+
+    load_cmd = commands.add_parser("load", help="simulate concurrent local clients")
+    load_cmd.add_argument("--clients", type=int, default=100000)
+    load_cmd.add_argument("--connections", type=int, default=8)
+    # collection.DEFAULT_BATCH_SIZE and DEFAULT_LINGER
+    load_cmd.add_argument("--batch-size", type=int, default=4096)
+    load_cmd.add_argument("--linger", type=float, default=0.005)
+    load_cmd.add_argument("--policy", default="1-hop")
+    load_cmd.add_argument("--epsilon", type=float, default=1.0)
+    load_cmd.add_argument("--host", default="127.0.0.1")
+    load_cmd.add_argument("--port", type=int, default=None, help="target a running aggregator (default: in-process)")
+    load_cmd.add_argument("--unix", default=None)
+    load_cmd.add_argument("--seed", type=int, default=None)
+    load_cmd.set_defaults(run=load)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        return args.run(args)
+    except ValueError as exc:
+        # Invalid query parameters (epsilon, policy, a metric without a closed form, ...)
+        parser.error(str(exc))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
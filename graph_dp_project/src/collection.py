@@ -0,0 +1,518 @@
+import asyncio
+import json
+import math
+import struct
+import time
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+from .local_stats import local_triangles, local_max_common_neighbors, k_star_values
+from .utils import histogram_counts, laplace_mechanism_batch
+from .kstars import clipped_sensitivity
+
+# Frame header: payload length and message type, network byte order
+FRAME_HEADER = struct.Struct("!IB")
+# Largest accepted payload (a frame of 1M reports is 24 MB)
+MAX_FRAME = 1 << 26
+# Head of a report batch: collection id, phase and record count
+BATCH_HEADER = struct.Struct("!IBI")
+ACK = struct.Struct("!I")
+# One report: node id, noisy local value and the sensitivity its noise was scaled to
+REPORT_DTYPE = np.dtype([("node", ">i8"), ("value", ">f8"), ("sensitivity", ">f8")])
+
+# Message types; control messages and their replies carry JSON
+MSG_REPORTS, MSG_ACK, MSG_OPEN, MSG_ROUND, MSG_CLOSE, MSG_RESULT, MSG_ERROR = range(1, 8)
+
+# Reports buffered per connection before a frame is sent, and how long a partial batch may wait
+DEFAULT_BATCH_SIZE = 4096
+DEFAULT_LINGER = 0.005
+
+# Divisor of each summed release: every edge / triangle is reported by each of its endpoints
+SUM_DIVISORS = {"edge_count": 2.0, "triangle_count": 3.0, "triangle_count_smooth": 3.0,
+                "k_star_count": 1.0, "k_star_count_smooth": 1.0}
+# Two-round queries: phase 0 collects noisy degrees, phase 1 uses what the aggregator published from them
+TWO_PHASE_QUERIES = ("max_degree", "k_star_count_two_round")
+COLLECTED_QUERIES = tuple(SUM_DIVISORS) + ("degree_histogram",) + TWO_PHASE_QUERIES
+
+
+def report_inputs(round: Dict, stats) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (local values, sensitivities, reporting mask) of every node of `stats` for
+    one collection round, exactly as the matching GraphDPAlgorithms query
+    computes them. `stats` is a LocalStatistics (all users at once) or a
+    LocalView (one user); only degrees(), triangles(), max_common_neighbors(),
+    k_stars(), nodes and public_mask are used.
+    """
+    query, phase, params = round["query"], round["phase"], round["params"]
+    degrees = stats.degrees()
+    reporting = np.ones(len(degrees), dtype=bool)
+    D_max = params.get("D_max", 50)
+    if query == "k_star_count_two_round" and phase == 0:
+        # Public degrees are exact (sensitivity 0) and stay out of the degree bound
+        values, sens = degrees.astype(float), np.where(stats.public_mask, 0.0, 1.0)
+    elif query == "edge_count" or (query in TWO_PHASE_QUERIES and phase == 0):
+        values, sens = degrees.astype(float), 1.0
+    elif query == "degree_histogram":
+        values, sens = np.minimum(degrees, params.get("max_degree", 50)).astype(float), 1.0
+    elif query == "triangle_count":
+        values, sens = stats.triangles(clip=D_max).astype(float), float(D_max)
+    elif query == "triangle_count_smooth":
+        values = stats.triangles().astype(float)
+        sens = np.maximum(1.0, stats.max_common_neighbors().astype(float))
+    elif query == "k_star_count":
+        k = params["k"]
+        values, sens = stats.k_stars(k, clip=D_max), clipped_sensitivity(D_max, k)
+    elif query == "k_star_count_smooth":
+        k = params["k"]
+        values, sens = stats.k_stars(k), np.maximum(1.0, stats.k_stars(k - 1))
+    elif query == "max_degree":
+        values, sens = degrees.astype(float), 1.0
+        reporting = np.isin(np.asarray(stats.nodes, dtype=np.int64), np.asarray(round["candidates"], dtype=np.int64))
+    elif query == "k_star_count_two_round":
+        k, bound = params["k"], round["bound"]
+        values, sens = stats.k_stars(k, clip=bound), clipped_sensitivity(bound, k)
+    else:
+        raise ValueError(f"Unknown query: {query}")
+    return values, np.broadcast_to(np.asarray(sens, dtype=float), values.shape), reporting
+
+
+def noisy_reports(round: Dict, stats, rng: np.random.Generator) -> np.ndarray:
+    """
+    Report records (REPORT_DTYPE) of every reporting node of `stats`: its local
+    value plus Laplace(sensitivity / round epsilon) noise, exact for public nodes.
+    """
+    values, sens, reporting = report_inputs(round, stats)
+    noisy = laplace_mechanism_batch(values[reporting], sens[reporting], round["epsilon"],
+                                    stats.public_mask[reporting], rng)
+    records = np.empty(len(noisy), dtype=REPORT_DTYPE)
+    records["node"] = np.asarray(stats.nodes, dtype=np.int64)[reporting]
+    records["value"] = noisy
+    records["sensitivity"] = sens[reporting]
+    return records
+
+
+class LocalView:
+    """
+    LocalStatistics-like access to one user's own values, computed from the
+    user's visible subgraph alone (all a client on the user's device can see).
+    """
+    def __init__(self, graph, node: int, oracle):
+        self.nodes = [node]
+        self.public_mask = np.array([graph.is_public(node)])
+        self.view = graph.get_visible_subgraph(node, oracle)
+        self._neighbors = list(self.view.neighbors(node)) if node in self.view else []
+
+    def degrees(self) -> np.ndarray:
+        return np.array([len(self._neighbors)], dtype=np.int64)
+
+    def triangles(self, clip: Optional[int] = None) -> np.ndarray:
+        # Private users only consider their first `clip` neighbors, as in LocalStatistics.triangles
+        neighbors = self._neighbors if clip is None or self.public_mask[0] else self._neighbors[:clip]
+        return np.array([local_triangles(self.view, neighbors)], dtype=np.int64)
+
+    def max_common_neighbors(self) -> np.ndarray:
+        return np.array([local_max_common_neighbors(self.view, self._neighbors)], dtype=np.int64)
+
+    def k_stars(self, k: int, clip: Optional[int] = None) -> np.ndarray:
+        return k_star_values(self.degrees(), k, clip, self.public_mask)
+
+
+class LocalClient:
+    """
+    One user of the collection protocol: reports its own noisy local value for
+    each round it takes part in, computed from its visible subgraph.
+    """
+    def __init__(self, graph, node: int, oracle, rng: Optional[np.random.Generator] = None):
+        self.node = node
+        self.stats = LocalView(graph, node, oracle)
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    def report(self, round: Dict) -> np.ndarray:
+        """
+        This user's records for `round` (empty if it does not report in it).
+        """
+        return noisy_reports(round, self.stats, self.rng)
+
+
+class Collection:
+    """
+    Aggregator-side state of one query: the public round parameters and the
+    running aggregate of the phase being collected. Each node is counted once
+    per phase; repeated reports are dropped.
+    """
+    def __init__(self, collection_id: int, query: str, epsilon: float, params: Dict):
+        if query not in COLLECTED_QUERIES:
+            raise ValueError(f"Query {query} cannot be collected; supported: {COLLECTED_QUERIES}")
+        if epsilon <= 0:
+            raise ValueError(f"Query {query} needs a positive epsilon, got {epsilon}")
+        self.id = collection_id
+        self.query = query
+        self.epsilon = epsilon
+        self.params = params
+        self.phase = 0
+        self.published: Dict = {}
+        self.result: Optional[Dict] = None
+        self._start_phase()
+
+    def _start_phase(self):
+        self._seen = set()
+        self.count = 0
+        self.total = 0.0
+        self.sens_total = 0.0
+        self.maximum = -math.inf
+        self._hist = np.zeros(self.params.get("max_degree", 50) + 1, dtype=np.int64)
+        self._degrees: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+
+    def phase_epsilon(self) -> float:
+        if self.query not in TWO_PHASE_QUERIES:
+            return self.epsilon
+        eps1 = self.epsilon * self.params.get("round1_fraction", 0.5)
+        return eps1 if self.phase == 0 else self.epsilon - eps1
+
+    def round(self) -> Dict:
+        """
+        What every client needs to report in the current phase.
+        """
+        return {"collection": self.id, "query": self.query, "phase": self.phase, "epsilon": self.phase_epsilon(),
+                "params": self.params, **self.published}
+
+    def add(self, phase: int, records: np.ndarray) -> int:
+        """
+        Folds a batch of reports into the aggregate; returns how many were accepted.
+        """
+        if self.result is not None:
+            raise ValueError(f"Collection {self.id} is already released")
+        if phase != self.phase:
+            raise ValueError(f"Collection {self.id} is in phase {self.phase}, got reports for phase {phase}")
+        nodes = records["node"].tolist()
+        fresh = np.fromiter((node not in self._seen for node in nodes), dtype=bool, count=len(nodes))
+        # Keep the first report of nodes repeated within the batch too
+        _, first = np.unique(records["node"], return_index=True)
+        keep = np.zeros(len(nodes), dtype=bool)
+        keep[first] = True
+        fresh &= keep
+        records = records[fresh]
+        self._seen.update(records["node"].tolist())
+        values = records["value"].astype(float)
+        self.count += len(values)
+        self.total += float(values.sum())
+        self.sens_total += float(records["sensitivity"].sum())
+        if len(values):
+            self.maximum = max(self.maximum, float(values.max()))
+        if self.query == "degree_histogram":
+            self._hist += histogram_counts(values, len(self._hist) - 1)
+        elif self.query in TWO_PHASE_QUERIES and self.phase == 0:
+            self._degrees.append((records["node"].astype(np.int64), values, records["sensitivity"].astype(float)))
+        return len(values)
+
+    def close(self) -> Dict:
+        """
+        Ends the current phase. Phase 0 of a two-round query publishes what
+        phase 1 needs and returns the new round; otherwise returns the release,
+        shaped like a GraphDPAlgorithms.run_queries result.
+        """
+        if self.result is not None:
+            return self.result
+        if self.query in TWO_PHASE_QUERIES and self.phase == 0:
+            nodes = np.concatenate([batch[0] for batch in self._degrees]) if self._degrees else np.zeros(0, np.int64)
+            degrees = np.concatenate([batch[1] for batch in self._degrees]) if self._degrees else np.zeros(0)
+            if self.query == "max_degree":
+                num = min(self.params.get("num_candidates", 10), len(degrees))
+                top = np.argpartition(-degrees, num - 1)[:num] if num else np.zeros(0, dtype=np.int64)
+                self.published = {"reporters": len(degrees), "candidates": nodes[top].tolist()}
+            else:
+                # Private nodes only, as in GraphDPAlgorithms.noisy_degree_bound
+                sens = np.concatenate([batch[2] for batch in self._degrees]) if self._degrees else np.zeros(0)
+                if (sens > 0).any():
+                    degrees = degrees[sens > 0]
+                quantile = self.params.get("quantile", 1.0)
+                bound = max(1, int(np.ceil(np.quantile(degrees, quantile)))) if len(degrees) else 1
+                self.published = {"bound": max(self.params["k"], bound)}
+            self.phase = 1
+            self._start_phase()
+            return self.round()
+        if self.query == "degree_histogram":
+            estimate = self._hist.tolist()
+        elif self.query == "max_degree":
+            n = self.published["reporters"]
+            estimate = 0.0 if self.count == 0 else float(np.clip(self.maximum, 0, n - 1))
+        elif self.query == "k_star_count_two_round":
+            estimate = self.total
+        else:
+            estimate = self.total / SUM_DIVISORS[self.query]
+        if self.query == "k_star_count_two_round":
+            sensitivity = clipped_sensitivity(self.published["bound"], self.params["k"])
+        elif self.query == "max_degree":
+            sensitivity = 1.0
+        else:
+            sensitivity = self.sens_total / max(self.count, 1)
+        self.result = {"query": self.query, "epsilon": self.epsilon, "params": self.params, "estimate": estimate,
+                       "sensitivity": sensitivity, "reports": self.count}
+        return self.result
+
+
+class AggregatorServer:
+    """
+    asyncio aggregator of noisy local reports over framed binary messages, on
+    TCP or a Unix socket. Operators open a collection per query (MSG_OPEN),
+    clients fetch its round parameters (MSG_ROUND) and stream report batches
+    (MSG_REPORTS, answered with the accepted count), and the operator closes
+    each phase (MSG_CLOSE) to get the next round or the release. Collections
+    compose sequentially: their epsilons must fit in `budget`, if given.
+    """
+    def __init__(self, budget: Optional[float] = None):
+        self.budget = budget
+        self.spent = 0.0
+        self.collections: Dict[int, Collection] = {}
+        self.reports = 0
+        self._server = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, path: Optional[str] = None):
+        """
+        Starts listening on `path` (Unix socket) or host:port (port 0 picks a
+        free one). Returns the address clients connect to.
+        """
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path=path)
+            return path
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def open(self, query: str, epsilon: float, **params) -> Collection:
+        if self.budget is not None and self.spent + epsilon > self.budget + 1e-12:
+            raise ValueError(f"Opening {query} spends epsilon={self.spent + epsilon}, more than the budget {self.budget}")
+        collection = Collection(len(self.collections), query, float(epsilon), params)
+        self.collections[collection.id] = collection
+        self.spent += epsilon
+        return collection
+
+    def _collection(self, body: Dict) -> Collection:
+        collection = self.collections.get(body.get("collection"))
+        if collection is None:
+            raise ValueError(f"Unknown collection: {body.get('collection')}")
+        return collection
+
+    def _dispatch(self, kind: int, payload: bytes) -> Tuple[int, bytes]:
+        if kind == MSG_REPORTS:
+            collection_id, phase, count = BATCH_HEADER.unpack_from(payload)
+            if len(payload) != BATCH_HEADER.size + count * REPORT_DTYPE.itemsize:
+                raise ValueError(f"Report batch of {len(payload)} bytes does not hold {count} records")
+            records = np.frombuffer(payload, dtype=REPORT_DTYPE, count=count, offset=BATCH_HEADER.size)
+            accepted = self._collection({"collection": collection_id}).add(phase, records)
+            self.reports += accepted
+            return MSG_ACK, ACK.pack(accepted)
+        body = json.loads(payload)
+        if kind == MSG_OPEN:
+            spec = dict(body)
+            reply = self.open(spec.pop("query"), spec.pop("epsilon"), **spec).round()
+        elif kind == MSG_ROUND:
+            reply = self._collection(body).round()
+        elif kind == MSG_CLOSE:
+            reply = self._collection(body).close()
+        else:
+            raise ValueError(f"Unknown message type: {kind}")
+        return MSG_RESULT, json.dumps(reply).encode()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                length, kind = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+                if length > MAX_FRAME:
+                    # The stream cannot be resynchronized after an oversized frame
+                    await _write_frame(writer, MSG_ERROR, json.dumps({"error": f"Frame of {length} bytes"}).encode())
+                    break
+                payload = await reader.readexactly(length)
+                try:
+                    reply_kind, reply = self._dispatch(kind, payload)
+                except (ValueError, KeyError, TypeError, struct.error) as exc:
+                    reply_kind, reply = MSG_ERROR, json.dumps({"error": str(exc)}).encode()
+                await _write_frame(writer, reply_kind, reply)
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _write_frame(writer: asyncio.StreamWriter, kind: int, payload: bytes):
+    writer.write(FRAME_HEADER.pack(len(payload), kind))
+    writer.write(payload)
+    await writer.drain()
+
+
+class AggregatorConnection:
+    """
+    One reusable connection to an AggregatorServer, shared by any number of
+    local clients. Submitted reports are buffered per round and sent as one
+    frame every `batch_size` reports; a partial batch goes out after `linger`
+    seconds or on flush(). Round parameters are fetched once per connection
+    and cached. One request is in flight at a time.
+    """
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                 batch_size: int = DEFAULT_BATCH_SIZE, linger: float = DEFAULT_LINGER):
+        self._reader = reader
+        self._writer = writer
+        self.batch_size = batch_size
+        self.linger = linger
+        self._lock = asyncio.Lock()
+        # Encoded records and their count per (collection, phase)
+        self._buffers: Dict[Tuple[int, int], Tuple[List[bytes], List[int]]] = {}
+        self._pending = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._rounds: Dict[int, asyncio.Future] = {}
+        self.accepted = 0
+
+    @classmethod
+    async def connect(cls, address, batch_size: int = DEFAULT_BATCH_SIZE,
+                      linger: float = DEFAULT_LINGER) -> "AggregatorConnection":
+        """
+        Connects to a Unix socket path (str) or a (host, port) pair.
+        """
+        if isinstance(address, str):
+            reader, writer = await asyncio.open_unix_connection(address)
+        else:
+            reader, writer = await asyncio.open_connection(*address)
+        return cls(reader, writer, batch_size, linger)
+
+    async def _request(self, kind: int, payload: bytes) -> bytes:
+        async with self._lock:
+            await _write_frame(self._writer, kind, payload)
+            length, reply_kind = FRAME_HEADER.unpack(await self._reader.readexactly(FRAME_HEADER.size))
+            reply = await self._reader.readexactly(length)
+        if reply_kind == MSG_ERROR:
+            raise ValueError(json.loads(reply)["error"])
+        return reply
+
+    async def _control(self, kind: int, body: Dict) -> Dict:
+        return json.loads(await self._request(kind, json.dumps(body).encode()))
+
+    async def open(self, query: str, epsilon: float, **params) -> Dict:
+        """
+        Opens a collection for `query`; returns its first round.
+        """
+        return await self._control(MSG_OPEN, {"query": query, "epsilon": epsilon, **params})
+
+    async def round(self, collection_id: int, refresh: bool = False) -> Dict:
+        """
+        Current round of a collection, fetched once and shared by every caller.
+        """
+        future = self._rounds.get(collection_id)
+        if future is None or refresh:
+            future = asyncio.ensure_future(self._control(MSG_ROUND, {"collection": collection_id}))
+            self._rounds[collection_id] = future
+        return await future
+
+    def forget(self, collection_id: int):
+        """
+        Drops the cached round of a collection whose phase has ended.
+        """
+        self._rounds.pop(collection_id, None)
+
+    async def close_phase(self, collection_id: int) -> Dict:
+        """
+        Ends the collection's current phase: the next round, or the release.
+        """
+        self.forget(collection_id)
+        return await self._control(MSG_CLOSE, {"collection": collection_id})
+
+    async def submit(self, round: Dict, records: np.ndarray):
+        """
+        Queues report records (REPORT_DTYPE) for `round`; sends a frame once
+        `batch_size` reports are waiting.
+        """
+        if len(records) == 0:
+            return
+        chunks, counts = self._buffers.setdefault((round["collection"], round["phase"]), ([], []))
+        chunks.append(records.astype(REPORT_DTYPE, copy=False).tobytes())
+        counts.append(len(records))
+        self._pending += len(records)
+        if self._pending >= self.batch_size:
+            await self.flush()
+        elif self._timer is None and self.linger is not None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.linger, lambda: asyncio.ensure_future(self.flush()))
+
+    async def flush(self) -> int:
+        """
+        Sends every buffered report; returns the number the aggregator accepted.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        buffers, self._buffers, self._pending = self._buffers, {}, 0
+        accepted = 0
+        for (collection_id, phase), (chunks, counts) in buffers.items():
+            payload = BATCH_HEADER.pack(collection_id, phase, sum(counts)) + b"".join(chunks)
+            accepted += ACK.unpack(await self._request(MSG_REPORTS, payload))[0]
+        self.accepted += accepted
+        return accepted
+
+    async def close(self):
+        await self.flush()
+        self._writer.close()
+        await self._writer.wait_closed()
+
+
+async def run_load(stats, queries: Sequence[Dict], connections: int = 8, batch_size: int = DEFAULT_BATCH_SIZE,
+                   linger: float = DEFAULT_LINGER, address=None, seed: Optional[int] = None) -> Dict:
+    """
+    Load generator: every node of `stats` (a LocalStatistics) acts as one
+    concurrent local client, a coroutine that waits for the round parameters
+    and submits its own report over one of `connections` shared connections.
+    Reports are stand-ins drawn in one vectorized step per round from the bulk
+    local statistics (distributed exactly like LocalClient reports). Runs
+    against the server at `address`, or an in-process AggregatorServer on a
+    free local port. Returns reports/sec over all rounds and each query's
+    end-to-end latency from open to release.
+    """
+    server = None
+    if address is None:
+        server = AggregatorServer()
+        address = await server.start()
+    rng = np.random.default_rng(seed)
+    pool = [await AggregatorConnection.connect(address, batch_size, linger) for _ in range(connections)]
+    control = pool[0]
+
+    async def client(conn: AggregatorConnection, collection_id: int, records: np.ndarray):
+        round = await conn.round(collection_id)
+        await conn.submit(round, records)
+
+    results, latencies = [], []
+    reports, submit_seconds = 0, 0.0
+    try:
+        for spec in queries:
+            spec = dict(spec)
+            start = time.perf_counter()
+            round = await control.open(spec.pop("query"), spec.pop("epsilon"), **spec)
+            while True:
+                records = noisy_reports(round, stats, rng)
+                began = time.perf_counter()
+                await asyncio.gather(*(client(pool[i % connections], round["collection"], records[i:i + 1])
+                                       for i in range(len(records))))
+                for conn in pool:
+                    await conn.flush()
+                submit_seconds += time.perf_counter() - began
+                reports += len(records)
+                outcome = await control.close_phase(round["collection"])
+                for conn in pool:
+                    conn.forget(round["collection"])
+                if "estimate" in outcome:
+                    break
+                round = outcome
+            latencies.append(time.perf_counter() - start)
+            results.append(outcome)
+    finally:
+        for conn in pool:
+            await conn.close()
+        if server is not None:
+            await server.close()
+    return {"results": results, "clients": len(stats.nodes), "reports": reports,
+            "reports_per_s": reports / submit_seconds if submit_seconds > 0 else 0.0,
+            "latency_s": latencies}
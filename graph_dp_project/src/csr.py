@@ -0,0 +1,240 @@
+import bisect
+import numpy as np
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+_INT32_MAX = np.iinfo(np.int32).max
+
+
+def _indptr_dtype(nnz: int):
+    # indptr only needs 64 bits once the directed entry count overflows int32
+    return np.int32 if nnz <= _INT32_MAX else np.int64
+
+
+def gather_row_positions(indptr: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Flat positions into `indices` covering the rows `rows`, in order.
+    Returns (positions, per-row lengths).
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    starts = indptr[rows].astype(np.int64)
+    lens = indptr[rows + 1].astype(np.int64) - starts
+    total = int(lens.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64), lens
+    # Position k of the output is start(row) + (k - offset(row))
+    offsets = np.cumsum(lens) - lens
+    return np.repeat(starts - offsets, lens) + np.arange(total, dtype=np.int64), lens
+
+
+def gather_rows(indptr: np.ndarray, indices: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Concatenates the adjacency rows of `rows` without a Python loop.
+    Returns (flat neighbor indices, per-row lengths).
+    """
+    positions, lens = gather_row_positions(indptr, rows)
+    return indices[positions], lens
+
+
+class CSRGraph:
+    """
+    Compact, read-only undirected graph stored as sorted, deduplicated int32 CSR arrays.
+    Exposes the subset of the networkx API used by SocialGraph and GraphDPAlgorithms.
+    """
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, node_ids: np.ndarray):
+        self.indptr = indptr
+        self.indices = indices
+        # node_ids[i] is the original id of internal index i (ascending)
+        self.node_ids = node_ids
+        n = len(node_ids)
+        self._identity = n == 0 or (int(node_ids[0]) == 0 and int(node_ids[-1]) == n - 1)
+
+    @classmethod
+    def from_edges(cls, src: np.ndarray, dst: np.ndarray, node_ids: Optional[np.ndarray] = None) -> "CSRGraph":
+        """
+        Builds a CSR graph from two arrays of original node ids.
+        Edges are symmetrized and deduplicated; self-loops are dropped.
+        """
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        if node_ids is None:
+            node_ids = np.unique(np.concatenate([src, dst]))
+        else:
+            node_ids = np.unique(np.asarray(node_ids, dtype=np.int64))
+        u = np.searchsorted(node_ids, src)
+        v = np.searchsorted(node_ids, dst)
+        return cls.from_index_edges(u, v, node_ids)
+
+    @classmethod
+    def from_index_edges(cls, u: np.ndarray, v: np.ndarray, node_ids: np.ndarray) -> "CSRGraph":
+        """
+        Builds a CSR graph from edges already expressed as internal indices.
+        """
+        n = len(node_ids)
+        u = np.asarray(u, dtype=np.int64)
+        v = np.asarray(v, dtype=np.int64)
+        keep = u != v
+        lo = np.minimum(u[keep], v[keep])
+        hi = np.maximum(u[keep], v[keep])
+        # Dedupe undirected edges through a packed (lo, hi) key
+        keys = np.unique(lo * n + hi)
+        lo = keys // n if n else keys
+        hi = keys - lo * n if n else keys
+        rows = np.concatenate([lo, hi])
+        cols = np.concatenate([hi, lo])
+        order = np.lexsort((cols, rows))
+        counts = np.bincount(rows, minlength=n)
+        indptr = np.zeros(n + 1, dtype=_indptr_dtype(len(rows)))
+        np.cumsum(counts, out=indptr[1:])
+        indices = cols[order].astype(np.int32)
+        return cls(indptr, indices, np.asarray(node_ids, dtype=np.int64))
+
+    @classmethod
+    def from_networkx(cls, graph) -> "CSRGraph":
+        node_ids = np.fromiter(graph.nodes(), dtype=np.int64, count=graph.number_of_nodes())
+        edges = np.array(list(graph.edges()), dtype=np.int64).reshape(-1, 2)
+        return cls.from_edges(edges[:, 0], edges[:, 1], node_ids=node_ids)
+
+    def to_networkx(self):
+        import networkx as nx
+        g = nx.Graph()
+        g.add_nodes_from(self.node_ids.tolist())
+        g.add_edges_from(self.edges())
+        return g
+
+    # ---- id remapping -------------------------------------------------
+
+    def index_of(self, node: int) -> int:
+        """
+        Internal index of an original node id, or -1 if absent.
+        """
+        n = len(self.node_ids)
+        if self._identity:
+            return int(node) if 0 <= node < n else -1
+        i = int(np.searchsorted(self.node_ids, node))
+        if i < n and self.node_ids[i] == node:
+            return i
+        return -1
+
+    def lookup(self, nodes: Iterable[int]) -> np.ndarray:
+        """
+        Vectorized index_of: internal indices of original node ids, -1 where absent.
+        """
+        nodes = np.asarray(list(nodes) if not isinstance(nodes, np.ndarray) else nodes, dtype=np.int64)
+        if self._identity:
+            idx = nodes.copy()
+        else:
+            idx = np.searchsorted(self.node_ids, nodes)
+        n = len(self.node_ids)
+        valid = (idx >= 0) & (idx < n)
+        valid[valid] = self.node_ids[idx[valid]] == nodes[valid]
+        idx[~valid] = -1
+        return idx
+
+    def indices_of(self, nodes: Iterable[int]) -> np.ndarray:
+        """
+        Vectorized index_of; raises KeyError if any node is absent.
+        """
+        nodes = np.asarray(list(nodes) if not isinstance(nodes, np.ndarray) else nodes, dtype=np.int64)
+        idx = self.lookup(nodes)
+        if (idx < 0).any():
+            raise KeyError(f"Nodes not in graph: {nodes[idx < 0][:5].tolist()}")
+        return idx
+
+    def neighbor_indices(self, i: int) -> np.ndarray:
+        """
+        Sorted neighbor indices of internal index i (a view, not a copy).
+        """
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def degrees(self) -> np.ndarray:
+        return np.diff(self.indptr).astype(np.int64)
+
+    # ---- networkx-compatible surface ----------------------------------
+
+    def nodes(self) -> List[int]:
+        return self.node_ids.tolist()
+
+    def number_of_nodes(self) -> int:
+        return len(self.node_ids)
+
+    def number_of_edges(self) -> int:
+        return len(self.indices) // 2
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.nodes())
+
+    def __contains__(self, node) -> bool:
+        return self.index_of(node) >= 0
+
+    def neighbors(self, node: int) -> List[int]:
+        i = self.index_of(node)
+        if i < 0:
+            raise KeyError(f"Node {node} not in graph")
+        return self.node_ids[self.neighbor_indices(i)].tolist()
+
+    def degree(self, node: Optional[int] = None):
+        """
+        Degree of one node, or (node, degree) pairs for all nodes like nx.Graph.degree().
+        """
+        if node is None:
+            return list(zip(self.node_ids.tolist(), self.degrees().tolist()))
+        i = self.index_of(node)
+        if i < 0:
+            raise KeyError(f"Node {node} not in graph")
+        return int(self.indptr[i + 1] - self.indptr[i])
+
+    def has_edge(self, u: int, v: int) -> bool:
+        i = self.index_of(u)
+        j = self.index_of(v)
+        if i < 0 or j < 0:
+            return False
+        lo_i, hi_i = int(self.indptr[i]), int(self.indptr[i + 1])
+        lo_j, hi_j = int(self.indptr[j]), int(self.indptr[j + 1])
+        # Binary search the shorter of the two sorted rows
+        if hi_i - lo_i > hi_j - lo_j:
+            i, j, lo_i, hi_i = j, i, lo_j, hi_j
+        pos = bisect.bisect_left(self.indices, j, lo_i, hi_i)
+        return bool(pos < hi_i and self.indices[pos] == j)
+
+    def edges(self) -> List[Tuple[int, int]]:
+        rows = np.repeat(np.arange(len(self.node_ids)), np.diff(self.indptr))
+        upper = rows < self.indices
+        return list(zip(self.node_ids[rows[upper]].tolist(), self.node_ids[self.indices[upper]].tolist()))
+
+    def subgraph(self, nodes: Iterable[int]) -> "CSRGraph":
+        """
+        Induced subgraph on `nodes` as a new CSRGraph.
+        """
+        idx = np.unique(self.indices_of(nodes))
+        mask = np.zeros(len(self.node_ids), dtype=bool)
+        mask[idx] = True
+        nbrs, lens = gather_rows(self.indptr, self.indices, idx)
+        src = np.repeat(idx, lens)
+        keep = mask[nbrs]
+        u = np.searchsorted(idx, src[keep])
+        v = np.searchsorted(idx, nbrs[keep])
+        return CSRGraph.from_index_edges(u, v, self.node_ids[idx])
+
+    def with_edge_updates(self, add_u: np.ndarray, add_v: np.ndarray,
+                          del_u: np.ndarray, del_v: np.ndarray) -> "CSRGraph":
+        """
+        New CSRGraph over the same nodes with the index-space edges (del_u, del_v)
+        removed and then (add_u, add_v) added.
+        """
+        n = len(self.node_ids)
+        rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(self.indptr))
+        cols = self.indices.astype(np.int64)
+        upper = rows < cols
+        keys = rows[upper] * n + cols[upper]
+        del_u, del_v = np.asarray(del_u, dtype=np.int64), np.asarray(del_v, dtype=np.int64)
+        keys = keys[~np.isin(keys, np.minimum(del_u, del_v) * n + np.maximum(del_u, del_v))]
+        lo = np.concatenate([keys // n, np.asarray(add_u, dtype=np.int64)])
+        hi = np.concatenate([keys % n, np.asarray(add_v, dtype=np.int64)])
+        return CSRGraph.from_index_edges(lo, hi, self.node_ids)
+
+    @property
+    def nbytes(self) -> int:
+        return self.indptr.nbytes + self.indices.nbytes + self.node_ids.nbytes
@@ -0,0 +1,197 @@
+import math
+import numpy as np
+from typing import Dict, Optional, Tuple
+from .triangles import orient_by_degree, iter_triangles, DEFAULT_MAX_WEDGES
+
+# Geometric gaps drawn per block while skipping through private non-edge positions
+DEFAULT_SKIP_BLOCK = 1 << 20
+
+# Neighboring graphs differ in one edge, i.e. in one randomized-response bit per round
+EDGE_SENSITIVITY = 1.0
+
+
+def rr_truth_probability(epsilon: float) -> float:
+    """
+    p = exp(eps) / (1 + exp(eps)), the probability randomized response reports the true bit.
+    """
+    return 1.0 / (1.0 + math.exp(-epsilon))
+
+
+def debias_count(noisy_count: float, n_total: float, p: float) -> float:
+    """
+    Unbiased estimate of the true number of 1s among `n_total` randomized-response
+    reports with truth probability `p` (algorithms.md §2.3), clamped at 0.
+    """
+    if n_total == 0:
+        return 0.0
+    return max(0.0, (noisy_count - n_total * (1.0 - p)) / (2.0 * p - 1.0))
+
+
+def _pair_from_rank(rank: np.ndarray, m: int) -> Tuple[np.ndarray, np.ndarray]:
+    # Inverse of the row-major ranking of pairs (i, j), i < j < m
+    row_start = np.arange(m, dtype=np.int64)
+    row_start = row_start * (2 * m - row_start - 1) // 2
+    i = np.searchsorted(row_start, rank, side="right") - 1
+    j = rank - row_start[i] + i + 1
+    return i, j
+
+
+def _skip_positions(num_positions: int, q: float, rng: np.random.Generator, block: int) -> np.ndarray:
+    """
+    Ranks in [0, num_positions) that each flip to 1 independently with probability q,
+    found by jumping Geometric(q) gaps instead of visiting every position.
+    """
+    if num_positions == 0 or q <= 0.0:
+        return np.empty(0, dtype=np.int64)
+    found = []
+    last = -1
+    while last < num_positions:
+        ranks = last + np.cumsum(rng.geometric(q, size=block))
+        found.append(ranks[ranks < num_positions])
+        last = int(ranks[-1])
+    return np.concatenate(found)
+
+
+def randomized_response_edges(indptr: np.ndarray, indices: np.ndarray, public_mask: np.ndarray, epsilon: float,
+                              rng: np.random.Generator,
+                              block: int = DEFAULT_SKIP_BLOCK) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    One round of per-edge randomized response over all n(n-1)/2 positions of a CSR graph.
+    A position is PUBLIC iff one endpoint is a public node and is reported exactly;
+    every PRIVATE position reports RR(exists) with truth probability p.
+
+    No dense matrix is built: private true edges are kept with probability p and
+    false positives among the private non-edges are sampled by geometric skipping,
+    so time and memory are O(m + expected noisy edges).
+    Returns (u, v, is_public, exists) for every reported edge, u < v as CSR indices.
+    `exists` is simulator-side ground truth used to answer round-two confirmations.
+    """
+    p = rr_truth_probability(epsilon)
+    n = len(indptr) - 1
+    src = np.repeat(np.arange(n, dtype=np.int64), np.diff(indptr))
+    dst = indices.astype(np.int64)
+    upper = src < dst
+    src, dst = src[upper], dst[upper]
+    public = public_mask[src] | public_mask[dst]
+    kept = public | (rng.random(len(src)) < p)
+
+    # False positives: private pairs live among the private nodes, ranked row-major
+    private_nodes = np.flatnonzero(~public_mask)
+    m = len(private_nodes)
+    ranks = _skip_positions(m * (m - 1) // 2, 1.0 - p, rng, block)
+    fu, fv = _pair_from_rank(ranks, m)
+    fu, fv = private_nodes[fu], private_nodes[fv]
+    # Positions that hold a true edge were already decided above
+    true_keys = np.sort(src[~public] * n + dst[~public])
+    if len(true_keys) and len(ranks):
+        keys = fu * n + fv
+        loc = np.minimum(np.searchsorted(true_keys, keys), len(true_keys) - 1)
+        fake = true_keys[loc] != keys
+        fu, fv = fu[fake], fv[fake]
+
+    u = np.concatenate([src[kept], fu])
+    v = np.concatenate([dst[kept], fv])
+    is_public = np.concatenate([public[kept], np.zeros(len(fu), dtype=bool)])
+    exists = np.concatenate([np.ones(int(kept.sum()), dtype=bool), np.zeros(len(fu), dtype=bool)])
+    return u, v, is_public, exists
+
+
+def confirm_edges(is_public: np.ndarray, exists: np.ndarray, epsilon: float, rng: np.random.Generator) -> np.ndarray:
+    """
+    Round-two confirmation of round-one edges: public edges confirm exactly,
+    private ones report a fresh RR(exists) with truth probability p(epsilon).
+    """
+    p = rr_truth_probability(epsilon)
+    return is_public | (rng.random(len(exists)) < np.where(exists, p, 1.0 - p))
+
+
+class EdgeLDPAlgorithms:
+    """
+    Visibility-aware Edge-LDP estimators built on per-edge randomized response
+    (algorithms.md §2-§3, §5). Every private edge position is perturbed locally;
+    the estimators only see the noisy reports.
+
+    The public/private split follows SocialGraph.public_nodes: a position (u, v) is
+    PUBLIC iff u or v is a public node. Nodes are addressed by CSR index (see SocialGraph.as_csr).
+    Like GraphDPAlgorithms, every query returns (estimate, sensitivity).
+    """
+    def __init__(self, graph, seed: Optional[int] = None, max_wedges: int = DEFAULT_MAX_WEDGES):
+        self.graph = graph
+        self.rng = np.random.default_rng(seed)
+        self.max_wedges = max_wedges
+        # Error breakdown of the last release that has one (edge_count)
+        self.last_error: Optional[Dict] = None
+
+    def _round(self, epsilon: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        csr = self.graph.as_csr()
+        return randomized_response_edges(csr.indptr, csr.indices, self.graph.public_mask, epsilon, self.rng)
+
+    def edge_count(self, epsilon: float) -> Tuple[float, float]:
+        """
+        Single-round edge count (algorithms.md §3): exact public count plus the
+        debiased private count. Records the variance of the private part in
+        self.last_error.
+        Returns (estimate, sensitivity).
+        """
+        p = rr_truth_probability(epsilon)
+        _, _, is_public, _ = self._round(epsilon)
+        num_private = int((~self.graph.public_mask).sum())
+        private_positions = num_private * (num_private - 1) // 2
+        public_count = float(is_public.sum())
+        private_count = debias_count(float(len(is_public)) - public_count, private_positions, p)
+        variance = private_positions * p * (1.0 - p) / (2.0 * p - 1.0) ** 2
+        self.last_error = {"private_positions": private_positions, "variance": variance}
+        return public_count + private_count, EDGE_SENSITIVITY
+
+    def triangle_count(self, epsilon: float, max_weight: float = 50.0) -> Tuple[float, float]:
+        """
+        Two-round triangle count with inverse probability weighting (algorithms.md §5).
+        Round 1 (epsilon/2) builds the noisy graph; every triangle of it is a candidate.
+        Round 2 (epsilon/2) confirms each noisy edge once, shared by all its candidates.
+        Confirmed triangles count 1 if all three edges are public, otherwise
+        1/(p1*p2)^n_private, capped at `max_weight` and shrunk when the detection
+        probability is below 0.3; a false-positive correction is then subtracted.
+        Returns (estimate, sensitivity).
+        """
+        eps1 = eps2 = epsilon / 2.0
+        p1, p2 = rr_truth_probability(eps1), rr_truth_probability(eps2)
+        q2 = 1.0 - p2
+        n = len(self.graph.as_csr())
+        u, v, is_public, exists = self._round(eps1)
+        confirmed = confirm_edges(is_public, exists, eps2, self.rng)
+
+        # Noisy graph in CSR form; orientation keeps each edge once, so map back through packed keys
+        noisy_keys = u * n + v
+        order = np.argsort(noisy_keys)
+        noisy_keys, is_public, confirmed = noisy_keys[order], is_public[order], confirmed[order]
+        rows = np.concatenate([u, v])
+        cols = np.concatenate([v, u])
+        by_row = np.lexsort((cols, rows))
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        out_indptr, out_dst, out_src = orient_by_degree(indptr, cols[by_row])
+        edge_of = np.searchsorted(noisy_keys, np.minimum(out_src, out_dst) * n + np.maximum(out_src, out_dst))
+        edge_public = is_public[edge_of]
+        edge_confirmed = confirmed[edge_of]
+
+        public_triangles = 0
+        weighted = 0.0
+        num_candidates = 0
+        num_confirmed = 0
+        for e_uv, e_uw, e_vw in iter_triangles(out_indptr, out_dst, out_src, self.max_wedges):
+            num_candidates += len(e_uv)
+            hit = edge_confirmed[e_uv] & edge_confirmed[e_uw] & edge_confirmed[e_vw]
+            n_private = 3 - (edge_public[e_uv[hit]].astype(np.int64) + edge_public[e_uw[hit]] + edge_public[e_vw[hit]])
+            public_triangles += int((n_private == 0).sum())
+            detection = (p1 * p2) ** n_private[n_private > 0].astype(float)
+            detection = detection[detection > 0.01]
+            weights = np.minimum(1.0 / detection, max_weight)
+            # Variance penalty for low detection probability
+            weights *= np.where(detection < 0.3, 0.5 + 0.5 * detection / 0.3, 1.0)
+            weighted += float(weights.sum())
+            num_confirmed += int((n_private == 0).sum()) + len(detection)
+
+        if num_candidates > 0 and num_confirmed < num_candidates:
+            false_correction = (num_candidates - num_confirmed) * q2 ** 2 * 0.5
+            weighted = max(0.0, weighted - false_correction)
+        return max(0.0, public_triangles + weighted), EDGE_SENSITIVITY
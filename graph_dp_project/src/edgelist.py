@@ -0,0 +1,123 @@
+import gzip
+import numpy as np
+from typing import BinaryIO, Iterator, List
+from .csr import CSRGraph, _indptr_dtype
+
+# Bytes read per block; parsing memory is a small multiple of this
+DEFAULT_BLOCK_BYTES = 1 << 24
+
+# Undirected edges are deduplicated as packed (lo << 32 | hi) keys
+_ID_LIMIT = 1 << 32
+_LOW_MASK = np.uint64(_ID_LIMIT - 1)
+
+
+def _open(path: str) -> BinaryIO:
+    return gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb")
+
+
+def _strip_comments(data: bytes) -> bytes:
+    # Everything from '#' to the end of its line is a comment, whole-line or trailing (as in nx.read_edgelist)
+    if b"#" not in data:
+        return data
+    return b"\n".join(line.split(b"#", 1)[0] for line in data.split(b"\n"))
+
+
+def _parse_block(block: bytes, num_cols: int) -> np.ndarray:
+    block = _strip_comments(block)
+    if not block.strip():
+        # A block of comments and blank lines only
+        return np.empty((0, 2), dtype=np.int64)
+    # Extra columns (weights, timestamps) may be non-integer; ids stay exact in float64 below 2**53
+    values = np.fromstring(block, dtype=np.int64 if num_cols == 2 else np.float64, sep=" ")
+    if len(values) % num_cols:
+        raise ValueError(f"Malformed edge list block: {len(values)} values for {num_cols} columns")
+    return values.reshape(-1, num_cols)[:, :2].astype(np.int64)
+
+
+def iter_edge_blocks(path: str, block_bytes: int = DEFAULT_BLOCK_BYTES) -> Iterator[np.ndarray]:
+    """
+    Streams a plain or .gz whitespace-separated edge list as (k, 2) int64 arrays.
+    Text from '#' to the end of a line is skipped (whole-line and trailing
+    comments); columns after the first two are ignored.
+    """
+    num_cols = None
+    carry = b""
+    with _open(path) as f:
+        while True:
+            chunk = f.read(block_bytes)
+            data = carry + chunk
+            if not chunk:
+                carry = b""
+            else:
+                # Only parse complete lines; the tail waits for the next block
+                cut = data.rfind(b"\n") + 1
+                data, carry = data[:cut], data[cut:]
+            if num_cols is None:
+                for line in _strip_comments(data).split(b"\n"):
+                    if line.strip():
+                        num_cols = len(line.split())
+                        break
+            if num_cols is not None and data.strip():
+                yield _parse_block(data, num_cols)
+            if not chunk:
+                break
+
+
+def _block_keys(edges: np.ndarray) -> np.ndarray:
+    if len(edges) and (edges.min() < 0 or edges.max() >= _ID_LIMIT):
+        raise ValueError("Streaming loader supports node ids in [0, 2**32)")
+    u = edges[:, 0].astype(np.uint64)
+    v = edges[:, 1].astype(np.uint64)
+    keep = u != v
+    lo = np.minimum(u[keep], v[keep])
+    hi = np.maximum(u[keep], v[keep])
+    return np.unique((lo << np.uint64(32)) | hi)
+
+
+def read_edgelist_csr(path: str, block_bytes: int = DEFAULT_BLOCK_BYTES) -> CSRGraph:
+    """
+    Chunked replacement for nx.read_edgelist that builds a CSRGraph directly.
+    Each block is parsed with NumPy, symmetrized and deduplicated on its own;
+    block results are merged log-structured, so peak memory stays near the size
+    of the final unique edge set plus one block. Self-loops are dropped.
+    """
+    merged = np.empty(0, dtype=np.uint64)
+    pending: List[np.ndarray] = []
+    pending_size = 0
+    for edges in iter_edge_blocks(path, block_bytes):
+        keys = _block_keys(edges)
+        pending.append(keys)
+        pending_size += len(keys)
+        if pending_size >= max(len(merged), 1 << 20):
+            merged = np.unique(np.concatenate([merged] + pending))
+            pending, pending_size = [], 0
+    if pending:
+        merged = np.unique(np.concatenate([merged] + pending))
+    return _csr_from_keys(merged)
+
+
+def _csr_from_keys(keys: np.ndarray) -> CSRGraph:
+    # keys are unique and sorted, so the lo-side rows come out already ordered
+    lo = (keys >> np.uint64(32)).astype(np.int64)
+    hi = (keys & _LOW_MASK).astype(np.int64)
+    del keys
+    node_ids = np.unique(np.concatenate([lo, hi]))
+    lo = np.searchsorted(node_ids, lo)
+    hi = np.searchsorted(node_ids, hi)
+    n = len(node_ids)
+    degrees = np.bincount(lo, minlength=n) + np.bincount(hi, minlength=n)
+    indptr = np.zeros(n + 1, dtype=_indptr_dtype(2 * len(lo)))
+    np.cumsum(degrees, out=indptr[1:])
+    # Fill each row with its smaller neighbors (from hi-side entries) then larger ones
+    indices = np.empty(2 * len(lo), dtype=np.int32)
+    order = np.argsort(hi, kind="stable")
+    smaller_rows, smaller_cols = hi[order], lo[order]
+    smaller_counts = np.bincount(hi, minlength=n)
+    fill = indptr[:-1].astype(np.int64).copy()
+    pos = fill[smaller_rows] + (np.arange(len(smaller_rows)) - np.repeat(np.cumsum(smaller_counts) - smaller_counts, smaller_counts))
+    indices[pos] = smaller_cols
+    fill += smaller_counts
+    larger_counts = np.bincount(lo, minlength=n)
+    pos = fill[lo] + (np.arange(len(lo)) - np.repeat(np.cumsum(larger_counts) - larger_counts, larger_counts))
+    indices[pos] = hi
+    return CSRGraph(indptr, indices, node_ids)
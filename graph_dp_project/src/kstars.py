@@ -0,0 +1,139 @@
+import numpy as np
+from typing import Optional, Sequence, Tuple, Union
+
+# C(n, k) = C(n, m) with m = min(k, n - k) <= n / 2, which is at least C(2m, m):
+# m > EXACT_STEPS means C(n, k) >= C(68, 34) > 2**63, and m > FLOAT_STEPS
+# means C(n, k) >= C(1030, 515), beyond the float64 range
+EXACT_STEPS = 33
+FLOAT_STEPS = 514
+
+_INT64_MAX = np.iinfo(np.int64).max
+_FLOAT_MAX = np.finfo(np.float64).max
+
+Ks = Union[int, Sequence[int], np.ndarray]
+
+
+def _binomial_grid(n: np.ndarray, k: np.ndarray, overflow: str) -> np.ndarray:
+    """
+    C(n, k) as float64 over equally shaped int64 grids, by the product
+    C(n, j) = C(n, j - 1) * (n - j + 1) / j for j = 1..m. The product runs in
+    int64 while C(n, j) fits (reduced by gcd(C(n, j - 1), j) so each step stays
+    an exact integer), so every value below 2**63 is float(math.comb(n, k));
+    entries that outgrow int64 continue in extended precision (float128 where
+    the platform has it), m - 33 roundings of about 1e-19 each before the final
+    rounding to float64.
+    """
+    out = np.zeros(n.shape, dtype=float)
+    valid = (k >= 0) & (n >= k)
+    if not valid.any():
+        return out
+    n, k = n[valid], k[valid]
+    m = np.minimum(k, n - k)
+
+    exact = m <= EXACT_STEPS
+    c = np.ones(len(n), dtype=np.int64)
+    done = np.zeros(len(n), dtype=np.int64)
+    for j in range(1, int(m[exact].max(initial=0)) + 1):
+        step = np.flatnonzero(exact & (m >= j))
+        g = np.gcd(c[step], j)
+        reduced, factor = c[step] // g, (n[step] - (j - 1)) // (j // g)
+        fits = reduced <= _INT64_MAX // factor
+        # C(n, j) no longer fits in int64: C(n, j - 1) carries on below
+        exact[step[~fits]] = False
+        step, reduced, factor = step[fits], reduced[fits], factor[fits]
+        c[step] = reduced * factor
+        done[step] = j
+    values = c.astype(float)
+
+    rest = np.flatnonzero(~exact & (m <= FLOAT_STEPS))
+    if len(rest):
+        acc = c[rest].astype(np.longdouble)
+        n_r, m_r = n[rest], m[rest]
+        for j in range(int(done[rest].min()) + 1, int(m_r.max()) + 1):
+            step = (m_r >= j) & (done[rest] < j)
+            acc[step] *= (n_r[step] - (j - 1)).astype(np.longdouble) / j
+        with np.errstate(over="ignore"):
+            values[rest] = acc.astype(float)
+
+    too_big = (m > FLOAT_STEPS) | (values > _FLOAT_MAX)
+    if too_big.any():
+        if overflow == "raise":
+            i = int(np.argmax(too_big))
+            raise OverflowError(f"C({int(n[i])}, {int(k[i])}) exceeds the float64 range")
+        values[too_big] = np.inf
+    out[valid] = values
+    return out
+
+
+def binomials(n: np.ndarray, ks: Ks, overflow: str = "raise") -> np.ndarray:
+    """
+    C(n, k) as float64 for an integer array `n` and one k (same shape as n) or
+    several (shape (len(ks),) + n.shape), 0 where k > n. Each distinct (n, k)
+    pair is computed once and matches float(math.comb(n, k)) whenever that
+    value fits in int64, and is within a few float64 ulps of it beyond.
+    Values beyond the float64 range raise OverflowError, or become inf with
+    overflow="inf".
+    """
+    if overflow not in ("raise", "inf"):
+        raise ValueError(f"Unknown overflow mode: {overflow}")
+    n = np.asarray(n, dtype=np.int64)
+    k = np.asarray(ks, dtype=np.int64)
+    if n.size and 0 <= n.min() and n.max() <= 2 * n.size:
+        # Degree vectors: distinct values and their ranks from a presence table instead of a sort
+        present = np.bincount(n.ravel()) > 0
+        distinct = np.flatnonzero(present)
+        inverse = (np.cumsum(present) - 1)[n]
+    else:
+        distinct, inverse = np.unique(n, return_inverse=True)
+    grid_n, grid_k = np.broadcast_arrays(distinct, k.reshape(k.shape + (1,) * distinct.ndim))
+    table = _binomial_grid(grid_n.ravel(), grid_k.ravel(), overflow).reshape(grid_n.shape)
+    return table[..., inverse.reshape(n.shape)]
+
+
+def clip_degrees(degrees: np.ndarray, clip: Optional[int] = None,
+                 public_mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Degrees with every node outside `public_mask` capped at `clip` (all nodes
+    when no mask is given); unchanged without `clip`.
+    """
+    if clip is None:
+        return degrees
+    if public_mask is None:
+        return np.minimum(degrees, clip)
+    return np.where(public_mask, degrees, np.minimum(degrees, clip))
+
+
+def k_star_counts(degrees: np.ndarray, ks: Ks, clip: Optional[int] = None,
+                  public_mask: Optional[np.ndarray] = None, overflow: str = "raise") -> np.ndarray:
+    """
+    k-stars C(d, k) centered at every node, for one k or several at once (one
+    row per k). With `clip`, private degrees are capped at `clip` first.
+    """
+    return binomials(clip_degrees(degrees, clip, public_mask), ks, overflow)
+
+
+def k_star_sensitivities(degrees: np.ndarray, ks: Ks, overflow: str = "raise") -> np.ndarray:
+    """
+    Instance-specific sensitivity of every node's k-star count, max(1, C(d, k-1)):
+    an edge added or removed at a node changes C(d, k) by C(d', k-1).
+    """
+    return np.maximum(1.0, binomials(degrees, np.asarray(ks, dtype=np.int64) - 1, overflow))
+
+
+def clipped_sensitivity(D_max: int, k: int, overflow: str = "raise") -> float:
+    """
+    Sensitivity C(D_max - 1, k - 1) of k-stars clipped at degree D_max.
+    """
+    return float(binomials(np.array([D_max - 1]), k - 1, overflow)[0])
+
+
+def k_star_terms(degrees: np.ndarray, ks: Ks, overflow: str = "raise") -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (unclipped k-star counts, instance-specific sensitivities) of every node and
+    k from one pass: row i of both is k = ks[i], and the sensitivities reuse the
+    k - 1 counts when those are requested as well.
+    """
+    ks = np.atleast_1d(np.asarray(ks, dtype=np.int64))
+    orders = np.union1d(ks, ks - 1)
+    table = binomials(degrees, orders, overflow)
+    return table[np.searchsorted(orders, ks)], np.maximum(1.0, table[np.searchsorted(orders, ks - 1)])
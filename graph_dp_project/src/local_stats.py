@@ -0,0 +1,540 @@
+import time
+import numpy as np
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+from .csr import CSRGraph, gather_row_positions
+from .triangles import triangle_stats, prefix_triangles, neighborhood_stats, sampled_neighbor_triangles
+from .kstars import k_star_counts
+from .profiling import timed_phase
+
+# Under these policies an observer sees every edge among its own neighbors and
+# every edge of each neighbor, so its local triangle statistics equal the global ones.
+NEIGHBORHOOD_POLICIES = ("1-hop", "2-hop")
+
+
+def local_degree(subgraph, node: int) -> int:
+    return subgraph.degree(node) if node in subgraph else 0
+
+
+def local_triangles(subgraph, neighbors: List[int]) -> int:
+    """
+    Number of visible edges among `neighbors` (triangles closed at the observer).
+    """
+    tri_count = 0
+    for i in range(len(neighbors)):
+        for j in range(i + 1, len(neighbors)):
+            if subgraph.has_edge(neighbors[i], neighbors[j]):
+                tri_count += 1
+    return tri_count
+
+
+def local_max_common_neighbors(subgraph, neighbors: List[int]) -> int:
+    """
+    Max over neighbors v of |N(v) ∩ neighbors|, the instance-specific triangle sensitivity.
+    """
+    max_common = 0
+    for v in neighbors:
+        v_neighbors = set(subgraph.neighbors(v))
+        common = 0
+        for w in neighbors:
+            if w in v_neighbors:
+                common += 1
+        if common > max_common:
+            max_common = common
+    return max_common
+
+
+def k_star_values(degrees: np.ndarray, k: int, clip: Optional[int] = None,
+                  public_mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    C(d, k) per node as float (kstars.k_star_counts). With `clip`, degrees of
+    nodes outside `public_mask` are capped at `clip` first.
+    """
+    return k_star_counts(degrees, k, clip, public_mask)
+
+
+class EdgeUpdateDelta:
+    """
+    Effect of one batch of edge deletions then additions (CSR index pairs) on the
+    neighborhood statistics, found by replaying the batch on adjacency sets of the
+    touched nodes only. For each effective change (u, v) with common neighbors C:
+      triangles: u and v move by |C|, every w in C by 1;
+      edge supports |N(x) ∩ N(y)|: (u, v) appears/disappears with |C|, and
+      (u, w), (v, w) move by 1 for w in C.
+    Support increases are kept as candidate maxima (`raises`); decreases keep the
+    support before the change (`drops`) so a node is only recomputed if an edge
+    that may have held its max common neighbors shrank.
+    """
+    def __init__(self, csr, add_idx: np.ndarray, del_idx: np.ndarray):
+        self._csr = csr
+        self._adj: Dict[int, set] = {}
+        self.endpoints: set = set()
+        self.triangles: Dict[int, int] = {}
+        self.raises: Dict[int, int] = {}
+        self.drops: List[Tuple[int, int]] = []
+        # (w, u, v, sign): w lost/gained triangle (u, v, w) without being an endpoint
+        self.closed: List[Tuple[int, int, int, int]] = []
+        for u, v in del_idx.tolist():
+            self._toggle(u, v, -1)
+        for u, v in add_idx.tolist():
+            self._toggle(u, v, +1)
+
+    def _neighbors(self, x: int) -> set:
+        adj = self._adj.get(x)
+        if adj is None:
+            adj = self._adj[x] = set(self._csr.neighbor_indices(x).tolist())
+        return adj
+
+    def _bump(self, x: int, delta: int):
+        self.triangles[x] = self.triangles.get(x, 0) + delta
+
+    def _support(self, x: int, y: int, sign: int):
+        # Support of the edge (x, y) in the current replay state
+        support = len(self._neighbors(x) & self._neighbors(y))
+        if sign > 0:
+            for z in (x, y):
+                if support > self.raises.get(z, -1):
+                    self.raises[z] = support
+        else:
+            self.drops.extend(((x, support), (y, support)))
+
+    def _toggle(self, u: int, v: int, sign: int):
+        nu, nv = self._neighbors(u), self._neighbors(v)
+        if u == v or (v in nu) == (sign > 0):
+            # Already present / absent: adjacency order can still change for the endpoints
+            self.endpoints.update((u, v))
+            return
+        common = nu & nv
+        if sign < 0:
+            # Supports before the edge disappears
+            self._support(u, v, sign)
+            for w in common:
+                self._support(u, w, sign)
+                self._support(v, w, sign)
+            nu.discard(v)
+            nv.discard(u)
+        else:
+            nu.add(v)
+            nv.add(u)
+            self._support(u, v, sign)
+            for w in common:
+                self._support(u, w, sign)
+                self._support(v, w, sign)
+        self.endpoints.update((u, v))
+        self._bump(u, sign * len(common))
+        self._bump(v, sign * len(common))
+        for w in common:
+            self._bump(w, sign)
+            self.closed.append((w, u, v, sign))
+
+    def touched(self) -> np.ndarray:
+        """
+        CSR indices of every node whose statistics may have changed.
+        """
+        nodes = self.endpoints | set(self.triangles) | set(self.raises) | {x for x, _ in self.drops}
+        return np.array(sorted(nodes), dtype=np.int64)
+
+
+class LocalStatistics:
+    """
+    Per-graph, per-oracle cache of the deterministic local values every
+    GraphDPAlgorithms query is built from (visible degree, local triangles,
+    max common neighbors). Each statistic is computed once for all nodes and
+    reused across queries and epsilons, so repeated releases only pay for noise.
+
+    For the 1-hop and 2-hop policies triangle statistics come from the bulk
+    engine in triangles.py and view sizes from the blocked sparse products in
+    neighborhoods.py; other policies fall back to per-observer views.
+    Visible-subgraph views are kept in an LRU bounded by `max_cached_subgraphs`.
+    Obtain instances through SocialGraph.local_statistics(oracle), which drops
+    them whenever the graph or the public node set changes.
+    SocialGraph.apply_edge_updates instead refreshes only the affected nodes
+    through apply_updates.
+
+    Value methods take an optional PhaseProfiler (see profiling.py); it is only
+    touched when values are actually computed, not on cache hits.
+    """
+    def __init__(self, graph, oracle, max_cached_subgraphs: int = 1024):
+        self.graph = graph
+        self.oracle = oracle
+        self.max_cached_subgraphs = max_cached_subgraphs
+        self.nodes = list(graph.graph.nodes())
+        self.public_mask = np.fromiter((graph.is_public(node) for node in self.nodes), dtype=bool, count=len(self.nodes))
+        self._values: Dict[Tuple, np.ndarray] = {}
+        self._subgraphs: "OrderedDict[int, object]" = OrderedDict()
+
+    def subgraph(self, node: int):
+        """
+        Visible subgraph of `node`, served from the LRU when possible.
+        """
+        view = self._subgraphs.get(node)
+        if view is not None:
+            self._subgraphs.move_to_end(node)
+            return view
+        view = self.graph.get_visible_subgraph(node, self.oracle)
+        if self.max_cached_subgraphs > 0:
+            self._subgraphs[node] = view
+            if len(self._subgraphs) > self.max_cached_subgraphs:
+                self._subgraphs.popitem(last=False)
+        return view
+
+    def map_views(self, fn: Callable, profiler=None) -> list:
+        """
+        fn(i, node, view) for every node, in node order.
+        With a profiler, view construction and fn are timed separately and each
+        observer's total is offered to the outlier list.
+        """
+        if profiler is None:
+            return [fn(i, node, self.subgraph(node)) for i, node in enumerate(self.nodes)]
+        clock = time.perf_counter
+        values = []
+        build = compute = 0.0
+        for i, node in enumerate(self.nodes):
+            start = clock()
+            view = self.subgraph(node)
+            built = clock()
+            values.append(fn(i, node, view))
+            done = clock()
+            build += built - start
+            compute += done - built
+            profiler.record_node(node, local_degree(view, node), done - start)
+        profiler.record("subgraph", build, len(self.nodes))
+        profiler.record("local_compute", compute, len(self.nodes))
+        return values
+
+    def degrees(self, profiler=None) -> np.ndarray:
+        """
+        Visible degree of every node (0 if the node sees no edges).
+        """
+        key = ("degree",)
+        if key not in self._values and self.oracle.policy in NEIGHBORHOOD_POLICIES:
+            with timed_phase(profiler, "local_compute", len(self.nodes)):
+                self._values[key] = self.graph.as_csr().degrees()[self._csr_positions()]
+        if key not in self._values:
+            values = self.map_views(lambda i, node, view: local_degree(view, node), profiler)
+            self._values[key] = np.array(values, dtype=np.int64)
+        return self._values[key]
+
+    def triangles(self, clip: Optional[int] = None, profiler=None) -> np.ndarray:
+        """
+        Local triangle count of every node. With `clip`, private nodes only
+        consider their first `clip` neighbors in the order their visible
+        subgraph lists them (SocialGraph.clipped_neighbors); public nodes are
+        never clipped.
+        """
+        if clip is None:
+            self._compute_triangle_stats(profiler)
+            return self._values[("triangles",)]
+        key = ("triangles", clip)
+        if key not in self._values and self.oracle.policy in NEIGHBORHOOD_POLICIES:
+            self._values[key] = self._clipped_triangles_bulk(clip, profiler)
+        if key not in self._values:
+            def clipped(i, node, subgraph):
+                if node not in subgraph:
+                    return 0
+                neighbors = list(subgraph.neighbors(node))
+                if not self.public_mask[i]:
+                    neighbors = neighbors[:clip]
+                return local_triangles(subgraph, neighbors)
+            self._values[key] = np.array(self.map_views(clipped, profiler), dtype=np.int64)
+        return self._values[key]
+
+    def k_stars(self, k: int, clip: Optional[int] = None, profiler=None) -> np.ndarray:
+        """
+        k-star count C(d, k) centered at every node; with `clip`, private
+        degrees are capped at `clip` first (public nodes are never clipped).
+        """
+        key = ("k_stars", k, clip)
+        if key not in self._values:
+            degrees = self.degrees(profiler)
+            with timed_phase(profiler, "local_compute", len(degrees)):
+                self._values[key] = k_star_values(degrees, k, clip, self.public_mask)
+        return self._values[key]
+
+    def sampled_triangles(self, samples: int, rng: np.random.Generator, clip: Optional[int] = None,
+                          profiler=None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Sampling estimate of triangles(clip): every node checks at most `samples`
+        pairs of its (clipped) neighbor list (see triangles.sampled_neighbor_triangles).
+        Returns (estimates, variance estimates, weights W/checked). A fresh draw
+        each call, so nothing is cached; policies without the bulk engine get
+        their exact values with zero variance.
+        """
+        if self.oracle.policy not in NEIGHBORHOOD_POLICIES:
+            exact = self.triangles(clip, profiler).astype(float)
+            return exact, np.zeros(len(exact)), np.ones(len(exact))
+        csr = self.graph.as_csr()
+        lens, members = self._neighbor_lists(clip)
+        with timed_phase(profiler, "local_compute", len(lens)):
+            return sampled_neighbor_triangles(csr.indptr, csr.indices, lens, members, samples, rng)
+
+    def _neighbor_lists(self, clip: Optional[int]) -> Tuple[np.ndarray, np.ndarray]:
+        # (lengths, concatenated CSR neighbor indices) in node order; private nodes keep their first `clip`
+        csr = self.graph.as_csr()
+        flat, lens = gather_row_positions(csr.indptr, self._csr_positions())
+        members = csr.indices[flat]
+        clipped = np.zeros(len(lens), dtype=bool) if clip is None else ~self.public_mask & (lens > clip)
+        if not clipped.any():
+            return lens, members
+        if isinstance(self.graph.graph, CSRGraph) and self.oracle.policy == "1-hop":
+            # CSR rows are already in the 1-hop views' order: keep each clipped row's head
+            within = np.arange(len(flat)) - np.repeat(np.cumsum(lens) - lens, lens)
+            keep = within < np.repeat(np.where(clipped, clip, lens), lens)
+            return np.where(clipped, clip, lens), members[keep]
+        rows = np.split(members, np.cumsum(lens)[:-1])
+        for i in np.flatnonzero(clipped):
+            rows[i] = csr.indices_of(self.graph.clipped_neighbors(self.nodes[i], self.oracle, clip))
+        return np.where(clipped, clip, lens), np.concatenate(rows)
+
+    def max_common_neighbors(self, profiler=None) -> np.ndarray:
+        """
+        Max common neighbors between each node and one of its visible neighbors.
+        """
+        self._compute_triangle_stats(profiler)
+        return self._values[("max_common",)]
+
+    def visible_nodes(self, profiler=None) -> np.ndarray:
+        """
+        Number of nodes in every observer's visible subgraph.
+        """
+        if ("visible_nodes",) not in self._values:
+            self._compute_view_stats(False, profiler)
+        return self._values[("visible_nodes",)]
+
+    def visible_edges(self, profiler=None) -> np.ndarray:
+        """
+        Number of edges in every observer's visible subgraph. Under 2-hop this
+        reaches three hops out and costs far more than visible_nodes().
+        """
+        if ("visible_edges",) not in self._values:
+            self._compute_view_stats(True, profiler)
+        return self._values[("visible_edges",)]
+
+    def _compute_view_stats(self, count_edges: bool, profiler=None):
+        # Whole-view sizes: blocked sparse products for all observers (neighborhoods.py)
+        if self.oracle.policy in NEIGHBORHOOD_POLICIES:
+            from .neighborhoods import view_statistics
+            with timed_phase(profiler, "local_compute", len(self.nodes)):
+                stats = view_statistics(self.graph.as_csr(), self.oracle.policy, count_edges=count_edges)
+            positions = self._csr_positions()
+            for name, values in stats.items():
+                key = ("degree",) if name == "degree" else (name,)
+                self._values.setdefault(key, values[positions])
+            return
+        def sizes(i, node, view):
+            subgraph = view.to_networkx()
+            return subgraph.number_of_nodes(), subgraph.number_of_edges()
+        sizes = np.array(self.map_views(sizes, profiler), dtype=np.int64).reshape(-1, 2)
+        self._values[("visible_nodes",)] = sizes[:, 0].copy()
+        self._values[("visible_edges",)] = sizes[:, 1].copy()
+
+    def prefetch(self, keys, profiler=None):
+        """
+        Computes every statistic named in `keys` (cache keys as in value())
+        that is not cached yet. Under
+        per-view policies all of them come out of one traversal of the visible
+        subgraphs instead of one traversal per statistic.
+        """
+        missing = [key for key in dict.fromkeys(keys) if key not in self._values]
+        if not missing:
+            return
+        k_star_keys = [key for key in missing if key[0] == "k_stars"]
+        if k_star_keys:
+            # k-stars only need degrees; derive them after the shared pass
+            missing = [key for key in missing if key[0] != "k_stars"] + [("degree",)]
+            missing = [key for key in dict.fromkeys(missing) if key not in self._values]
+        if self.oracle.policy in NEIGHBORHOOD_POLICIES:
+            for key in missing:
+                self.value(key, profiler)
+            missing = []
+        for key in [key for key in missing if key[0] in ("visible_nodes", "visible_edges")]:
+            self.value(key, profiler)
+            missing.remove(key)
+
+        want_full = ("triangles",) in missing or ("max_common",) in missing
+        clips = sorted({key[1] for key in missing if key[0] == "triangles" and len(key) == 2})
+
+        def all_stats(i, node, subgraph):
+            if node not in subgraph:
+                return (0, 0, 0) + (0,) * len(clips)
+            neighbors = list(subgraph.neighbors(node))
+            row = [len(neighbors), 0, 0]
+            if want_full:
+                row[1] = local_triangles(subgraph, neighbors)
+                row[2] = local_max_common_neighbors(subgraph, neighbors)
+            for clip in clips:
+                if self.public_mask[i] or len(neighbors) <= clip:
+                    row.append(row[1] if want_full else local_triangles(subgraph, neighbors))
+                else:
+                    row.append(local_triangles(subgraph, neighbors[:clip]))
+            return tuple(row)
+        if missing:
+            values = np.array(self.map_views(all_stats, profiler), dtype=np.int64).reshape(-1, 3 + len(clips))
+            if ("degree",) in missing:
+                self._values[("degree",)] = values[:, 0].copy()
+            if want_full:
+                self._values[("triangles",)] = values[:, 1].copy()
+                self._values[("max_common",)] = values[:, 2].copy()
+            for j, clip in enumerate(clips):
+                self._values[("triangles", clip)] = values[:, 3 + j].copy()
+        # One table lookup per clip answers every k requested with that clip
+        for clip in dict.fromkeys(key[2] for key in k_star_keys):
+            ks = [key[1] for key in k_star_keys if key[2] == clip]
+            degrees = self.degrees(profiler)
+            with timed_phase(profiler, "local_compute", len(degrees)):
+                rows = k_star_counts(degrees, ks, clip, self.public_mask)
+            for k, row in zip(ks, rows):
+                self._values[("k_stars", k, clip)] = row
+
+    def value(self, key: Tuple, profiler=None) -> np.ndarray:
+        """
+        Statistic by cache key: ("degree",), ("triangles",), ("max_common",),
+        ("triangles", clip), ("k_stars", k, clip), ("visible_nodes",) or ("visible_edges",).
+        """
+        if key == ("degree",):
+            return self.degrees(profiler)
+        if key == ("max_common",):
+            return self.max_common_neighbors(profiler)
+        if key[0] == "triangles":
+            return self.triangles(clip=key[1] if len(key) > 1 else None, profiler=profiler)
+        if key[0] == "k_stars":
+            return self.k_stars(key[1], clip=key[2], profiler=profiler)
+        if key == ("visible_nodes",):
+            return self.visible_nodes(profiler)
+        if key == ("visible_edges",):
+            return self.visible_edges(profiler)
+        raise KeyError(f"Unknown statistic: {key}")
+
+    def apply_updates(self, delta: EdgeUpdateDelta):
+        """
+        Folds an EdgeUpdateDelta into every cached statistic after the graph's
+        edges changed in place (see SocialGraph.apply_edge_updates). Under the
+        1-hop and 2-hop policies the values are global per-node statistics, so
+        only touched rows change: degrees and k-stars of endpoints, triangle
+        deltas, raised maxima, and a bulk recompute of max common neighbors and
+        clipped prefixes for the few nodes that need it. Cached arrays are
+        replaced, never mutated, so values handed out earlier stay valid.
+        """
+        self._subgraphs.clear()
+        if self.oracle.policy not in NEIGHBORHOOD_POLICIES:
+            self._values.clear()
+            return
+        # View sizes change up to three hops from an endpoint; recompute them on demand
+        self._values.pop(("visible_nodes",), None)
+        self._values.pop(("visible_edges",), None)
+        if not self._values:
+            return
+        csr = self.graph.as_csr()
+        positions = self._csr_positions()
+        row_of = np.empty(len(positions), dtype=np.int64)
+        row_of[positions] = np.arange(len(positions))
+        endpoints = np.array(sorted(delta.endpoints), dtype=np.int64)
+        end_rows = row_of[endpoints]
+        new_degrees = csr.degrees()
+        end_degrees = new_degrees[endpoints]
+
+        triangles = self._values.get(("triangles",))
+        if triangles is not None and delta.triangles:
+            triangles = triangles.copy()
+            idx = np.fromiter(delta.triangles.keys(), dtype=np.int64, count=len(delta.triangles))
+            triangles[row_of[idx]] += np.fromiter(delta.triangles.values(), dtype=np.int64, count=len(idx))
+            self._values[("triangles",)] = triangles
+
+        max_common = self._values.get(("max_common",))
+        if max_common is not None:
+            max_common = max_common.copy()
+            # An edge at or above the old maximum shrank: the max may have dropped
+            dirty = sorted({x for x, support in delta.drops if support >= max_common[row_of[x]]})
+            for x, support in delta.raises.items():
+                max_common[row_of[x]] = max(max_common[row_of[x]], support)
+            if dirty:
+                dirty = np.array(dirty, dtype=np.int64)
+                flat, lens = gather_row_positions(csr.indptr, dirty)
+                owner = np.repeat(np.arange(len(dirty), dtype=np.int64), lens)
+                max_common[row_of[dirty]] = neighborhood_stats(csr.indptr, csr.indices, owner, csr.indices[flat], len(dirty))[1]
+            self._values[("max_common",)] = max_common
+
+        for key in list(self._values):
+            if key[0] == "degree":
+                values = self._values[key].copy()
+                values[end_rows] = end_degrees
+            elif key[0] == "k_stars":
+                values = self._values[key].copy()
+                values[end_rows] = k_star_values(end_degrees, key[1], key[2], self.public_mask[end_rows])
+            elif key[0] == "triangles" and len(key) == 2:
+                values = self._clipped_after_update(self._values[key], key[1], delta, row_of, new_degrees)
+            else:
+                continue
+            self._values[key] = values
+
+    def _clipped_after_update(self, values: np.ndarray, clip: int, delta: EdgeUpdateDelta,
+                              row_of: np.ndarray, degrees: np.ndarray) -> np.ndarray:
+        values = values.copy()
+        triangles = self.triangles()
+        clipped = lambda x: not self.public_mask[row_of[x]] and degrees[x] > clip
+        # Unclipped nodes simply follow the full triangle count
+        for x in set(delta.triangles) | delta.endpoints:
+            if not clipped(x):
+                values[row_of[x]] = triangles[row_of[x]]
+        # Clipped endpoints: their prefix itself may have changed
+        recompute = {x for x in delta.endpoints if clipped(x)}
+        csr = self.graph.as_csr()
+        if self.oracle.policy == "2-hop":
+            # A 2-hop prefix follows the copy order of the node's ball, built from its neighbors' adjacency
+            near = {int(w) for x in delta.endpoints for w in csr.neighbor_indices(x)}
+            recompute |= {w for w in near if clipped(w)}
+        # Other clipped nodes keep their prefix; a closed pair counts iff both ends are in it
+        prefixes: Dict[int, set] = {}
+        for w, u, v, sign in delta.closed:
+            if w in recompute or not clipped(w):
+                continue
+            if w not in prefixes:
+                node = self.nodes[row_of[w]]
+                prefixes[w] = set(csr.indices_of(self.graph.clipped_neighbors(node, self.oracle, clip)).tolist())
+            if u in prefixes[w] and v in prefixes[w]:
+                values[row_of[w]] += sign
+        if recompute:
+            rows = row_of[np.array(sorted(recompute), dtype=np.int64)]
+            values[rows] = self._prefix_triangle_counts(rows, clip)
+        return values
+
+    def _csr_positions(self) -> np.ndarray:
+        # CSR index of every entry of self.nodes
+        return self.graph.as_csr().indices_of(self.nodes)
+
+    def _clipped_triangles_bulk(self, clip: int, profiler=None) -> np.ndarray:
+        counts = self.triangles(profiler=profiler).copy()
+        degrees = self.degrees(profiler)
+        clipped = np.flatnonzero(~self.public_mask & (degrees > clip))
+        if len(clipped):
+            with timed_phase(profiler, "local_compute", len(clipped)):
+                counts[clipped] = self._prefix_triangle_counts(clipped, clip)
+        return counts
+
+    def _prefix_triangle_counts(self, rows: np.ndarray, clip: int) -> np.ndarray:
+        # Triangles among the first `clip` neighbors, in the order of each node's visible subgraph
+        csr = self.graph.as_csr()
+        prefixes = [csr.indices_of(self.graph.clipped_neighbors(self.nodes[i], self.oracle, clip)) for i in rows]
+        return prefix_triangles(csr.indptr, csr.indices, prefixes)
+
+    def _compute_triangle_stats(self, profiler=None):
+        # Unclipped triangles and max common neighbors share one pass
+        if ("triangles",) in self._values:
+            return
+        if self.oracle.policy in NEIGHBORHOOD_POLICIES:
+            csr = self.graph.as_csr()
+            with timed_phase(profiler, "local_compute", len(self.nodes)):
+                triangles, max_common = triangle_stats(csr.indptr, csr.indices)
+            positions = self._csr_positions()
+            self._values[("triangles",)] = triangles[positions]
+            self._values[("max_common",)] = max_common[positions]
+            return
+
+        def both(i, node, subgraph):
+            if node not in subgraph:
+                return 0, 0
+            neighbors = list(subgraph.neighbors(node))
+            return local_triangles(subgraph, neighbors), local_max_common_neighbors(subgraph, neighbors)
+        values = np.array(self.map_views(both, profiler), dtype=np.int64).reshape(-1, 2)
+        self._values[("triangles",)] = values[:, 0].copy()
+        self._values[("max_common",)] = values[:, 1].copy()
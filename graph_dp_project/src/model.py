@@ -1,6 +1,14 @@
-import networkx as nx
 import numpy as np
-from typing import Set, Tuple, Dict, Optional
+from itertools import islice
+from typing import TYPE_CHECKING, Set, Tuple, Dict, Optional
+from .csr import CSRGraph, gather_rows
+from .edgelist import read_edgelist_csr
+from .snapshot import (SNAPSHOT_SUFFIX, default_snapshot_path, read_snapshot, snapshot_is_current,
+                       source_signature, write_snapshot)
+
+# networkx is imported where a networkx graph is built or required, so the CSR backend runs on NumPy alone
+if TYPE_CHECKING:
+    import networkx as nx
 
 class VisibilityOracle:
     """
@@ -9,7 +17,7 @@ class VisibilityOracle:
     def __init__(self, policy: str = "1-hop"):
         self.policy = policy
 
-    def is_visible(self, graph: nx.Graph, observer: int, edge: Tuple[int, int]) -> bool:
+    def is_visible(self, graph: "nx.Graph", observer: int, edge: Tuple[int, int]) -> bool:
         """
         Checks if an edge (u, v) is visible to the observer.
         """
@@ -33,6 +41,7 @@ class VisibilityOracle:
             # Check distance on the fly or use BFS from observer.
             # Since we usually call get_visible_subgraph, we'll implement the logic there efficiently.
             # Here, for single edge check (slow):
+            import networkx as nx
             try:
                 dist_u = nx.shortest_path_length(graph, observer, u)
                 dist_v = nx.shortest_path_length(graph, observer, v)
@@ -45,26 +54,328 @@ class VisibilityOracle:
             
         return False
 
+    # Ball radius around the observer that decides visibility under each bulk-supported policy
+    BALL_DEPTH = {"1-hop": 1, "2-hop": 2}
+
+    @staticmethod
+    def _ball(csr: CSRGraph, i: int, depth: int) -> np.ndarray:
+        # Boolean mask over CSR indices of the nodes within `depth` hops of index i
+        mask = np.zeros(len(csr.node_ids), dtype=bool)
+        mask[i] = True
+        frontier = np.array([i], dtype=np.int64)
+        for _ in range(depth):
+            reached, _ = gather_rows(csr.indptr, csr.indices, frontier)
+            frontier = np.unique(reached[~mask[reached]])
+            mask[frontier] = True
+        return mask
+
+    def visible_mask(self, graph, observer: int, edges) -> np.ndarray:
+        """
+        Vectorized is_visible: one bool per row of `edges` (an (m, 2) array of
+        node ids) for a single observer. The observer's ball (closed
+        neighborhood for 1-hop, radius 2 for 2-hop) is computed once as a
+        bitmask over CSR indices and every edge is answered by two lookups.
+        `graph` is a networkx graph or a CSRGraph; networkx input is converted
+        on every call, so pass SocialGraph.as_csr() when querying repeatedly.
+        Like is_visible, 2-hop raises nx.NodeNotFound for nodes not in the graph.
+        """
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        if self.policy == "global":
+            return np.ones(len(edges), dtype=bool)
+        if self.policy not in self.BALL_DEPTH or len(edges) == 0:
+            return np.zeros(len(edges), dtype=bool)
+        csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_networkx(graph)
+        i = csr.index_of(observer)
+        ends = csr.lookup(edges.ravel()).reshape(-1, 2)
+        if self.policy == "2-hop":
+            if i < 0 or (ends < 0).any():
+                import networkx as nx
+                missing = observer if i < 0 else edges[ends < 0][0]
+                raise nx.NodeNotFound(f"Node {missing} is not in the graph")
+            return self._ball(csr, i, 2)[ends].all(axis=1)
+        # 1-hop: an endpoint is the observer or one of its neighbors
+        if i < 0:
+            return (edges == observer).any(axis=1)
+        ball = np.append(self._ball(csr, i, 1), False)
+        return ball[ends].any(axis=1)
+
+    def observers_seeing(self, graph, edge: Tuple[int, int]) -> np.ndarray:
+        """
+        Node ids (ascending) of every observer for which is_visible(graph,
+        observer, edge) holds. Visibility is symmetric in the ball radius, so
+        this is the union (1-hop) or intersection (2-hop) of the endpoints'
+        balls, two bounded BFS instead of one check per observer.
+        """
+        csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_networkx(graph)
+        if self.policy == "global":
+            return csr.node_ids.copy()
+        if self.policy not in self.BALL_DEPTH:
+            return np.empty(0, dtype=csr.node_ids.dtype)
+        ends = csr.lookup(np.asarray(edge, dtype=np.int64))
+        depth = self.BALL_DEPTH[self.policy]
+        if self.policy == "2-hop":
+            if (ends < 0).any():
+                import networkx as nx
+                raise nx.NodeNotFound(f"Node {edge[int(np.argmax(ends < 0))]} is not in the graph")
+            seen = self._ball(csr, ends[0], depth) & self._ball(csr, ends[1], depth)
+        else:
+            seen = np.zeros(len(csr.node_ids), dtype=bool)
+            for j in ends[ends >= 0]:
+                seen |= self._ball(csr, j, depth)
+        return csr.node_ids[seen]
+
+# Public-node strategies drawn from SocialGraph.seed
+RANDOM_STRATEGIES = ("random", "degree_probabilistic")
+
+
 class SocialGraph:
     """
     Wrapper for the social network graph with visibility constraints.
     """
-    def __init__(self, data_path: Optional[str] = None, public_fraction: float = 0.0, public_strategy: str = "degree_top_k"):
-        self.graph = nx.Graph()
+    def __init__(self, data_path: Optional[str] = None, public_fraction: float = 0.0, public_strategy: str = "degree_top_k",
+                 backend: str = "networkx", max_cached_subgraphs: int = 1024, snapshot: bool = False,
+                 seed: Optional[int] = None):
+        if backend not in ("networkx", "csr"):
+            raise ValueError(f"Unknown backend: {backend}")
+        self.backend = backend
+        self.max_cached_subgraphs = max_cached_subgraphs
+        # snapshot=True converts a text edge list to <path>.gdps once and opens that afterwards
+        self.snapshot = snapshot
+        self._snapshot = None
+        self._version = 0
+        self._local_stats = {}
+        if backend == "networkx":
+            import networkx as nx
+            self.graph = nx.Graph()
+        else:
+            self.graph = CSRGraph.from_edges([], [])
         self.public_nodes = set()
         self.public_fraction = public_fraction
         self.public_strategy = public_strategy
+        # Seeds the RANDOM_STRATEGIES public-node draws
+        self.seed = seed
         
         if data_path:
             self.load_data(data_path)
             
+    @property
+    def graph(self):
+        return self._graph
+
+    @graph.setter
+    def graph(self, graph):
+        self._graph = graph
+        self.invalidate()
+
+    @property
+    def public_nodes(self) -> Set[int]:
+        return self._public_nodes
+
+    @public_nodes.setter
+    def public_nodes(self, nodes: Set[int]):
+        self._public_nodes = nodes
+        self.invalidate()
+
+    def invalidate(self):
+        """
+        Drops cached local statistics. Called automatically when `graph` or
+        `public_nodes` is reassigned; call it after mutating either in place.
+        """
+        self._version += 1
+        self._local_stats = {}
+        self._csr = None
+
+    def _fingerprint(self) -> Tuple[int, int, int, int]:
+        # Cheap guard against in-place edits that bypassed invalidate()
+        return (self._version, self._graph.number_of_nodes(), self._graph.number_of_edges(), len(self._public_nodes))
+
+    def as_csr(self) -> CSRGraph:
+        """
+        The graph in CSR form; converted once and cached for the networkx backend.
+        """
+        if isinstance(self._graph, CSRGraph):
+            return self._graph
+        fingerprint = self._fingerprint()
+        if self._csr is None or self._csr[0] != fingerprint:
+            self._csr = (fingerprint, CSRGraph.from_networkx(self._graph))
+        return self._csr[1]
+
+    def local_statistics(self, oracle: VisibilityOracle):
+        """
+        Shared LocalStatistics for this graph under `oracle`'s policy.
+        """
+        from .local_stats import LocalStatistics
+        fingerprint = self._fingerprint()
+        cached = self._local_stats.get(oracle.policy)
+        if cached is None or cached[0] != fingerprint:
+            cached = (fingerprint, LocalStatistics(self, oracle, self.max_cached_subgraphs))
+            self._local_stats[oracle.policy] = cached
+        return cached[1]
+
+    def snapshot_source(self) -> Optional[Tuple[str, Dict]]:
+        """
+        (path, header) of the snapshot the current graph and public nodes were
+        opened from, or None once either has been replaced or invalidated.
+        """
+        if self._snapshot is None or self._snapshot[0] != self._fingerprint():
+            return None
+        return self._snapshot[1], self._snapshot[2]
+
+    def _selection(self) -> Dict:
+        # Every parameter the public node set depends on besides the graph itself
+        selection = {"public_fraction": self.public_fraction, "public_strategy": self.public_strategy}
+        if self.public_strategy in RANDOM_STRATEGIES:
+            selection["seed"] = self.seed
+        return selection
+
+    def save_snapshot(self, path: str, source_path: Optional[str] = None):
+        """
+        Writes the graph (as CSR), public mask and selection parameters to a binary snapshot.
+        """
+        metadata = self._selection()
+        metadata["num_nodes"] = self._graph.number_of_nodes()
+        metadata["num_edges"] = self._graph.number_of_edges()
+        if source_path is not None:
+            metadata["source"] = source_signature(source_path)
+        write_snapshot(path, self.as_csr(), self.public_mask, metadata)
+
+    def open_snapshot(self, path: str, verify: bool = True):
+        """
+        Loads a snapshot written by save_snapshot. The CSR backend keeps the
+        memory-mapped arrays as-is; the networkx backend builds a graph from them.
+        """
+        csr, public_mask, header = read_snapshot(path, verify=verify)
+        metadata = header["metadata"]
+        self.public_fraction = metadata.get("public_fraction", self.public_fraction)
+        self.public_strategy = metadata.get("public_strategy", self.public_strategy)
+        self.graph = csr if self.backend == "csr" else csr.to_networkx()
+        self.public_nodes = set(csr.node_ids[public_mask].tolist())
+        self._snapshot = (self._fingerprint(), path, header)
+
+    def apply_edge_updates(self, additions=(), deletions=(), verify: bool = False) -> int:
+        """
+        Deletes then adds undirected edges (pairs of node ids) in place.
+        Cached local statistics are kept instead of invalidated and updated from
+        the batch's per-node deltas (see local_stats.EdgeUpdateDelta), touching
+        only endpoints and their common neighbors, so following queries cost
+        O(changes) plus noise. Additions that introduce new nodes fall back to a
+        full invalidate(). With `verify`, every cached statistic is compared with
+        a from-scratch recomputation and a RuntimeError is raised on mismatch.
+        Returns the number of nodes whose statistics were refreshed.
+        """
+        additions = np.asarray(list(additions), dtype=np.int64).reshape(-1, 2)
+        deletions = np.asarray(list(deletions), dtype=np.int64).reshape(-1, 2)
+        additions = additions[additions[:, 0] != additions[:, 1]]
+        csr = self.as_csr()
+        if len(additions) and not np.isin(additions, csr.node_ids).all():
+            self._replace_edges(csr, additions, deletions)
+            self.invalidate()
+            return len(self._graph)
+        deletions = deletions[np.isin(deletions, csr.node_ids).all(axis=1)]
+        add_idx = csr.indices_of(additions.ravel()).reshape(-1, 2)
+        del_idx = csr.indices_of(deletions.ravel()).reshape(-1, 2)
+        new_csr = csr.with_edge_updates(add_idx[:, 0], add_idx[:, 1], del_idx[:, 0], del_idx[:, 1])
+
+        from .local_stats import EdgeUpdateDelta
+        delta = EdgeUpdateDelta(csr, add_idx, del_idx)
+
+        old_fingerprint = self._fingerprint()
+        if isinstance(self._graph, CSRGraph):
+            self._graph = new_csr
+        else:
+            self._graph.remove_edges_from(deletions.tolist())
+            self._graph.add_edges_from(additions.tolist())
+        self._version += 1
+        fingerprint = self._fingerprint()
+        if not isinstance(self._graph, CSRGraph):
+            self._csr = (fingerprint, new_csr)
+        self._snapshot = None
+        for policy, (cached_fingerprint, stats) in list(self._local_stats.items()):
+            if cached_fingerprint != old_fingerprint:
+                del self._local_stats[policy]
+                continue
+            stats.apply_updates(delta)
+            self._local_stats[policy] = (fingerprint, stats)
+        if verify:
+            self._verify_local_statistics()
+        return len(delta.touched())
+
+    def _replace_edges(self, csr: CSRGraph, additions: np.ndarray, deletions: np.ndarray):
+        # Slow path for updates that add nodes: rebuild the adjacency
+        if not isinstance(self._graph, CSRGraph):
+            self._graph.remove_edges_from(deletions.tolist())
+            self._graph.add_edges_from(additions.tolist())
+            return
+        node_ids = np.union1d(csr.node_ids, additions.ravel())
+        n = len(node_ids)
+
+        def keys(pairs: np.ndarray) -> np.ndarray:
+            u, v = np.searchsorted(node_ids, pairs[:, 0]), np.searchsorted(node_ids, pairs[:, 1])
+            return np.minimum(u, v) * n + np.maximum(u, v)
+        edges = np.array(csr.edges(), dtype=np.int64).reshape(-1, 2)
+        deletions = deletions[np.isin(deletions, node_ids).all(axis=1)]
+        keep = ~np.isin(keys(edges), keys(deletions))
+        src = np.concatenate([edges[keep, 0], additions[:, 0]])
+        dst = np.concatenate([edges[keep, 1], additions[:, 1]])
+        self._graph = CSRGraph.from_edges(src, dst, node_ids=node_ids)
+
+    def _verify_local_statistics(self):
+        from .local_stats import LocalStatistics
+        if not isinstance(self._graph, CSRGraph) and self._csr is not None:
+            rebuilt = CSRGraph.from_networkx(self._graph)
+            if not (np.array_equal(rebuilt.indptr, self._csr[1].indptr) and np.array_equal(rebuilt.indices, self._csr[1].indices)):
+                raise RuntimeError("Incrementally maintained CSR differs from the networkx graph")
+        for policy, (_, stats) in self._local_stats.items():
+            fresh = LocalStatistics(self, stats.oracle, 0)
+            for key, values in stats._values.items():
+                if not np.array_equal(values, fresh.value(key)):
+                    raise RuntimeError(f"Incremental statistic {key} under {policy} differs from a full recompute")
+
     def load_data(self, path: str):
+        if path.endswith(SNAPSHOT_SUFFIX):
+            self.open_snapshot(path)
+            return
+        if self.snapshot:
+            snapshot_path = default_snapshot_path(path)
+            # An unseeded random draw cannot be matched against a stored one
+            reproducible = self.public_strategy not in RANDOM_STRATEGIES or self.seed is not None
+            if reproducible and snapshot_is_current(snapshot_path, path, self._selection()):
+                self.open_snapshot(snapshot_path)
+                return
+            self._load_text(path)
+            self.save_snapshot(snapshot_path, source_path=path)
+            # Reopen so the first run sees exactly what later runs will
+            self.open_snapshot(snapshot_path, verify=False)
+            return
+        self._load_text(path)
+
+    def _load_text(self, path: str):
         # Load from edge list
-        self.graph = nx.read_edgelist(path, nodetype=int)
+        if self.backend == "csr":
+            # Chunked NumPy parser; accepts plain or .gz edge lists
+            self.graph = read_edgelist_csr(path)
+        else:
+            import networkx as nx
+            self.graph = nx.read_edgelist(path, nodetype=int)
         self._select_public_nodes()
         
+    def _degree_vector(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (node ids, degrees) as arrays in the graph's node order.
+        """
+        if isinstance(self.graph, CSRGraph):
+            return self.graph.node_ids, self.graph.degrees()
+        n = self.graph.number_of_nodes()
+        nodes = np.fromiter(self.graph.nodes(), dtype=np.int64, count=n)
+        degrees = np.fromiter((d for _, d in self.graph.degree()), dtype=np.int64, count=n)
+        return nodes, degrees
+
+    def _public_rng(self) -> np.random.Generator:
+        # Without an explicit seed, draw one from the global state so np.random.seed() still pins the choice
+        return np.random.default_rng(self.seed if self.seed is not None else np.random.randint(2**63 - 1, dtype=np.int64))
+
     def _select_public_nodes(self):
-        nodes = list(self.graph.nodes())
+        nodes, degrees = self._degree_vector()
         num_public = int(len(nodes) * self.public_fraction)
         
         if num_public == 0:
@@ -72,59 +383,239 @@ class SocialGraph:
             return
 
         if self.public_strategy == "random":
-            self.public_nodes = set(np.random.choice(nodes, num_public, replace=False))
+            chosen = self._public_rng().choice(len(nodes), num_public, replace=False)
             
         elif self.public_strategy == "degree_top_k":
-            # Select top k nodes by degree
-            degree_dict = dict(self.graph.degree())
-            sorted_nodes = sorted(degree_dict.items(), key=lambda item: item[1], reverse=True)
-            top_k_nodes = [node for node, degree in sorted_nodes[:num_public]]
-            self.public_nodes = set(top_k_nodes)
+            # Top k by degree: everything above the k-th largest degree, then ties in node order
+            kth = np.partition(degrees, len(degrees) - num_public)[len(degrees) - num_public]
+            above = np.flatnonzero(degrees > kth)
+            ties = np.flatnonzero(degrees == kth)[:num_public - len(above)]
+            chosen = np.concatenate([above, ties])
             
         elif self.public_strategy == "degree_probabilistic":
             # Probability proportional to degree
-            degrees = np.array([self.graph.degree(n) for n in nodes])
             total_degree = degrees.sum()
-            if total_degree > 0:
-                probs = degrees / total_degree
-                self.public_nodes = set(np.random.choice(nodes, num_public, replace=False, p=probs))
-            else:
-                self.public_nodes = set(np.random.choice(nodes, num_public, replace=False))
+            probs = degrees / total_degree if total_degree > 0 else None
+            chosen = self._public_rng().choice(len(nodes), num_public, replace=False, p=probs)
+
+        else:
+            return
+
+        self.public_nodes = set(nodes[chosen].tolist())
 
-        
     def is_public(self, node: int) -> bool:
         return node in self.public_nodes
+
+    @property
+    def public_mask(self) -> np.ndarray:
+        """
+        Boolean mask over CSR indices (see as_csr) marking public nodes.
+        """
+        return np.isin(self.as_csr().node_ids, np.fromiter(self.public_nodes, dtype=np.int64, count=len(self.public_nodes)))
         
-    def get_visible_subgraph(self, observer: int, oracle: VisibilityOracle) -> nx.Graph:
-        """
-        Returns a subgraph containing only edges visible to the observer.
-        """
-        if oracle.policy == "1-hop":
-            subgraph = nx.Graph()
-            # Edges incident to observer
-            for nbr in self.graph.neighbors(observer):
-                subgraph.add_edge(observer, nbr)
-                # Edges incident to neighbors
-                for nbr_of_nbr in self.graph.neighbors(nbr):
-                    subgraph.add_edge(nbr, nbr_of_nbr)
-            return subgraph
-            
-        elif oracle.policy == "2-hop":
-            # BFS to depth 2
-            nodes_at_dist_0 = {observer}
-            nodes_at_dist_1 = set(self.graph.neighbors(observer))
-            nodes_at_dist_2 = set()
-            for n1 in nodes_at_dist_1:
-                for n2 in self.graph.neighbors(n1):
-                    if n2 not in nodes_at_dist_1 and n2 != observer:
-                        nodes_at_dist_2.add(n2)
-            
-            visible_nodes = nodes_at_dist_0 | nodes_at_dist_1 | nodes_at_dist_2
-            return self.graph.subgraph(visible_nodes).copy()
-            
-        # Fallback
-        subgraph = nx.Graph()
-        return subgraph
+    def get_visible_subgraph(self, observer: int, oracle: VisibilityOracle) -> "VisibleSubgraphView":
+        """
+        Returns a zero-copy view containing only edges visible to the observer.
+        """
+        return VisibleSubgraphView(self.graph, observer, oracle.policy)
+
+    def clipped_neighbors(self, node: int, oracle: VisibilityOracle, clip: int) -> list:
+        """
+        The first `clip` neighbors of `node` in the order its visible subgraph
+        lists them (VisibleSubgraphView.neighbors): what clipped local counts keep.
+        """
+        return list(islice(self.get_visible_subgraph(node, oracle).neighbors(node), clip))
 
     def get_global_graph(self):
         return self.graph
+
+
+class VisibleSubgraphView:
+    """
+    Read-only view of the edges an observer can see, answered on the fly
+    from the global adjacency instead of copying a subgraph.
+
+    The only per-observer state is the observer's own neighbor set (the
+    "frontier": an adjacency view for networkx, a sorted index slice for CSR).
+    Membership of farther nodes is derived from it lazily:
+      1-hop: edge (u, v) is visible iff u or v is a neighbor of the observer.
+      2-hop: edges induced by the ball of radius 2 around the observer.
+    Nodes, edges, degrees and neighbor order match the subgraphs previously
+    materialized by SocialGraph.get_visible_subgraph (the 1-hop edge-by-edge
+    build and the 2-hop subgraph(ball).copy()), so anything that takes a
+    prefix of the neighbors, such as the clipped triangle counts of private
+    hubs, picks the same neighbors; use to_networkx() to build one explicitly.
+    Those copies ordered neighbors by the backing graph's adjacency (insertion
+    order for networkx, CSR index order for CSRGraph) and by the order their
+    edges were copied, which is what neighbors() reproduces.
+    """
+    def __init__(self, graph, observer: int, policy: str):
+        self.graph = graph
+        self.observer = observer
+        self.policy = policy
+        self._csr = isinstance(graph, CSRGraph)
+        self._active = policy in ("1-hop", "2-hop") and observer in graph
+        if self._csr:
+            self._obs_idx = graph.index_of(observer)
+            self._frontier = graph.neighbor_indices(self._obs_idx) if self._active else np.empty(0, dtype=np.int32)
+        else:
+            self._frontier = graph.adj[observer] if self._active else {}
+        self._ranks: Optional[Dict[int, int]] = None
+
+    # ---- frontier primitives ------------------------------------------
+
+    def _in_frontier(self, node: int) -> bool:
+        if not self._csr:
+            return node in self._frontier
+        j = self.graph.index_of(node)
+        pos = int(np.searchsorted(self._frontier, j))
+        return j >= 0 and pos < len(self._frontier) and self._frontier[pos] == j
+
+    def _touches_frontier(self, node: int) -> bool:
+        """
+        True if `node` has at least one neighbor in the frontier.
+        """
+        if not self._csr:
+            adj = self.graph.adj[node]
+            small, large = (adj, self._frontier) if len(adj) < len(self._frontier) else (self._frontier, adj)
+            return any(x in large for x in small)
+        row = self.graph.neighbor_indices(self.graph.index_of(node))
+        small, large = (row, self._frontier) if len(row) < len(self._frontier) else (self._frontier, row)
+        if len(small) == 0:
+            return False
+        pos = np.minimum(np.searchsorted(large, small), len(large) - 1)
+        return bool((large[pos] == small).any())
+
+    def _sees_all_edges_of(self, node: int) -> bool:
+        # The observer and its neighbors keep their full adjacency under both policies
+        return node == self.observer or self._in_frontier(node)
+
+    # ---- networkx-compatible surface ----------------------------------
+
+    def __contains__(self, node) -> bool:
+        if not self._active or node not in self.graph:
+            return False
+        if node == self.observer:
+            # Under 1-hop an isolated observer sees no edges and is absent
+            return self.policy == "2-hop" or len(self._frontier) > 0
+        return self._in_frontier(node) or self._touches_frontier(node)
+
+    def _missing(self, node):
+        if self._csr:
+            return KeyError(f"Node {node} not in visible subgraph")
+        import networkx as nx
+        return nx.NetworkXError(f"The node {node} is not in the graph.")
+
+    def _csr_filtered_row(self, node: int) -> np.ndarray:
+        g = self.graph
+        row = g.neighbor_indices(g.index_of(node)).astype(np.int64)
+        visible = np.isin(row, self._frontier, assume_unique=True)
+        if self.policy == "2-hop":
+            # Neighbors at distance 2 are inside the ball iff they touch the frontier
+            flat, lens = gather_rows(g.indptr, g.indices, row)
+            hits = np.isin(flat, self._frontier)
+            touching = np.bincount(np.repeat(np.arange(len(row)), lens), weights=hits, minlength=len(row)) > 0
+            visible |= touching | (row == self._obs_idx)
+        return row[visible]
+
+    def _visible_neighbors(self, node: int):
+        # Visible neighbors of `node` in the backing graph's adjacency order
+        if self._sees_all_edges_of(node):
+            return iter(self.graph.neighbors(node))
+        if self._csr:
+            return iter(self.graph.node_ids[self._csr_filtered_row(node)].tolist())
+        if self.policy == "1-hop":
+            return (x for x in self.graph.neighbors(node) if x in self._frontier)
+        return (x for x in self.graph.neighbors(node) if x in self)
+
+    def _copy_ranks(self) -> Dict[int, int]:
+        """
+        Position of every node in the node order of the old copy: for 2-hop,
+        the order graph.subgraph(ball).copy() iterated the ball (networkx walks
+        the ball set itself when it is under half the graph, otherwise the
+        graph's node order); for 1-hop, the position of each frontier node in
+        the observer's adjacency, the order the copy was built in.
+        """
+        if self._ranks is not None:
+            return self._ranks
+        frontier = list(self.graph.neighbors(self.observer))
+        if self.policy == "1-hop":
+            self._ranks = {node: i for i, node in enumerate(frontier)}
+            return self._ranks
+        # The ball built exactly as the old copy built it, so the sets iterate alike
+        dist_1 = set(frontier)
+        dist_2 = set()
+        for n1 in dist_1:
+            for n2 in self.graph.neighbors(n1):
+                if n2 not in dist_1 and n2 != self.observer:
+                    dist_2.add(n2)
+        ball = set(n for n in {self.observer} | dist_1 | dist_2 if n in self.graph)
+        if 2 * len(ball) < self.graph.number_of_nodes():
+            order = list(ball)
+        else:
+            order = [n for n in self.graph if n in ball]
+        self._ranks = {node: i for i, node in enumerate(order)}
+        return self._ranks
+
+    def neighbors(self, node: int):
+        """
+        Visible neighbors of `node` in the order of the old materialized copy.
+        A node's copied adjacency lists first the neighbors whose edges were
+        copied from their side (earlier in the copy order), then the rest in
+        backing order; for 1-hop the observer's own edge to a frontier node
+        comes before that node's other edges.
+        """
+        if node not in self:
+            raise self._missing(node)
+        visible = self._visible_neighbors(node)
+        if self.policy == "1-hop" and node == self.observer:
+            return visible
+        visible = list(visible)
+        ranks = self._copy_ranks()
+        if self.policy == "2-hop":
+            rank = ranks[node]
+            earlier = sorted((x for x in visible if ranks[x] < rank), key=ranks.__getitem__)
+            return iter(earlier + [x for x in visible if ranks[x] >= rank])
+        if node not in ranks:
+            # Beyond the frontier: only edges to frontier nodes, copied in frontier order
+            return iter(sorted(visible, key=ranks.__getitem__))
+        rank = ranks[node]
+        earlier = sorted((x for x in visible if ranks.get(x, rank) < rank), key=ranks.__getitem__)
+        rest = [x for x in visible if x != self.observer and ranks.get(x, rank) >= rank]
+        return iter(earlier + [self.observer] + rest)
+
+    def degree(self, node: int) -> int:
+        if node not in self:
+            raise self._missing(node)
+        if self._sees_all_edges_of(node):
+            return self.graph.degree(node)
+        if self._csr:
+            return len(self._csr_filtered_row(node))
+        return sum(1 for _ in self._visible_neighbors(node))
+
+    def has_edge(self, u: int, v: int) -> bool:
+        if not self._active or not self.graph.has_edge(u, v):
+            return False
+        if self.policy == "1-hop":
+            return self._in_frontier(u) or self._in_frontier(v)
+        return u in self and v in self
+
+    def to_networkx(self) -> "nx.Graph":
+        """
+        Materializes the view as an nx.Graph, built the way the old per-observer copy was.
+        """
+        import networkx as nx
+        subgraph = nx.Graph()
+        if not self._active:
+            return subgraph
+        if self.policy == "1-hop":
+            for nbr in self.graph.neighbors(self.observer):
+                subgraph.add_edge(self.observer, nbr)
+                subgraph.add_edges_from((nbr, x) for x in self.graph.neighbors(nbr))
+            return subgraph
+        # graph.subgraph(ball).copy(): nodes in copy order, then each node's edges in adjacency order
+        order = sorted(self._copy_ranks(), key=self._copy_ranks().__getitem__)
+        ball = set(order)
+        subgraph.add_nodes_from(order)
+        subgraph.add_edges_from((u, v) for u in order for v in self.graph.neighbors(u) if v in ball)
+        return subgraph
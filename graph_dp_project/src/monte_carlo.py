@@ -0,0 +1,321 @@
+import csv
+import math
+import os
+import uuid
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from .model import SocialGraph, VisibilityOracle
+from .algorithms import GraphDPAlgorithms
+from .analytic import error_profile
+
+# Metrics of experiment.run_experiments, each mirroring one GraphDPAlgorithms query
+METRICS = ("EdgeCount", "TriangleCount_Clipped", "TriangleCount_Smooth", "2-StarCount_Clipped", "2-StarCount_Smooth")
+
+# Gamma draws materialized per chunk of trials (rows * distinct noise scales)
+MAX_DRAWS_PER_CHUNK = 1 << 22
+
+# Two-sided 95% normal quantile
+Z_95 = 1.959963984540054
+
+# Columns of every part (Parquet or CSV) in a trial store
+TRIAL_COLUMNS = (("run_id", "string"), ("graph", "string"), ("policy", "string"), ("metric", "string"),
+                 ("epsilon", "float64"), ("trial", "int64"), ("estimate", "float64"), ("true_val", "float64"),
+                 ("rel_error", "float64"), ("sensitivity", "float64"))
+
+
+# (GraphDPAlgorithms query, parameters other than D_max) released by each metric
+METRIC_QUERIES = {
+    "EdgeCount": ("edge_count", {}),
+    "TriangleCount_Clipped": ("triangle_count", {}),
+    "TriangleCount_Smooth": ("triangle_count_smooth", {}),
+    "2-StarCount_Clipped": ("k_star_count", {"k": 2}),
+    "2-StarCount_Smooth": ("k_star_count_smooth", {"k": 2}),
+}
+
+
+def metric_inputs(algo: GraphDPAlgorithms, metric: str, D_max: int = 50) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    (per-node true values, per-node sensitivities, divisor of the summed release)
+    of `metric`, as computed by the matching GraphDPAlgorithms query.
+    """
+    if metric not in METRIC_QUERIES:
+        raise ValueError(f"Unknown metric: {metric}")
+    query, params = METRIC_QUERIES[metric]
+    return algo.release_inputs(query, D_max=D_max, **params)
+
+
+def true_totals(graph: SocialGraph) -> Dict[str, float]:
+    """
+    Noise-free global edge, triangle and 2-star counts every metric is scored against.
+    """
+    stats = graph.local_statistics(VisibilityOracle(policy="1-hop"))
+    edges = float(stats.degrees().sum()) / 2.0
+    triangles = float(stats.triangles().sum()) / 3.0
+    stars = float(stats.k_stars(2).sum())
+    return {"EdgeCount": edges, "TriangleCount_Clipped": triangles, "TriangleCount_Smooth": triangles,
+            "2-StarCount_Clipped": stars, "2-StarCount_Smooth": stars}
+
+
+def simulate_trials(true_vals: np.ndarray, sensitivities: np.ndarray, divisor: float, public_mask: np.ndarray,
+                    epsilon: float, trials: int, rng: np.random.Generator) -> Iterator[np.ndarray]:
+    """
+    Released totals of `trials` independent repetitions, yielded in chunks.
+    Each repetition is distributed exactly like one call of the query: the exact
+    public values plus Laplace(sensitivity / epsilon) on every private node,
+    summed and divided by `divisor`; only the noise is redrawn.
+
+    A sum of k iid Laplace(b) draws is b * (G1 - G2) with G1, G2 ~ Gamma(k), so
+    private nodes are grouped by noise scale and each trial costs two Gamma
+    draws per distinct scale instead of one Laplace draw per node.
+    """
+    private = ~public_mask
+    base = float(true_vals.sum())
+    scales, counts = np.unique(np.broadcast_to(sensitivities, true_vals.shape)[private] / epsilon, return_counts=True)
+    rows = max(1, MAX_DRAWS_PER_CHUNK // max(len(scales), 1))
+    for start in range(0, trials, rows):
+        count = min(rows, trials - start)
+        if len(scales) == 0:
+            yield np.full(count, base / divisor)
+            continue
+        noise = (rng.standard_gamma(counts, size=(count, len(scales)))
+                 - rng.standard_gamma(counts, size=(count, len(scales)))) @ scales
+        yield (base + noise) / divisor
+
+
+def _pyarrow_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class _CSVPartWriter:
+    # Stand-in for pq.ParquetWriter when pyarrow is missing: one CSV part, header first
+    def __init__(self, path: str):
+        self._file = open(path, "w", newline="")
+        self._rows = csv.writer(self._file)
+        self._rows.writerow([name for name, _ in TRIAL_COLUMNS])
+
+    def write_columns(self, columns: Dict[str, Sequence]):
+        self._rows.writerows(zip(*(np.asarray(columns[name]).tolist() for name, _ in TRIAL_COLUMNS)))
+
+    def close(self):
+        self._file.close()
+
+
+class TrialStore:
+    """
+    Appendable columnar store of Monte Carlo trials: a directory of parts, one
+    per (run, configuration), each written as a stream of chunks so no run
+    holds its trials in memory. Parts are Parquet when pyarrow is installed
+    and CSV otherwise; any number of runs can add parts and readers scan the
+    directory, both formats alike, as one dataset.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def schema():
+        import pyarrow as pa
+        return pa.schema([(name, getattr(pa, kind)()) for name, kind in TRIAL_COLUMNS])
+
+    def writer(self, run_id: str, name: str):
+        """
+        Writer for a new part file of this store: a ParquetWriter, or a CSV
+        part writer without pyarrow.
+        """
+        if not _pyarrow_available():
+            return _CSVPartWriter(os.path.join(self.path, f"part-{run_id}-{name}.csv"))
+        import pyarrow.parquet as pq
+        return pq.ParquetWriter(os.path.join(self.path, f"part-{run_id}-{name}.parquet"), self.schema())
+
+    def write_chunk(self, writer, columns: Dict[str, Sequence]):
+        if isinstance(writer, _CSVPartWriter):
+            writer.write_columns(columns)
+            return
+        import pyarrow as pa
+        writer.write_table(pa.table(columns, schema=self.schema()))
+
+    def _parts(self, suffix: str) -> List[str]:
+        return sorted(os.path.join(self.path, f) for f in os.listdir(self.path) if f.endswith(suffix))
+
+    def table(self, columns: Optional[List[str]] = None):
+        """
+        Every stored Parquet trial as one pyarrow Table (optionally only `columns`).
+        """
+        import pyarrow.dataset as ds
+        return ds.dataset(self._parts(".parquet"), format="parquet", schema=self.schema()).to_table(columns=columns)
+
+    def columns(self, columns: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Every stored trial, Parquet and CSV parts alike, as one NumPy array per
+        column (optionally only `columns`).
+        """
+        kinds = dict(TRIAL_COLUMNS)
+        names = list(kinds) if columns is None else columns
+        dtypes = {name: str if kinds[name] == "string" else np.dtype(kinds[name]) for name in names}
+        parts = {name: [] for name in names}
+        if self._parts(".parquet"):
+            stored = self.table(names).to_pydict()
+            for name in names:
+                parts[name].append(np.asarray(stored[name], dtype=dtypes[name]))
+        for path in self._parts(".csv"):
+            with open(path, newline="") as f:
+                rows = list(csv.DictReader(f))
+            for name in names:
+                parts[name].append(np.array([row[name] for row in rows], dtype=dtypes[name]))
+        return {name: np.concatenate(chunks) if chunks else np.empty(0, dtype=dtypes[name])
+                for name, chunks in parts.items()}
+
+    def summary_rows(self, z: float = Z_95) -> List[Dict]:
+        """
+        Mean relative error per (graph, policy, metric, epsilon) over all stored
+        trials, with a normal-approximation confidence band mean ± z * std / sqrt(n).
+        Returns one dict per group, sorted by graph, policy, metric and epsilon.
+        """
+        keys = ["graph", "policy", "metric", "epsilon"]
+        data = self.columns(keys + ["rel_error", "estimate"])
+        codes = [np.unique(data[key], return_inverse=True) for key in keys]
+        shape = tuple(len(values) for values, _ in codes)
+        # Group id in lexicographic key order, so ascending ids are the sorted groups
+        group = np.ravel_multi_index([inverse for _, inverse in codes], shape) if len(data["rel_error"]) else \
+            np.empty(0, dtype=np.int64)
+        ids, group = np.unique(group, return_inverse=True)
+        count = np.bincount(group, minlength=len(ids))
+        mean = np.bincount(group, data["rel_error"], minlength=len(ids)) / count
+        sq = np.bincount(group, (data["rel_error"] - mean[group]) ** 2, minlength=len(ids))
+        std = np.sqrt(sq / np.maximum(count - 1, 1))
+        estimate = np.bincount(group, data["estimate"], minlength=len(ids)) / count
+        rows = []
+        for g, flat in enumerate(ids.tolist()):
+            index = np.unravel_index(flat, shape)
+            row = {key: values[i].item() for key, (values, _), i in zip(keys, codes, index)}
+            half = z * float(std[g]) / math.sqrt(count[g])
+            row.update({"mean_rel_error": float(mean[g]), "std_rel_error": float(std[g]), "trials": int(count[g]),
+                        "mean_estimate": float(estimate[g]), "ci_low": float(mean[g]) - half,
+                        "ci_high": float(mean[g]) + half})
+            rows.append(row)
+        return rows
+
+    def summarize(self, z: float = Z_95):
+        """
+        summary_rows as a pandas DataFrame.
+        """
+        import pandas as pd
+        return pd.DataFrame(self.summary_rows(z))
+
+
+# Columns of results_comprehensive.csv: the original per-configuration table, then the band
+SUMMARY_CSV_COLUMNS = ("graph", "epsilon", "metric", "true_val", "est_val", "rel_error", "sensitivity",
+                       "policy", "trials", "std_rel_error", "ci_low", "ci_high")
+
+
+def write_summary_csv(summaries: Sequence[Dict], path: str):
+    """
+    Writes run_trials summaries as the per-configuration results CSV.
+    """
+    renamed = {"est_val": "mean_estimate", "rel_error": "mean_rel_error"}
+    with open(path, "w", newline="") as f:
+        rows = csv.writer(f)
+        rows.writerow(SUMMARY_CSV_COLUMNS)
+        rows.writerows([row[renamed.get(name, name)] for name in SUMMARY_CSV_COLUMNS] for row in summaries)
+
+
+def _run_config(task: Dict) -> Dict:
+    """
+    Runs every trial of one (metric, epsilon) configuration, streaming them to
+    the store if one is given. Returns the summary of this configuration alone.
+    """
+    rng = np.random.default_rng(task["seed"])
+    truth = task["true_val"]
+    store = TrialStore(task["store"]) if task["store"] else None
+    writer = store.writer(task["run_id"], task["name"]) if store else None
+    count, total, total_sq, estimate_sum = 0, 0.0, 0.0, 0.0
+    try:
+        for estimates in simulate_trials(task["true_vals"], task["sensitivities"], task["divisor"],
+                                         task["public_mask"], task["epsilon"], task["trials"], rng):
+            errors = np.abs(estimates - truth) / truth if truth > 0 else np.zeros(len(estimates))
+            if writer is not None:
+                k = len(estimates)
+                store.write_chunk(writer, {
+                    "run_id": [task["run_id"]] * k, "graph": [task["graph"]] * k, "policy": [task["policy"]] * k,
+                    "metric": [task["metric"]] * k, "epsilon": np.full(k, task["epsilon"]),
+                    "trial": np.arange(count, count + k, dtype=np.int64), "estimate": estimates,
+                    "true_val": np.full(k, truth), "rel_error": errors, "sensitivity": np.full(k, task["mean_sensitivity"])})
+            count += len(estimates)
+            total += float(errors.sum())
+            total_sq += float((errors ** 2).sum())
+            estimate_sum += float(estimates.sum())
+    finally:
+        if writer is not None:
+            writer.close()
+    mean = total / count
+    std = math.sqrt(max(total_sq - count * mean ** 2, 0.0) / (count - 1)) if count > 1 else 0.0
+    half = Z_95 * std / math.sqrt(count)
+    return {"graph": task["graph"], "policy": task["policy"], "metric": task["metric"], "epsilon": task["epsilon"],
+            "trials": count, "true_val": truth, "mean_estimate": estimate_sum / count, "mean_rel_error": mean,
+            "std_rel_error": std, "ci_low": mean - half, "ci_high": mean + half,
+            "sensitivity": task["mean_sensitivity"]}
+
+
+def run_trials(graph: SocialGraph, epsilons: Sequence[float], trials: int = 1000, metrics: Sequence[str] = METRICS,
+               graph_name: str = "graph", policy: str = "2-hop", D_max: int = 50, store: Optional[str] = None,
+               workers: Optional[int] = None, seed: Optional[int] = None) -> List[Dict]:
+    """
+    Monte Carlo evaluation of every (metric, epsilon) configuration. The true
+    local statistics are computed once here; each configuration then only draws
+    noise (simulate_trials), so thousands of trials cost a few vectorized draws.
+
+    Configurations run in `workers` processes (in-process if None or 1) and each
+    streams its trials to its own part of the TrialStore at `store`, if given.
+    Configuration i is seeded with SeedSequence(seed).spawn(n)[i], so results
+    do not depend on the worker count. Returns one summary dict per
+    configuration (mean relative error with a 95% confidence band).
+    """
+    algo = GraphDPAlgorithms(graph, VisibilityOracle(policy=policy))
+    truths = true_totals(graph)
+    run_id = uuid.uuid4().hex[:12]
+    inputs = {metric: metric_inputs(algo, metric, D_max) for metric in metrics}
+    configs = [(metric, float(eps)) for metric in metrics for eps in epsilons]
+    tasks = []
+    for i, ((metric, eps), child) in enumerate(zip(configs, np.random.SeedSequence(seed).spawn(len(configs)))):
+        true_vals, sensitivities, divisor = inputs[metric]
+        tasks.append({"graph": graph_name, "policy": policy, "metric": metric, "epsilon": eps, "trials": trials,
+                      "true_vals": true_vals, "sensitivities": sensitivities, "divisor": divisor,
+                      "public_mask": algo.stats.public_mask, "true_val": truths[metric],
+                      "mean_sensitivity": float(np.mean(sensitivities)) if len(sensitivities) else 0.0,
+                      "seed": child, "store": store, "run_id": run_id, "name": f"{i:04d}"})
+    if not workers or workers <= 1:
+        return [_run_config(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_run_config, tasks))
+
+
+def analytic_trials(graph: SocialGraph, epsilons: Sequence[float], metrics: Sequence[str] = METRICS,
+                    graph_name: str = "graph", policy: str = "2-hop", D_max: int = 50) -> List[Dict]:
+    """
+    Exact counterpart of run_trials: the relative error of every (metric,
+    epsilon) configuration from its sensitivity vector (analytic.error_profile)
+    instead of simulated repetitions. Rows carry the run_trials summary keys, with
+    a zero-width band since the mean is exact, plus the error quantiles.
+    """
+    algo = GraphDPAlgorithms(graph, VisibilityOracle(policy=policy))
+    truths = true_totals(graph)
+    rows = []
+    for metric in metrics:
+        true_vals, sensitivities, divisor = metric_inputs(algo, metric, D_max)
+        truth = truths[metric]
+        for eps in epsilons:
+            profile = error_profile(true_vals, sensitivities, divisor, algo.stats.public_mask, float(eps), truth)
+            scale = truth if truth > 0 else math.inf
+            mean = profile["expected_abs_error"] / scale
+            std = math.sqrt(max(profile["mse"] - profile["expected_abs_error"] ** 2, 0.0)) / scale
+            rows.append({"graph": graph_name, "policy": policy, "metric": metric, "epsilon": float(eps),
+                         "trials": 0, "true_val": truth, "mean_estimate": profile["estimate"],
+                         "mean_rel_error": mean, "std_rel_error": std, "ci_low": mean, "ci_high": mean,
+                         "sensitivity": float(np.mean(sensitivities)) if len(sensitivities) else 0.0,
+                         "rel_error_quantiles": {q: e / scale for q, e in profile["abs_error_quantiles"].items()}})
+    return rows
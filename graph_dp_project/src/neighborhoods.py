@@ -0,0 +1,98 @@
+import numpy as np
+import scipy.sparse as sp
+from typing import Dict, Iterator, Tuple
+from .csr import CSRGraph
+from .triangles import DEFAULT_MAX_WEDGES
+
+# Policies whose views are all derived here from sparse products of the adjacency matrix
+VIEW_POLICIES = ("1-hop", "2-hop")
+
+
+def adjacency_matrix(csr: CSRGraph) -> sp.csr_matrix:
+    """
+    The CSR arrays as a scipy.sparse int32 adjacency matrix (no copy of the index arrays).
+    """
+    n = len(csr.node_ids)
+    return sp.csr_matrix((np.ones(len(csr.indices), dtype=np.int32), csr.indices, csr.indptr), shape=(n, n))
+
+
+def row_blocks(cost: np.ndarray, max_cost: int) -> Iterator[Tuple[int, int]]:
+    """
+    Consecutive row ranges [start, end) whose summed `cost` stays within
+    `max_cost` (a single row may exceed it on its own).
+    """
+    cum = np.cumsum(cost)
+    start = 0
+    while start < len(cost):
+        base = int(cum[start - 1]) if start else 0
+        end = max(int(np.searchsorted(cum, base + max_cost, side="right")), start + 1)
+        yield start, end
+        start = end
+
+
+def _identity_rows(start: int, end: int, n: int) -> sp.csr_matrix:
+    return sp.csr_matrix((np.ones(end - start, dtype=np.int32), np.arange(start, end), np.arange(end - start + 1)),
+                         shape=(end - start, n))
+
+
+def iter_view_blocks(A: sp.csr_matrix, policy: str,
+                     max_nnz: int = DEFAULT_MAX_WEDGES) -> Iterator[Tuple[int, sp.csr_matrix, sp.csr_matrix]]:
+    """
+    Visible-node sets of all observers, in row blocks sized so that A[rows] @ A
+    holds about `max_nnz` entries. Yields (start, R, C) where row i of R is the
+    0/1 indicator of the nodes observer start + i sees:
+      1-hop: A_b @ A + A_b, neighbors and their neighbors (empty when isolated);
+      2-hop: A_b @ A + A_b + I, the ball of radius 2.
+    C = (A_b @ A) ⊙ A_b holds the common-neighbor count of every incident edge.
+    """
+    if policy not in VIEW_POLICIES:
+        raise ValueError(f"Sparse views support the {VIEW_POLICIES} policies, got {policy}")
+    n = A.shape[0]
+    deg = np.diff(A.indptr).astype(np.int64)
+    # Entries of A_b @ A are bounded by the wedges through each row
+    for start, end in row_blocks(A @ deg + deg + 1, max_nnz):
+        A_b = A[start:end]
+        paths = A_b @ A
+        C = paths.multiply(A_b).tocsr()
+        R = paths + A_b
+        if policy == "2-hop":
+            R = R + _identity_rows(start, end, n)
+        R.data = np.ones(len(R.data), dtype=np.int32)
+        yield start, R, C
+
+
+def view_statistics(csr: CSRGraph, policy: str, max_nnz: int = DEFAULT_MAX_WEDGES,
+                    count_edges: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Per-observer statistics of every visible subgraph (VisibleSubgraphView) at
+    once, indexed like the CSR arrays:
+      "visible_nodes": nodes in the view;
+      "degree", "triangles", "max_common": the observer's own values, which its
+        view keeps intact under both policies.
+    With `count_edges`, also "visible_edges", the edges in the view. Every edge
+    touching a neighbor is visible under both policies: the sum of neighbor
+    degrees minus the triangles, counted twice. 2-hop adds the edges among
+    distance-2 nodes, (R @ A) ⊙ R per row, sub-blocked by R @ deg. That product
+    reaches three hops, so it dominates the cost on hub-heavy graphs.
+    """
+    A = adjacency_matrix(csr)
+    n = A.shape[0]
+    deg = np.diff(A.indptr).astype(np.int64)
+    names = ("visible_nodes", "triangles", "max_common") + (("visible_edges",) if count_edges else ())
+    stats = {name: np.zeros(n, dtype=np.int64) for name in names}
+    stats["degree"] = deg
+    neighbor_degrees = A @ deg if count_edges else None
+    for start, R, C in iter_view_blocks(A, policy, max_nnz):
+        end = start + R.shape[0]
+        stats["visible_nodes"][start:end] = np.diff(R.indptr)
+        stats["triangles"][start:end] = np.asarray(C.sum(axis=1)).ravel() // 2
+        stats["max_common"][start:end] = C.max(axis=1).toarray().ravel()
+        if not count_edges:
+            continue
+        if policy == "1-hop":
+            stats["visible_edges"][start:end] = neighbor_degrees[start:end] - stats["triangles"][start:end]
+            continue
+        for lo, hi in row_blocks(R @ deg, max_nnz):
+            R_s = R[lo:hi]
+            stats["visible_edges"][start + lo:start + hi] = np.asarray((R_s @ A).multiply(R_s).sum(axis=1)).ravel() // 2
+    return stats
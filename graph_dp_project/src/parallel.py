@@ -0,0 +1,159 @@
+import weakref
+import numpy as np
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, Dict, List, Tuple
+from .csr import gather_row_positions
+from .snapshot import map_array
+from .triangles import neighborhood_stats
+from .kstars import clipped_sensitivity, k_star_counts, k_star_terms
+from .utils import laplace_mechanism_batch, histogram_counts
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+# Nodes per shard. Shards (not workers) own the RNG streams, so the output
+# for a given seed does not depend on how many workers process them.
+DEFAULT_SHARD_SIZE = 8192
+
+# Arrays each worker maps, from shared memory or straight from a snapshot file
+_SHARED_FIELDS = ("indptr", "indices", "public_mask")
+
+# Per-process state filled in by _init_worker
+_worker_arrays: Dict[str, np.ndarray] = {}
+_worker_segments: List[shared_memory.SharedMemory] = []
+
+
+def _init_worker(spec: Dict[str, Tuple[str, object]]):
+    for field, (source, location) in spec.items():
+        if source == "snapshot":
+            path, entry = location
+            _worker_arrays[field] = map_array(path, entry)
+            continue
+        name, shape, dtype = location
+        segment = shared_memory.SharedMemory(name=name)
+        _worker_segments.append(segment)
+        _worker_arrays[field] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf)
+
+
+def _shard_local_values(kind: str, params: Dict, lo: int, hi: int,
+                        prefixes: Dict[int, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    True local values and per-node sensitivities for CSR indices [lo, hi).
+    """
+    indptr = _worker_arrays["indptr"]
+    indices = _worker_arrays["indices"]
+    public = _worker_arrays["public_mask"][lo:hi]
+    degrees = np.diff(indptr[lo:hi + 1]).astype(np.int64)
+    k = params.get("k")
+
+    if kind == "edge_count":
+        return degrees.astype(float), np.ones(hi - lo)
+    if kind == "degree_histogram":
+        return np.minimum(degrees, params["max_degree"]).astype(float), np.ones(hi - lo)
+    if kind == "k_star_count":
+        true_vals = k_star_counts(degrees, k, params["D_max"], public)
+        return true_vals, np.full(hi - lo, clipped_sensitivity(params["D_max"], k))
+    if kind == "k_star_count_smooth":
+        true_vals, sens = k_star_terms(degrees, k)
+        return true_vals[0], sens[0]
+
+    # Triangle queries: every observer's neighbor set (or clipped prefix) in this shard
+    nodes = np.arange(lo, hi, dtype=np.int64)
+    positions, lens = gather_row_positions(indptr, nodes)
+    owner = np.repeat(nodes - lo, lens)
+    members = indices[positions].astype(np.int64)
+    if kind == "triangle_count" and prefixes:
+        keep = np.ones(len(members), dtype=bool)
+        keep[np.isin(owner, np.fromiter(prefixes, dtype=np.int64) - lo)] = False
+        clipped_owner = np.concatenate([np.full(len(p), i - lo) for i, p in prefixes.items()])
+        owner = np.concatenate([owner[keep], clipped_owner])
+        members = np.concatenate([members[keep], np.concatenate(list(prefixes.values()))])
+    edges_among, max_common = neighborhood_stats(indptr, indices, owner, members, hi - lo)
+    if kind == "triangle_count":
+        return edges_among.astype(float), np.full(hi - lo, float(params["D_max"]))
+    return edges_among.astype(float), np.maximum(1.0, max_common.astype(float))
+
+
+def _run_shard(kind: str, params: Dict, epsilon: float, lo: int, hi: int,
+               prefixes: Dict[int, np.ndarray], seed: np.random.SeedSequence) -> Dict:
+    true_vals, sens = _shard_local_values(kind, params, lo, hi, prefixes)
+    public = _worker_arrays["public_mask"][lo:hi]
+    noisy = laplace_mechanism_batch(true_vals, sens, epsilon, public, np.random.default_rng(seed))
+    result = {"sum": float(noisy.sum()), "sens_sum": float(sens.sum())}
+    if kind == "degree_histogram":
+        result["hist"] = histogram_counts(noisy, params["max_degree"])
+    return result
+
+
+class ParallelExecutor:
+    """
+    Runs GraphDPAlgorithms queries over node shards in a ProcessPoolExecutor.
+    The CSR arrays and public mask live in shared memory, so workers map the
+    graph read-only instead of receiving a pickled copy per task. Graphs opened
+    from an unmodified snapshot skip the copy: workers memory-map the snapshot
+    file itself and share its page-cache pages. Shard i draws
+    its noise from SeedSequence(seed).spawn(num_shards)[i].
+    """
+    def __init__(self, graph, oracle, workers: int, shard_size: int = DEFAULT_SHARD_SIZE):
+        self.graph = graph
+        self.oracle = oracle
+        self.workers = workers
+        self.shard_size = shard_size
+        self.csr = graph.as_csr()
+        self.public_mask = graph.public_mask
+        self._segments: List[shared_memory.SharedMemory] = []
+        snapshot = graph.snapshot_source()
+        spec = {}
+        for field in _SHARED_FIELDS:
+            if snapshot is not None:
+                path, header = snapshot
+                spec[field] = ("snapshot", (path, header["arrays"][field]))
+                continue
+            array = self.csr.indptr if field == "indptr" else self.csr.indices if field == "indices" else self.public_mask
+            segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[...] = array
+            self._segments.append(segment)
+            spec[field] = ("shm", (segment.name, array.shape, array.dtype.str))
+        # concurrent.futures.process is only imported once a pool is actually requested
+        from concurrent.futures import ProcessPoolExecutor
+        self._pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(spec,))
+        # Release the pool and unlink shared memory even if close() is never called
+        self._finalizer = weakref.finalize(self, _shutdown, self._pool, self._segments)
+
+    def _clip_prefixes(self, clip: int) -> Dict[int, np.ndarray]:
+        # Private hubs keep their first `clip` neighbors in their visible subgraph's order
+        degrees = self.csr.degrees()
+        prefixes = {}
+        for i in np.flatnonzero(~self.public_mask & (degrees > clip)).tolist():
+            node = int(self.csr.node_ids[i])
+            prefixes[i] = self.csr.indices_of(self.graph.clipped_neighbors(node, self.oracle, clip))
+        return prefixes
+
+    def run(self, kind: str, epsilon: float, seed: np.random.SeedSequence, **params) -> Dict:
+        """
+        Executes one query over all shards and combines the partial results.
+        """
+        n = len(self.csr)
+        bounds = [(lo, min(lo + self.shard_size, n)) for lo in range(0, n, self.shard_size)]
+        streams = seed.spawn(len(bounds))
+        prefixes = self._clip_prefixes(params["D_max"]) if kind == "triangle_count" else {}
+        futures = [
+            self._pool.submit(_run_shard, kind, params, epsilon, lo, hi,
+                              {i: p for i, p in prefixes.items() if lo <= i < hi}, stream)
+            for (lo, hi), stream in zip(bounds, streams)
+        ]
+        parts = [f.result() for f in futures]
+        combined = {"sum": sum(p["sum"] for p in parts), "sens_sum": sum(p["sens_sum"] for p in parts), "n": n}
+        if kind == "degree_histogram":
+            combined["hist"] = np.sum([p["hist"] for p in parts], axis=0) if parts else np.zeros(params["max_degree"] + 1, dtype=np.int64)
+        return combined
+
+    def close(self):
+        self._finalizer()
+
+
+def _shutdown(pool: "ProcessPoolExecutor", segments: List[shared_memory.SharedMemory]):
+    pool.shutdown()
+    for segment in segments:
+        segment.close()
+        segment.unlink()
@@ -1,55 +1,71 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import sys
 import os
 
+# Add src to path when run as a script
+if not __package__:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.monte_carlo import TrialStore
+
+RESULTS_PATH = os.path.join(os.path.dirname(__file__), '../paper/results_trials')
+
+
+def load_results(results_path: str = RESULTS_PATH):
+    """
+    Summary rows (see TrialStore.summary_rows) of every trial experiment.py stored.
+    """
+    return TrialStore(results_path).summary_rows()
+
+
+def _plot_band(df, title: str, path: str, colors=None):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    # Mean relative error per metric with its confidence band
+    plt.figure(figsize=(10, 6))
+    palette = colors or sns.color_palette(n_colors=df['metric'].nunique())
+    for color, (metric, group) in zip(palette, df.groupby('metric')):
+        group = group.sort_values('epsilon')
+        plt.plot(group['epsilon'], group['mean_rel_error'], marker='o', color=color, label=metric)
+        # The band can dip below 0 for tiny errors; clip it for the log axis
+        plt.fill_between(group['epsilon'], group['ci_low'].clip(lower=1e-12), group['ci_high'],
+                         color=color, alpha=0.25)
+    plt.title(title)
+    plt.ylabel('Mean Relative Error (95% CI)')
+    plt.xlabel('Epsilon')
+    plt.yscale('log')
+    plt.legend()
+    plt.savefig(path)
+    plt.close()
+
+
 def plot_results():
-    # Load results
-    results_path = os.path.join(os.path.dirname(__file__), '../paper/results_comprehensive.csv')
-    df = pd.read_csv(results_path)
-    
+    # Plotting libraries load only here, not for the rest of the package
+    import pandas as pd
+    import seaborn as sns
+    # Aggregate every stored trial of experiment.py
+    df = pd.DataFrame(load_results())
+
     # Set style
     sns.set_theme(style="whitegrid")
-    
+
     # Filter for Facebook graph
     df = df[df['graph'] == 'Facebook_Sample']
-    
+
     # Create output directory
     output_dir = os.path.join(os.path.dirname(__file__), '../paper/plots')
     os.makedirs(output_dir, exist_ok=True)
-    
+
     # Plot 1: Triangle Count Comparison (Clipped vs Smooth)
-    plt.figure(figsize=(10, 6))
-    tri_df = df[df['metric'].str.contains('TriangleCount')]
-    sns.lineplot(data=tri_df, x='epsilon', y='rel_error', hue='metric', marker='o')
-    plt.title('Triangle Count Error: Clipped vs Smooth Sensitivity')
-    plt.ylabel('Relative Error')
-    plt.xlabel('Epsilon')
-    plt.yscale('log')
-    plt.savefig(os.path.join(output_dir, 'triangle_error.png'))
-    plt.close()
-    
+    _plot_band(df[df['metric'].str.contains('TriangleCount')],
+               'Triangle Count Error: Clipped vs Smooth Sensitivity', os.path.join(output_dir, 'triangle_error.png'))
+
     # Plot 2: 2-Star Count Comparison (Clipped vs Smooth)
-    plt.figure(figsize=(10, 6))
-    star_df = df[df['metric'].str.contains('2-StarCount')]
-    sns.lineplot(data=star_df, x='epsilon', y='rel_error', hue='metric', marker='o')
-    plt.title('2-Star Count Error: Clipped vs Smooth Sensitivity')
-    plt.ylabel('Relative Error')
-    plt.xlabel('Epsilon')
-    plt.yscale('log')
-    plt.savefig(os.path.join(output_dir, 'kstar_error.png'))
-    plt.close()
+    _plot_band(df[df['metric'].str.contains('2-StarCount')],
+               '2-Star Count Error: Clipped vs Smooth Sensitivity', os.path.join(output_dir, 'kstar_error.png'))
 
     # Plot 3: Edge Count Error
-    plt.figure(figsize=(10, 6))
-    edge_df = df[df['metric'] == 'EdgeCount']
-    sns.lineplot(data=edge_df, x='epsilon', y='rel_error', marker='o', color='green')
-    plt.title('Edge Count Error')
-    plt.ylabel('Relative Error')
-    plt.xlabel('Epsilon')
-    plt.yscale('log')
-    plt.savefig(os.path.join(output_dir, 'edge_error.png'))
-    plt.close()
+    _plot_band(df[df['metric'] == 'EdgeCount'], 'Edge Count Error', os.path.join(output_dir, 'edge_error.png'),
+               colors=['green'])
 
     print(f"Plots saved to {output_dir}")
 
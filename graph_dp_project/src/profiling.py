@@ -0,0 +1,80 @@
+import heapq
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Phases recorded by GraphDPAlgorithms and LocalStatistics
+PHASES = ("subgraph", "local_compute", "sensitivity", "noise", "parallel")
+
+
+class PhaseProfiler:
+    """
+    Opt-in timing surface for GraphDPAlgorithms. Accumulates wall time and call
+    counts per phase and keeps the `top_k` slowest observers (subgraph build plus
+    local compute) seen in per-observer loops.
+
+    If `callback` is given it is called as callback(event) for every recorded
+    phase, with event = {"phase", "seconds", "count"}, so timings can be forwarded
+    to a metrics system as they happen. Nothing is timed unless a profiler is
+    attached; see GraphDPAlgorithms(profiler=...).
+    """
+    def __init__(self, top_k: int = 10, callback: Optional[Callable[[Dict], None]] = None):
+        self.top_k = top_k
+        self.callback = callback
+        self.reset()
+
+    def reset(self):
+        self.seconds: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        # Min-heap of (seconds, node, degree); the root is the fastest retained outlier
+        self._outliers: List[Tuple[float, int, int]] = []
+
+    def record(self, phase: str, seconds: float, count: int = 1):
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + seconds
+        self.counts[phase] = self.counts.get(phase, 0) + count
+        if self.callback is not None:
+            self.callback({"phase": phase, "seconds": seconds, "count": count})
+
+    @contextmanager
+    def phase(self, name: str, count: int = 1):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, count)
+
+    def record_node(self, node: int, degree: int, seconds: float):
+        """
+        Offers one observer's total time to the outlier list.
+        """
+        entry = (seconds, node, degree)
+        if len(self._outliers) < self.top_k:
+            heapq.heappush(self._outliers, entry)
+        elif self._outliers and seconds > self._outliers[0][0]:
+            heapq.heapreplace(self._outliers, entry)
+
+    def outliers(self) -> List[Dict]:
+        """
+        Slowest observers first.
+        """
+        return [{"node": node, "degree": degree, "seconds": seconds}
+                for seconds, node, degree in sorted(self._outliers, reverse=True)]
+
+    def report(self) -> Dict:
+        """
+        Structured summary: per-phase totals, counts and mean seconds, plus outliers.
+        """
+        phases = {name: {"seconds": total, "count": self.counts[name], "mean_seconds": total / max(self.counts[name], 1)}
+                  for name, total in self.seconds.items()}
+        return {"phases": phases, "total_seconds": sum(self.seconds.values()), "outliers": self.outliers()}
+
+
+# Shared no-op context returned when profiling is off
+_NO_PHASE = nullcontext()
+
+
+def timed_phase(profiler: Optional[PhaseProfiler], name: str, count: int = 1):
+    """
+    profiler.phase(name, count), or a no-op context if `profiler` is None.
+    """
+    return _NO_PHASE if profiler is None else profiler.phase(name, count)
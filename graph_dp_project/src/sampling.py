@@ -0,0 +1,194 @@
+import numpy as np
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from .csr import CSRGraph, gather_row_positions
+
+# Walk steps drawn per block by random_walk_sample
+WALK_BLOCK = 1024
+
+
+def as_csr(graph) -> CSRGraph:
+    """
+    `graph` itself if it is a CSRGraph, else its CSR conversion (networkx input).
+    """
+    return graph if isinstance(graph, CSRGraph) else CSRGraph.from_networkx(graph)
+
+
+def _first_unvisited(candidates: np.ndarray, visited: np.ndarray, limit: int) -> np.ndarray:
+    # Distinct unvisited candidates in order of first appearance, at most `limit`
+    candidates = candidates[~visited[candidates]]
+    _, first = np.unique(candidates, return_index=True)
+    return candidates[np.sort(first)][:limit]
+
+
+def _shuffled_rows(indptr: np.ndarray, indices: np.ndarray, rows: np.ndarray,
+                   rng: np.random.Generator) -> Tuple:
+    # Neighbors of `rows` in row order, each row in random order; returns (neighbors, owning slot)
+    positions, lens = gather_row_positions(indptr, rows)
+    slot = np.repeat(np.arange(len(rows), dtype=np.int64), lens)
+    order = np.lexsort((rng.random(len(positions)), slot))
+    return indices[positions[order]].astype(np.int64), slot[order]
+
+
+def _start_index(n: int, start: Optional[int], rng: np.random.Generator) -> int:
+    # CSR index the sample starts from: `start` itself, or uniform if None
+    if start is None:
+        return int(rng.integers(n))
+    if not 0 <= start < n:
+        raise ValueError(f"Start index {start} out of range for {n} nodes")
+    return int(start)
+
+
+def bfs_sample(csr: CSRGraph, size: int, rng: np.random.Generator, start: Optional[int] = None) -> np.ndarray:
+    """
+    Breadth-first sample of up to `size` nodes from `start` (random if None),
+    visiting each node's neighbors in random order. Expands whole BFS levels at
+    once; stops early if the start node's component is smaller than `size`.
+    Returns CSR indices in visit order.
+    """
+    n = len(csr.node_ids)
+    if n == 0 or size <= 0:
+        return np.empty(0, dtype=np.int64)
+    visited = np.zeros(n, dtype=bool)
+    frontier = np.array([_start_index(n, start, rng)], dtype=np.int64)
+    visited[frontier] = True
+    sample = [frontier]
+    taken = 1
+    while taken < size and len(frontier):
+        neighbors, _ = _shuffled_rows(csr.indptr, csr.indices, frontier, rng)
+        frontier = _first_unvisited(neighbors, visited, size - taken)
+        visited[frontier] = True
+        sample.append(frontier)
+        taken += len(frontier)
+    return np.concatenate(sample)
+
+
+def forest_fire_sample(csr: CSRGraph, size: int, rng: np.random.Generator, p_forward: float = 0.7) -> np.ndarray:
+    """
+    Forest-fire sample of `size` nodes (Leskovec & Faloutsos, 2006): every burning
+    node ignites Geometric(1 - p_forward) - 1 of its unburned neighbors (mean
+    p_forward / (1 - p_forward)), level by level; when the fire dies out it
+    restarts from a random unburned node. Returns CSR indices in burn order.
+    """
+    n = len(csr.node_ids)
+    size = min(size, n)
+    visited = np.zeros(n, dtype=bool)
+    sample = []
+    taken = 0
+    frontier = np.empty(0, dtype=np.int64)
+    while taken < size:
+        if not len(frontier):
+            unburned = np.flatnonzero(~visited)
+            frontier = unburned[rng.integers(len(unburned))][None]
+            visited[frontier] = True
+            sample.append(frontier)
+            taken += 1
+            continue
+        neighbors, slot = _shuffled_rows(csr.indptr, csr.indices, frontier, rng)
+        fresh = ~visited[neighbors]
+        neighbors, slot = neighbors[fresh], slot[fresh]
+        # Rank within each burning node's (shuffled) unburned neighbors; keep the first x of them
+        starts = np.searchsorted(slot, np.arange(len(frontier)))
+        rank = np.arange(len(slot)) - starts[slot]
+        burn = rng.geometric(1.0 - p_forward, size=len(frontier)) - 1
+        frontier = _first_unvisited(neighbors[rank < burn[slot]], visited, size - taken)
+        visited[frontier] = True
+        sample.append(frontier)
+        taken += len(frontier)
+    return np.concatenate(sample) if sample else np.empty(0, dtype=np.int64)
+
+
+def random_walk_sample(csr: CSRGraph, size: int, rng: np.random.Generator, restart: float = 0.15,
+                       start: Optional[int] = None, max_steps: Optional[int] = None) -> np.ndarray:
+    """
+    Random walk with restart: from `start` (random if None) the walker moves to a
+    uniform neighbor, or jumps back to the start with probability `restart` (and
+    whenever it hits a node without neighbors), until `size` distinct nodes are
+    seen or `max_steps` (default 100 * size) steps are taken. Randomness is drawn
+    in blocks of WALK_BLOCK steps. Returns CSR indices in first-visit order.
+    """
+    n = len(csr.node_ids)
+    if n == 0 or size <= 0:
+        return np.empty(0, dtype=np.int64)
+    max_steps = 100 * size if max_steps is None else max_steps
+    indptr, indices = csr.indptr, csr.indices
+    origin = _start_index(n, start, rng)
+    current = origin
+    seen = {origin: None}
+    steps = 0
+    while len(seen) < size and steps < max_steps:
+        jumps = (rng.random(WALK_BLOCK) < restart).tolist()
+        picks = rng.random(WALK_BLOCK).tolist()
+        for jump, pick in zip(jumps, picks):
+            lo, hi = int(indptr[current]), int(indptr[current + 1])
+            current = origin if jump or lo == hi else int(indices[lo + int(pick * (hi - lo))])
+            seen.setdefault(current)
+            steps += 1
+            if len(seen) >= size or steps >= max_steps:
+                break
+    # dicts keep insertion order, i.e. first-visit order
+    return np.fromiter(seen, dtype=np.int64, count=len(seen))
+
+
+def induced_edge_sample(csr: CSRGraph, size: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Totally induced edge sampling (Ahmed et al., 2013): endpoints of uniformly
+    random edges are added until `size` nodes are selected; the caller's
+    induced subgraph then restores every edge among them. Edges are drawn as
+    uniform CSR entries in chunks, so the cost does not grow with the edge count.
+    Returns CSR indices in selection order.
+    """
+    n = len(csr.node_ids)
+    entries = len(csr.indices)
+    size = min(size, int(np.count_nonzero(np.diff(csr.indptr))))
+    visited = np.zeros(n, dtype=bool)
+    sample = []
+    taken = 0
+    while taken < size:
+        picks = rng.integers(entries, size=2 * (size - taken) + 16)
+        rows = np.searchsorted(csr.indptr, picks, side="right") - 1
+        endpoints = np.column_stack([rows, csr.indices[picks].astype(np.int64)]).ravel()
+        chosen = _first_unvisited(endpoints, visited, size - taken)
+        visited[chosen] = True
+        sample.append(chosen)
+        taken += len(chosen)
+    return np.concatenate(sample) if sample else np.empty(0, dtype=np.int64)
+
+
+SAMPLERS: Dict[str, Callable] = {
+    "bfs": bfs_sample,
+    "forest_fire": forest_fire_sample,
+    "random_walk": random_walk_sample,
+    "induced_edge": induced_edge_sample,
+}
+
+
+def sample_nodes(graph, method: str, size: int, num_samples: int = 1, seed: Optional[int] = None,
+                 **params) -> List[np.ndarray]:
+    """
+    `num_samples` independent node samples (original node ids) drawn with
+    SAMPLERS[method]. Sample i uses SeedSequence(seed).spawn(num_samples)[i], so
+    a batch is reproducible and sample i does not depend on the others.
+    """
+    return list(_iter_samples(as_csr(graph), method, size, num_samples, seed, params))
+
+
+def _iter_samples(csr: CSRGraph, method: str, size: int, num_samples: int, seed: Optional[int],
+                  params: Dict) -> Iterator[np.ndarray]:
+    if method not in SAMPLERS:
+        raise ValueError(f"Unknown sampler: {method}")
+    sampler = SAMPLERS[method]
+    for child in np.random.SeedSequence(seed).spawn(num_samples):
+        yield csr.node_ids[sampler(csr, size, np.random.default_rng(child), **params)]
+
+
+def sample_subgraphs(graph, method: str, size: int, num_samples: int = 1, seed: Optional[int] = None,
+                     **params) -> Iterator:
+    """
+    Induced subgraphs on sample_nodes(...), built lazily one at a time from the
+    CSR arrays: CSRGraph for CSR input, networkx (nodes in ascending id order)
+    for networkx input.
+    """
+    csr = as_csr(graph)
+    for nodes in _iter_samples(csr, method, size, num_samples, seed, params):
+        subgraph = csr.subgraph(nodes)
+        yield subgraph if isinstance(graph, CSRGraph) else subgraph.to_networkx()
@@ -0,0 +1,148 @@
+import json
+import os
+import struct
+import zlib
+import numpy as np
+from typing import Dict, Optional, Tuple
+from .csr import CSRGraph
+
+# On-disk layout (little endian):
+#   prefix  : magic, format version, header length, header crc32
+#   header  : UTF-8 JSON with the array table and selection metadata
+#   arrays  : raw C-order buffers, each starting on a 64-byte boundary
+SNAPSHOT_MAGIC = b"GDPSNAP\x00"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = ".gdps"
+_PREFIX = struct.Struct("<8sIII")
+_ALIGN = 64
+
+# Arrays every snapshot carries, in file order
+SNAPSHOT_ARRAYS = ("indptr", "indices", "node_ids", "public_mask")
+
+
+def _crc32(array: np.ndarray) -> int:
+    return zlib.crc32(memoryview(np.ascontiguousarray(array)).cast("B"))
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def default_snapshot_path(data_path: str) -> str:
+    """
+    Snapshot file used for a text edge list: the same path plus SNAPSHOT_SUFFIX.
+    """
+    return data_path + SNAPSHOT_SUFFIX
+
+
+def source_signature(path: str) -> Dict:
+    """
+    Size and mtime of a text edge list, stored so stale snapshots are detected.
+    """
+    stat = os.stat(path)
+    return {"path": os.path.abspath(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def write_snapshot(path: str, csr: CSRGraph, public_mask: np.ndarray, metadata: Optional[Dict] = None):
+    """
+    Writes a CSR graph, its public mask and free-form metadata as one snapshot.
+    The file is written under a temporary name and renamed into place, so
+    concurrent readers never see a partial snapshot.
+    """
+    arrays = {"indptr": csr.indptr, "indices": csr.indices, "node_ids": csr.node_ids,
+              "public_mask": np.asarray(public_mask, dtype=bool)}
+    table = {}
+    # Offsets are relative to the end of the header, which is only known after encoding it
+    offset = 0
+    for name in SNAPSHOT_ARRAYS:
+        array = np.ascontiguousarray(arrays[name])
+        offset = _aligned(offset)
+        table[name] = {"offset": offset, "dtype": array.dtype.str, "shape": list(array.shape), "crc32": _crc32(array)}
+        offset += array.nbytes
+    header = json.dumps({"arrays": table, "metadata": metadata or {}}, sort_keys=True).encode("utf-8")
+    data_start = _aligned(_PREFIX.size + len(header))
+
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(_PREFIX.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(header), zlib.crc32(header)))
+            f.write(header)
+            for name in SNAPSHOT_ARRAYS:
+                f.seek(data_start + table[name]["offset"])
+                f.write(memoryview(np.ascontiguousarray(arrays[name])).cast("B"))
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def read_header(path: str) -> Dict:
+    """
+    Validates the snapshot prefix and header and returns the decoded header.
+    Each array entry gains an absolute `file_offset` usable with np.memmap.
+    """
+    with open(path, "rb") as f:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size:
+            raise ValueError(f"{path} is not a graph snapshot (file too short)")
+        magic, version, header_len, header_crc = _PREFIX.unpack(prefix)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a graph snapshot (bad magic)")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"{path} has snapshot format version {version}, expected {SNAPSHOT_VERSION}")
+        header = f.read(header_len)
+    if len(header) != header_len or zlib.crc32(header) != header_crc:
+        raise ValueError(f"{path} has a corrupt snapshot header")
+    decoded = json.loads(header.decode("utf-8"))
+    data_start = _aligned(_PREFIX.size + header_len)
+    for entry in decoded["arrays"].values():
+        entry["file_offset"] = data_start + entry["offset"]
+    return decoded
+
+
+def map_array(path: str, entry: Dict) -> np.ndarray:
+    """
+    Read-only memory map of one array described by a header entry.
+    """
+    shape = tuple(entry["shape"])
+    if int(np.prod(shape)) == 0:
+        # np.memmap rejects zero-length maps
+        return np.empty(shape, dtype=np.dtype(entry["dtype"]))
+    return np.memmap(path, dtype=np.dtype(entry["dtype"]), mode="r", offset=entry["file_offset"], shape=shape)
+
+
+def read_snapshot(path: str, verify: bool = True) -> Tuple[CSRGraph, np.ndarray, Dict]:
+    """
+    Opens a snapshot without copying: the CSR arrays and public mask are np.memmap
+    views, so processes opening the same file share its page-cache pages.
+    With `verify`, every array is checked against its stored crc32 (one
+    sequential read); the header is always checked.
+    Returns (csr, public_mask, header).
+    """
+    header = read_header(path)
+    arrays = {}
+    for name in SNAPSHOT_ARRAYS:
+        entry = header["arrays"][name]
+        arrays[name] = map_array(path, entry)
+        if verify and _crc32(arrays[name]) != entry["crc32"]:
+            raise ValueError(f"{path}: checksum mismatch in array '{name}'")
+    csr = CSRGraph(arrays["indptr"], arrays["indices"], arrays["node_ids"])
+    return csr, arrays["public_mask"], header
+
+
+def snapshot_is_current(path: str, source_path: str, selection: Dict) -> bool:
+    """
+    True if `path` is a readable snapshot of the current `source_path` built
+    with the same public node selection parameters (every key of `selection`,
+    such as the fraction, strategy and seed, must match the stored value).
+    """
+    if not os.path.exists(path):
+        return False
+    try:
+        metadata = read_header(path)["metadata"]
+    except ValueError:
+        return False
+    source = source_signature(source_path)
+    stored = metadata.get("source", {})
+    return (stored.get("size") == source["size"] and stored.get("mtime_ns") == source["mtime_ns"]
+            and all(metadata.get(key) == value for key, value in selection.items()))
@@ -0,0 +1,192 @@
+import queue
+import threading
+import time
+import numpy as np
+from typing import Dict, Iterable, Iterator, Optional, Set
+from .csr import CSRGraph
+from .model import SocialGraph, VisibilityOracle
+from .algorithms import GraphDPAlgorithms
+
+# Default split of each window's epsilon across the released statistics
+DEFAULT_SHARES = {"edge_count": 1.0 / 3, "triangle_count": 1.0 / 3, "degree_histogram": 1.0 / 3}
+
+# Marks the end of a stage's output; an exception instance is forwarded the same way
+_DONE = object()
+
+
+def tumbling_windows(stream: Iterable, window_size: Optional[int], window_seconds: Optional[float]) -> Iterator[Dict]:
+    """
+    Cuts an edge stream into tumbling windows. Items are (u, v) or (u, v, t);
+    count windows hold `window_size` edges, time windows cover
+    [k * window_seconds, (k + 1) * window_seconds) and expect non-decreasing t.
+    Only the current window's edges are buffered.
+    """
+    src, dst = [], []
+    index, start, position = 0, None, 0
+    for item in stream:
+        if window_seconds is not None:
+            slot = int(item[2] // window_seconds)
+            if start is None:
+                start = slot
+            elif slot != start:
+                yield {"window": index, "start": start * window_seconds, "end": (start + 1) * window_seconds,
+                       "src": np.asarray(src, dtype=np.int64), "dst": np.asarray(dst, dtype=np.int64)}
+                index, start, src, dst = index + 1, slot, [], []
+        src.append(item[0])
+        dst.append(item[1])
+        position += 1
+        if window_seconds is None and len(src) == window_size:
+            yield {"window": index, "start": position - window_size, "end": position,
+                   "src": np.asarray(src, dtype=np.int64), "dst": np.asarray(dst, dtype=np.int64)}
+            index, src, dst = index + 1, [], []
+    if src:
+        if window_seconds is not None:
+            bounds = (start * window_seconds, (start + 1) * window_seconds)
+        else:
+            bounds = (position - len(src), position)
+        yield {"window": index, "start": bounds[0], "end": bounds[1],
+               "src": np.asarray(src, dtype=np.int64), "dst": np.asarray(dst, dtype=np.int64)}
+
+
+class StreamingRelease:
+    """
+    Continuous DP release over an edge stream in tumbling windows. Every window's
+    graph is released independently through GraphDPAlgorithms.run_queries: a noisy
+    edge count, triangle count and degree histogram spending `epsilon` per window,
+    split by `shares`. Windows are disjoint, so each edge is covered by exactly
+    one window's budget (parallel composition across windows).
+
+    releases() is a three-stage pipeline linked by bounded queues: a thread
+    ingests the stream and cuts windows, a second builds window t+1's graph,
+    local statistics and noise while the caller publishes window t, and the
+    caller pulls finished releases. With `max_pending` windows in flight per
+    queue, a slow consumer blocks the workers, which stop reading the stream
+    (backpressure), so memory stays bounded by a few windows.
+
+    Public users are `public_nodes` if given (restricted to each window's nodes),
+    otherwise chosen per window with `public_fraction`/`public_strategy` as in
+    SocialGraph. Noise is seeded per window from `seed`, so the output does not
+    depend on thread timing.
+    """
+    def __init__(self, epsilon: float, window_size: Optional[int] = 10000, window_seconds: Optional[float] = None,
+                 shares: Optional[Dict[str, float]] = None, policy: str = "1-hop",
+                 public_nodes: Optional[Set[int]] = None, public_fraction: float = 0.0,
+                 public_strategy: str = "degree_top_k", backend: str = "csr", max_degree: int = 50,
+                 D_max: int = 50, max_pending: int = 2, seed: Optional[int] = None):
+        if epsilon <= 0:
+            raise ValueError(f"Per-window epsilon must be positive, got {epsilon}")
+        if window_seconds is None and (window_size is None or window_size <= 0):
+            raise ValueError("Need a positive window_size or a window_seconds")
+        shares = dict(DEFAULT_SHARES if shares is None else shares)
+        unknown = set(shares) - set(DEFAULT_SHARES)
+        if unknown:
+            raise ValueError(f"Unknown released statistics: {sorted(unknown)}")
+        if any(share <= 0 for share in shares.values()) or sum(shares.values()) > 1.0 + 1e-12:
+            raise ValueError(f"Shares must be positive and sum to at most 1, got {shares}")
+        self.epsilon = epsilon
+        self.window_size = window_size
+        self.window_seconds = window_seconds
+        self.shares = shares
+        self.oracle = VisibilityOracle(policy=policy)
+        self.public_nodes = public_nodes
+        self.public_fraction = public_fraction
+        self.public_strategy = public_strategy
+        self.backend = backend
+        self.max_degree = max_degree
+        self.D_max = D_max
+        self.max_pending = max_pending
+        self.seed = seed
+
+    def _queries(self):
+        params = {"degree_histogram": {"max_degree": self.max_degree}, "triangle_count": {"D_max": self.D_max}}
+        return [dict(query=query, epsilon=self.epsilon * share, **params.get(query, {}))
+                for query, share in self.shares.items()]
+
+    def _window_graph(self, window: Dict) -> SocialGraph:
+        graph = SocialGraph(public_fraction=self.public_fraction, public_strategy=self.public_strategy,
+                            backend=self.backend)
+        csr = CSRGraph.from_edges(window["src"], window["dst"])
+        graph.graph = csr if self.backend == "csr" else csr.to_networkx()
+        if self.public_nodes is None:
+            graph._select_public_nodes()
+        else:
+            graph.public_nodes = set(csr.node_ids[np.isin(csr.node_ids, list(self.public_nodes))].tolist())
+        return graph
+
+    def release_window(self, window: Dict, seed) -> Dict:
+        """
+        Releases one window ({"window", "start", "end", "src", "dst"}) with its own noise stream.
+        """
+        start = time.perf_counter()
+        graph = self._window_graph(window)
+        algo = GraphDPAlgorithms(graph, self.oracle, seed=seed)
+        batch = algo.run_queries(self._queries(), budget=self.epsilon)
+        release = {"window": window["window"], "start": window["start"], "end": window["end"],
+                   "num_edges": len(window["src"]), "num_nodes": graph.graph.number_of_nodes()}
+        for result in batch["results"]:
+            release[result["query"]] = result["estimate"]
+        release["budget"] = batch["budget"]
+        release["compute_s"] = time.perf_counter() - start
+        return release
+
+    def releases(self, stream: Iterable) -> Iterator[Dict]:
+        """
+        Yields one release dict per window, in stream order. Closing the generator
+        early stops both worker threads.
+        """
+        windows: queue.Queue = queue.Queue(self.max_pending)
+        results: queue.Queue = queue.Queue(self.max_pending)
+        stop = threading.Event()
+
+        def put(q: queue.Queue, item) -> bool:
+            # Blocking put that gives up once the consumer has gone away
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def ingest():
+            try:
+                for window in tumbling_windows(stream, self.window_size, self.window_seconds):
+                    if not put(windows, window):
+                        return
+                put(windows, _DONE)
+            except Exception as exc:
+                put(windows, exc)
+
+        def compute():
+            seeds = np.random.SeedSequence(self.seed)
+            while True:
+                window = windows.get()
+                if window is _DONE or isinstance(window, Exception):
+                    put(results, window)
+                    return
+                try:
+                    release = self.release_window(window, seeds.spawn(1)[0])
+                except Exception as exc:
+                    put(results, exc)
+                    return
+                if not put(results, release):
+                    return
+
+        threads = [threading.Thread(target=ingest, daemon=True), threading.Thread(target=compute, daemon=True)]
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                item = results.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            # Unblock a compute thread still waiting for its next window
+            try:
+                windows.put_nowait(_DONE)
+            except queue.Full:
+                pass
@@ -0,0 +1,228 @@
+import numpy as np
+from typing import Iterator, List, Tuple
+from .csr import gather_row_positions
+
+# Upper bound on wedges materialized per block; keeps memory flat on hub-heavy graphs
+DEFAULT_MAX_WEDGES = 1 << 22
+
+
+def orient_by_degree(indptr: np.ndarray, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Degree-ordered orientation of an undirected CSR graph: every edge points from
+    the endpoint with lower (degree, index) rank to the higher one, so each node
+    keeps at most O(sqrt(m)) out-neighbors.
+    Returns (out_indptr, out_dst, out_src); oriented edge e is out_src[e] -> out_dst[e]
+    and rows stay sorted by destination index.
+    """
+    n = len(indptr) - 1
+    deg = np.diff(indptr).astype(np.int64)
+    rank = np.empty(n, dtype=np.int64)
+    rank[np.lexsort((np.arange(n), deg))] = np.arange(n)
+    src = np.repeat(np.arange(n, dtype=np.int64), deg)
+    dst = indices.astype(np.int64)
+    keep = rank[src] < rank[dst]
+    out_src = src[keep]
+    out_dst = dst[keep]
+    out_indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(out_src, minlength=n), out=out_indptr[1:])
+    return out_indptr, out_dst, out_src
+
+
+def iter_triangles(out_indptr: np.ndarray, out_dst: np.ndarray, out_src: np.ndarray,
+                   max_wedges: int = DEFAULT_MAX_WEDGES) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Lists every triangle exactly once over an oriented graph (see orient_by_degree).
+    For each oriented edge u -> v, the out-row of v is intersected with the
+    out-row of u by a binary search over the sorted (src, dst) edge keys.
+    Yields blocks of oriented edge ids (e_uv, e_uw, e_vw).
+    """
+    n = len(out_indptr) - 1
+    m = len(out_dst)
+    if m == 0:
+        return
+    keys = out_src * n + out_dst
+    wedges_per_edge = np.diff(out_indptr)[out_dst]
+    cum = np.cumsum(wedges_per_edge)
+    start = 0
+    while start < m:
+        base = int(cum[start - 1]) if start else 0
+        end = max(int(np.searchsorted(cum, base + max_wedges, side="right")), start + 1)
+        e_uv = np.arange(start, end, dtype=np.int64)
+        e_vw, lens = gather_row_positions(out_indptr, out_dst[e_uv])
+        if len(e_vw):
+            query = np.repeat(out_src[e_uv], lens) * n + out_dst[e_vw]
+            e_uw = np.minimum(np.searchsorted(keys, query), m - 1)
+            hit = keys[e_uw] == query
+            if hit.any():
+                yield np.repeat(e_uv, lens)[hit], e_uw[hit], e_vw[hit]
+        start = end
+
+
+def triangle_stats(indptr: np.ndarray, indices: np.ndarray,
+                   max_wedges: int = DEFAULT_MAX_WEDGES) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-node triangle counts and per-node max common neighbors for all nodes in one pass.
+    The max common neighbors of u is max over neighbors v of |N(u) ∩ N(v)|, i.e. the
+    largest number of triangles on any edge incident to u.
+    """
+    n = len(indptr) - 1
+    out_indptr, out_dst, out_src = orient_by_degree(indptr, indices)
+    m = len(out_dst)
+    triangles = np.zeros(n, dtype=np.int64)
+    support = np.zeros(m, dtype=np.int64)
+    for e_uv, e_uw, e_vw in iter_triangles(out_indptr, out_dst, out_src, max_wedges):
+        corners = np.concatenate([out_src[e_uv], out_dst[e_uv], out_dst[e_uw]])
+        triangles += np.bincount(corners, minlength=n)
+        support += np.bincount(np.concatenate([e_uv, e_uw, e_vw]), minlength=m)
+    max_common = np.zeros(n, dtype=np.int64)
+    np.maximum.at(max_common, out_src, support)
+    np.maximum.at(max_common, out_dst, support)
+    return triangles, max_common
+
+
+def neighborhood_stats(indptr: np.ndarray, indices: np.ndarray, owner: np.ndarray, members: np.ndarray,
+                       num_owners: int, max_wedges: int = DEFAULT_MAX_WEDGES) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-observer kernel: observer `owner[k]` has neighbor subset containing
+    `members[k]` (owner ascending). For every observer returns the number of
+    edges among its members and the max over members v of |N(v) ∩ members|.
+    Each observer is independent, so any slice of observers can be computed alone.
+    """
+    n = len(indptr) - 1
+    edges_among = np.zeros(num_owners, dtype=np.int64)
+    max_common = np.zeros(num_owners, dtype=np.int64)
+    if len(members) == 0:
+        return edges_among, max_common
+    owner = owner.astype(np.int64)
+    members = members.astype(np.int64)
+    sorted_keys = np.sort(owner * n + members)
+    # Process members in blocks so the gathered neighbor rows stay bounded
+    row_lens = (indptr[members + 1] - indptr[members]).astype(np.int64)
+    cum = np.cumsum(row_lens)
+    start = 0
+    while start < len(members):
+        base = int(cum[start - 1]) if start else 0
+        end = max(int(np.searchsorted(cum, base + max_wedges, side="right")), start + 1)
+        positions, lens = gather_row_positions(indptr, members[start:end])
+        if len(positions):
+            slot = np.repeat(np.arange(start, end, dtype=np.int64), lens)
+            query = owner[slot] * n + indices[positions]
+            loc = np.minimum(np.searchsorted(sorted_keys, query), len(sorted_keys) - 1)
+            hit = sorted_keys[loc] == query
+            edges_among += np.bincount(owner[slot[hit]], minlength=num_owners)
+            common = np.bincount(slot[hit] - start, minlength=end - start)
+            np.maximum.at(max_common, owner[start:end], common)
+        start = end
+    # Each edge among the members was seen from both endpoints
+    return edges_among // 2, max_common
+
+
+def prefix_triangles(indptr: np.ndarray, indices: np.ndarray, prefixes: List[np.ndarray],
+                     max_wedges: int = DEFAULT_MAX_WEDGES) -> np.ndarray:
+    """
+    For each neighbor subset in `prefixes`, counts the edges among its members
+    (the triangles closed at a node restricted to those neighbors).
+    """
+    if not prefixes:
+        return np.zeros(0, dtype=np.int64)
+    sizes = np.array([len(p) for p in prefixes], dtype=np.int64)
+    owner = np.repeat(np.arange(len(prefixes), dtype=np.int64), sizes)
+    members = np.concatenate(prefixes) if sizes.sum() else np.empty(0, dtype=np.int64)
+    return neighborhood_stats(indptr, indices, owner, members, len(prefixes), max_wedges)[0]
+
+
+def _pair_ranks_to_slots(rank: np.ndarray, size: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Inverse of the row-major ranking of pairs (i, j), i < j < size, per entry
+    b = 2.0 * size - 1.0
+    i = np.floor((b - np.sqrt(np.maximum(b * b - 8.0 * rank, 0.0))) / 2.0).astype(np.int64)
+    # Correct floating-point rounding by one step either way
+    i -= (i * (2 * size - i - 1) // 2) > rank
+    i += ((i + 1) * (2 * size - i - 2) // 2) <= rank
+    return i, rank - i * (2 * size - i - 1) // 2 + i + 1
+
+
+def _distinct_pair_ranks(pairs: np.ndarray, taken: np.ndarray,
+                         rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    For every owner i, taken[i] distinct ranks drawn uniformly without
+    replacement from [0, pairs[i]), independently of where anything sits in the
+    owner's neighbor list. Owners with at most 2 * taken pairs shuffle all of
+    them; larger ones redraw taken[i] * 2 ranks with replacement until at least
+    taken[i] are distinct. The kept ranks are a random subset of the
+    candidates, so every taken-subset is equally likely.
+    Returns (owner, rank) with owners ascending.
+    """
+    owners = np.arange(len(pairs), dtype=np.int64)
+    small = pairs <= 2 * taken
+    cand_owner = [np.repeat(owners[small], pairs[small])]
+    cand_rank = [np.arange(int(pairs[small].sum()), dtype=np.int64)
+                 - np.repeat(np.cumsum(pairs[small]) - pairs[small], pairs[small])]
+    pending = owners[~small]
+    while len(pending):
+        owner = np.repeat(pending, 2 * taken[pending])
+        rank = np.minimum((rng.random(len(owner)) * pairs[owner]).astype(np.int64), pairs[owner] - 1)
+        order = np.lexsort((rank, owner))
+        owner, rank = owner[order], rank[order]
+        first = np.ones(len(owner), dtype=bool)
+        first[1:] = (owner[1:] != owner[:-1]) | (rank[1:] != rank[:-1])
+        owner, rank = owner[first], rank[first]
+        enough = np.bincount(owner, minlength=len(pairs)) >= taken
+        done = enough[owner]
+        cand_owner.append(owner[done])
+        cand_rank.append(rank[done])
+        pending = pending[~enough[pending]]
+    owner = np.concatenate(cand_owner)
+    rank = np.concatenate(cand_rank)
+    order = np.lexsort((rng.random(len(owner)), owner))
+    owner, rank = owner[order], rank[order]
+    counts = np.bincount(owner, minlength=len(pairs))
+    slot = np.arange(len(owner), dtype=np.int64) - np.repeat(np.cumsum(counts) - counts, counts)
+    keep = slot < taken[owner]
+    return owner[keep], rank[keep]
+
+
+def sampled_neighbor_triangles(indptr: np.ndarray, indices: np.ndarray, lens: np.ndarray, members: np.ndarray,
+                               samples: int, rng: np.random.Generator,
+                               max_wedges: int = DEFAULT_MAX_WEDGES) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Estimated number of edges among each owner's neighbor list, the owner's
+    lists being consecutive runs of `members` with lengths `lens`. An owner with
+    W = d(d-1)/2 pairs checks all of them if W <= samples; otherwise it checks
+    `samples` pairs drawn uniformly without replacement (see
+    _distinct_pair_ranks), so the Horvitz-Thompson estimate hits * W/samples is
+    unbiased and the simple-random-sampling variance estimate
+    W^2 (1 - samples/W) r(1 - r) / (samples - 1), r the hit rate, is unbiased too.
+    Returns (estimates, variance estimates, weights W/checked); exact owners
+    have variance 0 and weight 1.
+    """
+    n = len(indptr) - 1
+    num_owners = len(lens)
+    lens = lens.astype(np.int64)
+    pairs = lens * (lens - 1) // 2
+    checked = np.minimum(pairs, samples)
+    hits = np.zeros(num_owners, dtype=np.int64)
+    starts = np.cumsum(lens) - lens
+    # Globally sorted (row, col) keys of the CSR graph, for O(log m) edge tests
+    edge_keys = np.repeat(np.arange(n, dtype=np.int64), np.diff(indptr)) * n + indices
+    cum = np.cumsum(checked)
+    start = 0
+    while start < num_owners:
+        base = int(cum[start - 1]) if start else 0
+        end = max(int(np.searchsorted(cum, base + max_wedges, side="right")), start + 1)
+        local, rank = _distinct_pair_ranks(pairs[start:end], checked[start:end], rng)
+        if len(local):
+            owner = local + start
+            i, j = _pair_ranks_to_slots(rank, lens[owner])
+            a = members[starts[owner] + i].astype(np.int64)
+            b = members[starts[owner] + j].astype(np.int64)
+            query = a * n + b
+            loc = np.minimum(np.searchsorted(edge_keys, query), len(edge_keys) - 1)
+            hit = (edge_keys[loc] == query) if len(edge_keys) else np.zeros(len(query), dtype=bool)
+            hits += np.bincount(owner[hit], minlength=num_owners)
+        start = end
+    weights = np.where(checked > 0, pairs / np.maximum(checked, 1), 1.0)
+    estimates = hits * weights
+    rate = hits / np.maximum(checked, 1)
+    correction = np.where(pairs > 0, 1.0 - checked / np.maximum(pairs, 1), 0.0)
+    variances = pairs.astype(float) ** 2 * rate * (1.0 - rate) / np.maximum(checked - 1, 1) * correction
+    return estimates, variances, weights
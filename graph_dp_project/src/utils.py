@@ -1,5 +1,8 @@
 import numpy as np
-import networkx as nx
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import networkx as nx
 
 def laplace_mechanism(true_value: float, sensitivity: float, epsilon: float) -> float:
     """
@@ -9,6 +12,37 @@ def laplace_mechanism(true_value: float, sensitivity: float, epsilon: float) ->
     noise = np.random.laplace(0, scale)
     return true_value + noise
 
+def laplace_mechanism_batch(true_values: np.ndarray, sensitivities, epsilon: float,
+                            public_mask: Optional[np.ndarray] = None,
+                            rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Vectorized Laplace mechanism over many local values.
+    `sensitivities` is a scalar or a per-value array. Entries flagged in
+    `public_mask` are released exactly; all private entries are perturbed
+    with a single draw from `rng`, so a seeded Generator gives reproducible output.
+    """
+    noisy = np.array(true_values, dtype=float)
+    scales = np.broadcast_to(np.asarray(sensitivities, dtype=float) / epsilon, noisy.shape)
+    if rng is None:
+        rng = np.random.default_rng()
+    if public_mask is None:
+        noisy += rng.laplace(0.0, scales)
+    else:
+        private = ~np.asarray(public_mask, dtype=bool)
+        noisy[private] += rng.laplace(0.0, scales[private])
+    return noisy
+
+def histogram_counts(values: np.ndarray, max_value: int) -> np.ndarray:
+    """
+    Counts of `values` in unit bins [0, 1), ..., [max_value, max_value + 1], the
+    same bins as np.histogram(values, bins=range(max_value + 2)) but with one
+    np.bincount; values outside [0, max_value + 1] are dropped.
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[(values >= 0) & (values <= max_value + 1)]
+    # The right edge max_value + 1 belongs to the last bin
+    return np.bincount(np.minimum(values.astype(np.int64), max_value), minlength=max_value + 1)
+
 def geometric_mechanism(true_value: int, sensitivity: float, epsilon: float) -> int:
     """
     Discrete Laplace (Geometric) mechanism for integer outputs.
@@ -21,38 +55,53 @@ def geometric_mechanism(true_value: int, sensitivity: float, epsilon: float) ->
     noise = np.random.laplace(0, scale)
     return int(round(true_value + noise))
 
-def perform_random_walk(graph: nx.Graph, start_node: int, walk_length: int) -> list:
+def perform_random_walk(graph: "nx.Graph", start_node: int, walk_length: int) -> list:
     """
     Performs a random walk starting from start_node.
     """
-    path = [start_node]
-    current = start_node
-    for _ in range(walk_length):
-        neighbors = list(graph.neighbors(current))
-        if not neighbors:
+    from .sampling import as_csr
+    csr = as_csr(graph)
+    indptr, indices = csr.indptr, csr.indices
+    current = csr.index_of(start_node)
+    if current < 0:
+        # The error nx.Graph.neighbors raises, whichever backend is walked
+        from networkx import NetworkXError
+        raise NetworkXError(f"The node {start_node} is not in the graph.")
+    path = [current]
+    # One vectorized draw for the whole walk; stops at a node without neighbors
+    for pick in np.random.random(walk_length).tolist():
+        lo, hi = int(indptr[current]), int(indptr[current + 1])
+        if lo == hi:
             break
-        current = np.random.choice(neighbors)
+        current = int(indices[lo + int(pick * (hi - lo))])
         path.append(current)
-    return path
-
-def sample_power_law_subgraph(graph: nx.Graph, size: int) -> nx.Graph:
-    """
-    Samples a subgraph using Random Walk to preserve power-law properties roughly.
-    """
-    start_node = np.random.choice(graph.nodes())
-    nodes_to_keep = set([start_node])
-    
-    # Simple BFS or RW expansion until size is met
-    queue = [start_node]
-    while len(nodes_to_keep) < size and queue:
-        current = queue.pop(0)
-        neighbors = list(graph.neighbors(current))
-        np.random.shuffle(neighbors)
-        for n in neighbors:
-            if n not in nodes_to_keep:
-                nodes_to_keep.add(n)
-                queue.append(n)
-                if len(nodes_to_keep) >= size:
-                    break
-                    
-    return graph.subgraph(nodes_to_keep).copy()
+    return csr.node_ids[path].tolist()
+
+def generate_power_law_graph(num_nodes: int, avg_degree: float = 10.0, exponent: float = 2.5,
+                             seed: Optional[int] = None):
+    """
+    Chung-Lu style power-law graph as a CSRGraph: node i gets weight
+    (i + 1)^(-1 / (exponent - 1)) and num_nodes * avg_degree / 2 endpoint pairs are
+    drawn proportional to weight. Self-loops and duplicates are dropped, so the
+    realized average degree is slightly below `avg_degree`.
+    """
+    from .csr import CSRGraph
+    rng = np.random.default_rng(seed)
+    weights = np.arange(1, num_nodes + 1, dtype=float) ** (-1.0 / (exponent - 1.0))
+    weights /= weights.sum()
+    num_edges = int(num_nodes * avg_degree / 2)
+    src = rng.choice(num_nodes, size=num_edges, p=weights)
+    dst = rng.choice(num_nodes, size=num_edges, p=weights)
+    return CSRGraph.from_edges(src, dst, node_ids=np.arange(num_nodes))
+
+def sample_power_law_subgraph(graph: "nx.Graph", size: int, seed: Optional[int] = None) -> "nx.Graph":
+    """
+    Samples a connected subgraph by BFS with shuffled neighbor order from a random
+    start node (see sampling.bfs_sample), keeping the hubs and degree skew of
+    the start's neighborhood. Without `seed`, one is drawn from the global
+    NumPy state so np.random.seed() keeps the sample reproducible.
+    """
+    from .sampling import sample_subgraphs
+    if seed is None:
+        seed = int(np.random.randint(2**63 - 1, dtype=np.int64))
+    return next(sample_subgraphs(graph, "bfs", size, seed=seed))
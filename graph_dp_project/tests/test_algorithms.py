@@ -0,0 +1,83 @@
+import math
+import numpy as np
+import pytest
+from conftest import make_graph
+from src.model import VisibilityOracle
+from src.algorithms import GraphDPAlgorithms
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+def test_degree_bound_tracks_private_max_degree_with_public_hubs(backend):
+    graph = make_graph(backend, num_nodes=2000, avg_degree=12, public_fraction=0.2)
+    algo = GraphDPAlgorithms(graph, VisibilityOracle(policy="1-hop"), seed=0)
+    degrees, public = algo.stats.degrees(), algo.stats.public_mask
+    private_max, public_max = int(degrees[~public].max()), int(degrees[public].max())
+    assert public_max > 2 * private_max
+    # ceil(d + noise) with negligible noise is d or d + 1
+    assert algo.noisy_degree_bound(1e9) in (private_max, private_max + 1)
+    estimate, sensitivity = algo.k_star_count_two_round(2, 1e9)
+    assert sensitivity <= private_max
+    clipped = np.where(public, degrees, np.minimum(degrees, int(sensitivity) + 1))
+    assert math.isclose(estimate, sum(math.comb(int(d), 2) for d in clipped), rel_tol=1e-9)
+
+
+def test_degree_bound_of_an_all_public_graph_uses_exact_degrees():
+    graph = make_graph("csr", public_fraction=1.0)
+    algo = GraphDPAlgorithms(graph, VisibilityOracle(policy="1-hop"), seed=0)
+    degrees = algo.stats.degrees()
+    assert algo.noisy_degree_bound(0.01) == degrees.max()
+    assert algo.noisy_degree_bound(0.01, quantile=0.5) == math.ceil(np.quantile(degrees, 0.5))
+
+
+BATCH = [
+    {"query": "edge_count", "epsilon": 0.5},
+    {"query": "degree_histogram", "epsilon": 0.5, "max_degree": 20},
+    {"query": "triangle_count", "epsilon": 1.0, "D_max": 10},
+    {"query": "triangle_count_smooth", "epsilon": 1.0},
+    {"query": "k_star_count", "epsilon": 1.0, "k": 3},
+    {"query": "k_star_count_smooth", "epsilon": 1.0, "k": 2},
+    {"query": "max_degree", "epsilon": 0.5},
+    {"query": "k_star_count_two_round", "epsilon": 1.0, "k": 2, "round1_fraction": 0.25},
+]
+
+
+@pytest.mark.parametrize("policy", ["1-hop", "2-hop"])
+def test_run_queries_matches_the_methods_called_in_order(social_graph, policy):
+    oracle = VisibilityOracle(policy=policy)
+    batch = GraphDPAlgorithms(social_graph, oracle, seed=7).run_queries(BATCH)
+    algo = GraphDPAlgorithms(social_graph, oracle, seed=7)
+    for spec, result in zip(BATCH, batch["results"]):
+        params = {name: value for name, value in spec.items() if name not in ("query", "epsilon")}
+        assert (result["query"], result["epsilon"], result["params"]) == (spec["query"], spec["epsilon"], params)
+        assert (result["estimate"], result["sensitivity"]) == getattr(algo, spec["query"])(epsilon=spec["epsilon"], **params)
+
+
+def test_run_queries_prefetches_every_statistic_once(social_graph):
+    algo = GraphDPAlgorithms(social_graph, VisibilityOracle(policy="2-hop"), seed=0)
+    algo.run_queries(BATCH)
+    assert {("degree",), ("triangles",), ("max_common",), ("triangles", 10)} <= set(algo.stats._values)
+
+
+def test_run_queries_budget_accounting(social_graph):
+    algo = GraphDPAlgorithms(social_graph, VisibilityOracle(policy="1-hop"), seed=0)
+    budget = algo.run_queries(BATCH, budget=10.0)["budget"]
+    assert budget["total_epsilon"] == pytest.approx(6.5)
+    assert budget["limit"] == 10.0 and budget["remaining"] == pytest.approx(3.5)
+    rounds = {entry["query"]: entry.get("rounds") for entry in budget["queries"]}
+    assert rounds["edge_count"] is None
+    assert rounds["max_degree"] == [0.25, 0.25]
+    assert rounds["k_star_count_two_round"] == [0.25, 0.75]
+    assert algo.run_queries(BATCH[:1])["budget"]["remaining"] is None
+
+
+@pytest.mark.parametrize("queries, budget", [
+    (BATCH, 6.0),
+    ([{"query": "no_such_query", "epsilon": 1.0}], None),
+    ([{"query": "edge_count", "epsilon": 0.0}], None),
+])
+def test_run_queries_rejects_a_batch_before_drawing_noise(social_graph, queries, budget):
+    algo = GraphDPAlgorithms(social_graph, VisibilityOracle(policy="1-hop"), seed=0)
+    state = algo.rng.bit_generator.state
+    with pytest.raises(ValueError):
+        algo.run_queries(queries, budget=budget)
+    assert algo.rng.bit_generator.state == state
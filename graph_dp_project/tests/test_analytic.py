@@ -0,0 +1,14 @@
+import numpy as np
+from src import analytic
+
+
+def test_chunked_density_matches_one_block(monkeypatch):
+    scales = np.random.default_rng(0).random(3000)
+    x, density = analytic.laplace_sum_density(scales, grid=1 << 12)
+    monkeypatch.setattr(analytic, "CHUNK_ELEMENTS", 1 << 40)
+    x_full, density_full = analytic.laplace_sum_density(scales, grid=1 << 12)
+    assert np.array_equal(x, x_full)
+    assert np.allclose(density, density_full, rtol=0, atol=1e-12 * density.max())
+    # Variance of the gridded density matches 2 * sum(scales^2)
+    dx = x[1] - x[0]
+    assert np.isclose((x ** 2 * density).sum() * dx, 2.0 * (scales ** 2).sum(), rtol=1e-3)
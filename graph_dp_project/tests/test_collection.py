@@ -0,0 +1,77 @@
+import asyncio
+import numpy as np
+import pytest
+from conftest import make_graph
+from src.algorithms import GraphDPAlgorithms
+from src.collection import Collection, LocalView, REPORT_DTYPE, report_inputs, run_load
+from src.model import VisibilityOracle
+
+# Noise this small leaves every release equal to the noise-free value up to rounding
+HUGE_EPSILON = 1e12
+QUERIES = [
+    {"query": "edge_count"},
+    {"query": "triangle_count", "D_max": 10},
+    {"query": "triangle_count_smooth"},
+    {"query": "k_star_count", "k": 3, "D_max": 20},
+    {"query": "k_star_count_smooth", "k": 2},
+    {"query": "degree_histogram", "max_degree": 20},
+    {"query": "max_degree"},
+]
+
+
+@pytest.fixture(scope="module")
+def setup():
+    graph = make_graph(backend="networkx", num_nodes=300)
+    oracle = VisibilityOracle("2-hop")
+    return graph, oracle, graph.local_statistics(oracle)
+
+
+def test_aggregator_matches_algorithms(setup):
+    graph, oracle, stats = setup
+    queries = [dict(spec, epsilon=HUGE_EPSILON) for spec in QUERIES]
+    out = asyncio.run(run_load(stats, queries, connections=3, batch_size=64, seed=0))
+    algo = GraphDPAlgorithms(graph, oracle, seed=0)
+    for spec, row in zip(queries, out["results"]):
+        params = {name: value for name, value in spec.items() if name not in ("query", "epsilon")}
+        estimate, sensitivity = getattr(algo, spec["query"])(epsilon=HUGE_EPSILON, **params)
+        assert np.allclose(np.asarray(row["estimate"], dtype=float), np.asarray(estimate, dtype=float),
+                           rtol=1e-9, atol=1e-3), spec
+        assert np.isclose(row["sensitivity"], sensitivity), spec
+
+
+@pytest.mark.parametrize("spec", QUERIES + [{"query": "k_star_count_two_round", "k": 2}])
+def test_local_view_matches_bulk_inputs(setup, spec):
+    graph, oracle, stats = setup
+    params = {name: value for name, value in spec.items() if name != "query"}
+    round = {"collection": 0, "phase": 0, "epsilon": 1.0, "query": spec["query"], "params": params,
+             "candidates": stats.nodes[:10]}
+    values, sens, reporting = report_inputs(round, stats)
+    for i in np.random.default_rng(0).choice(len(stats.nodes), 30):
+        view_values, view_sens, view_reporting = report_inputs(round, LocalView(graph, stats.nodes[i], oracle))
+        assert (view_values[0], view_sens[0], view_reporting[0]) == (values[i], sens[i], reporting[i])
+
+
+def _exact_records(round, stats):
+    values, sens, reporting = report_inputs(round, stats)
+    records = np.empty(int(reporting.sum()), dtype=REPORT_DTYPE)
+    records["node"] = np.asarray(stats.nodes)[reporting]
+    records["value"] = values[reporting]
+    records["sensitivity"] = sens[reporting]
+    return records
+
+
+@pytest.mark.parametrize("public_fraction", [0.2, 1.0])
+def test_two_round_bound_matches_algorithms(public_fraction):
+    graph = make_graph(num_nodes=300, public_fraction=public_fraction)
+    oracle = VisibilityOracle("1-hop")
+    stats = graph.local_statistics(oracle)
+    collection = Collection(0, "k_star_count_two_round", 1.0, {"k": 2, "quantile": 0.9})
+    collection.add(0, _exact_records(collection.round(), stats))
+    bound = collection.close()["bound"]
+
+    # Noise-free round 1 of GraphDPAlgorithms: the quantile of the private degrees only
+    algo = GraphDPAlgorithms(graph, oracle, seed=0)
+    assert bound == max(2, algo.noisy_degree_bound(np.inf, 0.9))
+    degrees = stats.degrees()
+    private = degrees[~stats.public_mask] if (~stats.public_mask).any() else degrees
+    assert bound == max(2, int(np.ceil(np.quantile(private, 0.9))))
@@ -0,0 +1,38 @@
+import math
+import networkx as nx
+import numpy as np
+import pytest
+from conftest import make_graph
+from src.edge_ldp import EdgeLDPAlgorithms, debias_count, rr_truth_probability
+
+
+@pytest.fixture(scope="module")
+def small_graph():
+    return make_graph(num_nodes=60, avg_degree=8.0, public_fraction=0.2, seed=5)
+
+
+def test_debiased_edge_count_is_unbiased(small_graph):
+    true_edges = small_graph.graph.number_of_edges()
+    algo = EdgeLDPAlgorithms(small_graph, seed=3)
+    trials = 200
+    estimates = np.array([algo.edge_count(1.0)[0] for _ in range(trials)])
+    std_of_mean = math.sqrt(algo.last_error["variance"] / trials)
+    assert abs(estimates.mean() - true_edges) < 4.0 * std_of_mean
+    # The recorded variance is the spread of the private part
+    assert estimates.var() == pytest.approx(algo.last_error["variance"], rel=0.3)
+
+
+def test_debias_count_inverts_the_expected_report():
+    p = rr_truth_probability(0.5)
+    n_total, ones = 1000, 120
+    expected_reports = ones * p + (n_total - ones) * (1.0 - p)
+    assert debias_count(expected_reports, n_total, p) == pytest.approx(ones)
+    assert debias_count(0.0, n_total, p) == 0.0
+
+
+def test_huge_epsilon_reproduces_exact_counts(small_graph):
+    csr = small_graph.as_csr()
+    true_triangles = sum(nx.triangles(csr.to_networkx()).values()) / 3
+    algo = EdgeLDPAlgorithms(small_graph, seed=3)
+    assert algo.edge_count(1e3) == (float(small_graph.graph.number_of_edges()), 1.0)
+    assert algo.triangle_count(1e3) == (float(true_triangles), 1.0)
@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+import pytest
+
+PROJECT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependencies only the paths that need them may load
+HEAVY = ("networkx", "pandas", "matplotlib", "seaborn", "pyarrow")
+
+
+def loaded_after(code: str):
+    # A fresh interpreter: this one has long since imported networkx
+    check = f"import sys\n{code}\nprint('loaded:' + ','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", check], cwd=PROJECT, capture_output=True, text=True, check=True)
+    return [m for m in result.stdout.rsplit("loaded:", 1)[1].strip().split(",") if m]
+
+
+@pytest.mark.parametrize("module", ["src.benchmark", "src.benchmark_suite", "src.cli", "src.algorithms",
+                                    "src.experiment", "src.monte_carlo"])
+def test_importing_loads_no_heavy_dependency(module):
+    assert loaded_after(f"import {module}") == []
+
+
+def test_query_command_runs_on_numpy_alone(tmp_path):
+    path = tmp_path / "edges.txt"
+    path.write_text("0 1\n1 2\n2 0\n2 3\n")
+    code = (f"from src.cli import main\n"
+            f"main(['query', '--metric', 'triangles', '--metric', 'edges', '--eps', '1.0', '--seed', '0', {str(path)!r}])")
+    assert loaded_after(code) == []
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from conftest import make_graph
+from src.model import VisibilityOracle
+from src.local_stats import LocalStatistics
+
+KEYS = [("degree",), ("triangles",), ("max_common",), ("triangles", 6), ("k_stars", 2, None), ("k_stars", 3, 10)]
+
+
+def _edges(graph):
+    return {tuple(sorted(edge)) for edge in graph.graph.edges()}
+
+
+@pytest.mark.parametrize("policy", ["1-hop", "2-hop"])
+def test_incremental_updates_match_full_recompute(social_graph, policy):
+    oracle = VisibilityOracle(policy=policy)
+    stats = social_graph.local_statistics(oracle)
+    stats.prefetch(KEYS)
+    rng = np.random.default_rng(1)
+    nodes = np.array(sorted(social_graph.graph.nodes()))
+    expected = _edges(social_graph)
+    for _ in range(10):
+        edges = np.array(sorted(_edges(social_graph)))
+        deletions = edges[rng.choice(len(edges), 6, replace=False)]
+        # Random pairs, a deleted edge re-added and an existing edge added again
+        additions = np.vstack([rng.choice(nodes, (6, 2)), deletions[:1], edges[:1]])
+        social_graph.apply_edge_updates(additions, deletions)
+        expected -= {tuple(sorted(e)) for e in deletions.tolist()}
+        expected |= {tuple(sorted(e)) for e in additions.tolist() if e[0] != e[1]}
+        assert _edges(social_graph) == expected
+
+        updated = social_graph.local_statistics(oracle)
+        assert updated is stats
+        fresh = LocalStatistics(social_graph, oracle, 0)
+        for key in KEYS:
+            assert np.array_equal(updated.value(key), fresh.value(key)), key
+
+
+def test_updates_with_new_nodes_invalidate(social_graph):
+    oracle = VisibilityOracle(policy="1-hop")
+    social_graph.local_statistics(oracle).prefetch(KEYS)
+    new_node = 10 ** 7
+    social_graph.apply_edge_updates([(new_node, 1)], [], verify=True)
+    assert new_node in social_graph.graph
+    stats = social_graph.local_statistics(oracle)
+    fresh = LocalStatistics(social_graph, oracle, 0)
+    for key in KEYS:
+        assert np.array_equal(stats.value(key), fresh.value(key)), key
+
+
+@pytest.mark.parametrize("kind", ["insert", "delete", "mixed"])
+def test_edge_update_delta_matches_recomputed_triangles(kind):
+    from src.local_stats import EdgeUpdateDelta
+    from src.triangles import triangle_stats
+    csr = make_graph(backend="csr", num_nodes=300).as_csr()
+    rng = np.random.default_rng(4)
+    edges = np.array(csr.edges(), dtype=np.int64)
+    deletions = edges[rng.choice(len(edges), 20, replace=False)] if kind != "insert" else np.empty((0, 2), np.int64)
+    additions = rng.integers(0, len(csr), (20, 2)) if kind != "delete" else np.empty((0, 2), np.int64)
+    additions = additions[additions[:, 0] != additions[:, 1]]
+    del_idx, add_idx = csr.indices_of(deletions.ravel()).reshape(-1, 2), additions
+    updated = csr.with_edge_updates(add_idx[:, 0], add_idx[:, 1], del_idx[:, 0], del_idx[:, 1])
+    delta = EdgeUpdateDelta(csr, add_idx, del_idx)
+
+    before, _ = triangle_stats(csr.indptr, csr.indices)
+    after, _ = triangle_stats(updated.indptr, updated.indices)
+    expected = {int(i): int(d) for i, d in enumerate(after - before) if d}
+    assert {x: d for x, d in delta.triangles.items() if d} == expected
+    changed = np.flatnonzero(updated.degrees() != csr.degrees())
+    assert set(changed.tolist()) <= delta.endpoints
+    assert set(np.unique(np.concatenate([add_idx.ravel(), del_idx.ravel()])).tolist()) == delta.endpoints
@@ -0,0 +1,69 @@
+import math
+import numpy as np
+import pytest
+from conftest import make_graph
+from src.kstars import binomials, clipped_sensitivity, k_star_counts, k_star_sensitivities, k_star_terms
+from src.model import VisibilityOracle
+
+DEGREES = np.concatenate([np.arange(0, 300), np.random.default_rng(0).integers(0, 5000, 300), [10 ** 5, 2 * 10 ** 6]])
+
+
+def _comb(d: int, k: int) -> int:
+    return math.comb(d, k) if 0 <= k <= d else 0
+
+
+@pytest.mark.parametrize("k", list(range(0, 40)) + [60, 100, 500, 1000, 5000])
+def test_binomials_match_math_comb(k):
+    got = binomials(DEGREES, k, overflow="inf")
+    for d, value in zip(DEGREES.tolist(), got.tolist()):
+        exact = _comb(d, k)
+        if exact < 2 ** 63:
+            assert value == float(exact), (d, k)
+        elif exact.bit_length() <= 1024 and float(exact) < np.finfo(float).max:
+            # Beyond int64 the product runs in extended precision: a few ulps at most
+            assert abs(value - float(exact)) <= 4 * np.spacing(float(exact)), (d, k)
+        else:
+            assert value == math.inf, (d, k)
+
+
+def test_several_ks_at_once():
+    ks = [1, 2, 3, 7]
+    table = binomials(DEGREES, ks, overflow="inf")
+    assert table.shape == (len(ks), len(DEGREES))
+    for row, k in zip(table, ks):
+        assert np.array_equal(row, binomials(DEGREES, k, overflow="inf"))
+    counts, sens = k_star_terms(DEGREES[:500], [2, 3])
+    assert np.array_equal(counts, binomials(DEGREES[:500], [2, 3]))
+    assert np.array_equal(sens, k_star_sensitivities(DEGREES[:500], [2, 3]))
+    assert np.array_equal(sens[0], np.maximum(1.0, DEGREES[:500].astype(float)))
+
+
+def test_overflow():
+    with pytest.raises(OverflowError):
+        binomials(np.array([2000]), 1000)
+    assert binomials(np.array([2000, 10]), 1000, overflow="inf").tolist() == [math.inf, 0.0]
+    with pytest.raises(ValueError):
+        binomials(np.array([10]), 2, overflow="clip")
+
+
+def test_clipped_counts_and_sensitivity():
+    public = np.zeros(len(DEGREES), dtype=bool)
+    public[::2] = True
+    clipped = np.where(public, DEGREES, np.minimum(DEGREES, 40))
+    expected = [float(_comb(d, 3)) for d in clipped.tolist()]
+    assert k_star_counts(DEGREES, 3, 40, public).tolist() == expected
+    assert clipped_sensitivity(50, 2) == 49.0
+    assert clipped_sensitivity(50, 5) == float(math.comb(49, 4))
+
+
+@pytest.mark.parametrize("k, clip", [(2, None), (3, None), (3, 10)])
+def test_local_statistics_match_degree_loop(k, clip):
+    graph = make_graph(backend="networkx")
+    stats = graph.local_statistics(VisibilityOracle("1-hop"))
+    expected = []
+    for node in stats.nodes:
+        d = graph.graph.degree(node)
+        if clip is not None and not graph.is_public(node):
+            d = min(d, clip)
+        expected.append(float(math.comb(d, k)))
+    assert stats.k_stars(k, clip).tolist() == expected
@@ -0,0 +1,186 @@
+import numpy as np
+import pytest
+from src.model import SocialGraph, VisibilityOracle
+from src.algorithms import GraphDPAlgorithms
+from src.local_stats import LocalStatistics
+from conftest import make_graph
+
+POLICIES = ("1-hop", "2-hop")
+
+STAT_KEYS = [("degree",), ("triangles",), ("max_common",), ("triangles", 5), ("k_stars", 2, None), ("k_stars", 3, 8)]
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+def test_statistics_are_shared_across_queries_and_epsilons(social_graph, policy):
+    oracle = VisibilityOracle(policy=policy)
+    first = GraphDPAlgorithms(social_graph, oracle, seed=0)
+    second = GraphDPAlgorithms(social_graph, VisibilityOracle(policy=policy), seed=1)
+    first.triangle_count_smooth(1.0)
+    second.triangle_count_smooth(0.1)
+    assert first.stats is second.stats
+    assert ("triangles",) in first.stats._values
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+def test_cached_statistics_match_a_fresh_computation(social_graph, policy):
+    oracle = VisibilityOracle(policy=policy)
+    shared = social_graph.local_statistics(oracle)
+    shared.prefetch(STAT_KEYS)
+    for key in STAT_KEYS:
+        assert np.array_equal(shared.value(key), LocalStatistics(social_graph, oracle, 0).value(key)), key
+
+
+def test_changing_public_nodes_invalidates_the_cache(social_graph):
+    oracle = VisibilityOracle(policy="1-hop")
+    before = social_graph.local_statistics(oracle)
+    social_graph.public_nodes = set()
+    after = social_graph.local_statistics(oracle)
+    assert after is not before
+    assert not after.public_mask.any()
+
+
+def test_run_queries_matches_sequential_calls(social_graph):
+    oracle = VisibilityOracle(policy="2-hop")
+    queries = [{"query": "edge_count", "epsilon": 0.5}, {"query": "triangle_count", "epsilon": 1.0, "D_max": 10},
+               {"query": "k_star_count_smooth", "epsilon": 1.0, "k": 2}]
+    batch = GraphDPAlgorithms(social_graph, oracle, seed=4).run_queries(queries, budget=3.0)
+    algo = GraphDPAlgorithms(social_graph, oracle, seed=4)
+    expected = [algo.edge_count(0.5), algo.triangle_count(1.0, D_max=10), algo.k_star_count_smooth(2, 1.0)]
+    assert [(r["estimate"], r["sensitivity"]) for r in batch["results"]] == expected
+    assert batch["budget"]["total_epsilon"] == 2.5
+    with pytest.raises(ValueError):
+        algo.run_queries(queries, budget=1.0)
+
+
+def old_visible_subgraph(nx_graph, observer, policy):
+    # The per-observer copy get_visible_subgraph used to materialize
+    import networkx as nx
+    subgraph = nx.Graph()
+    if policy == "1-hop":
+        for nbr in nx_graph.neighbors(observer):
+            subgraph.add_edge(observer, nbr)
+            for nbr_of_nbr in nx_graph.neighbors(nbr):
+                subgraph.add_edge(nbr, nbr_of_nbr)
+        return subgraph
+    nodes_at_dist_1 = set(nx_graph.neighbors(observer))
+    nodes_at_dist_2 = set()
+    for n1 in nodes_at_dist_1:
+        for n2 in nx_graph.neighbors(n1):
+            if n2 not in nodes_at_dist_1 and n2 != observer:
+                nodes_at_dist_2.add(n2)
+    return nx_graph.subgraph({observer} | nodes_at_dist_1 | nodes_at_dist_2).copy()
+
+
+def reference_triangles(graph, policy, clip):
+    # The original per-observer loop: the observer's (clipped) neighbor list in its materialized
+    # copy, and every pair of it joined by an edge the observer can see
+    import networkx as nx
+    oracle = VisibilityOracle(policy=policy)
+    counts = []
+    for node in graph.local_statistics(oracle).nodes:
+        if isinstance(graph.graph, nx.Graph):
+            subgraph = old_visible_subgraph(graph.graph, node, policy)
+        else:
+            subgraph = graph.get_visible_subgraph(node, oracle).to_networkx()
+        neighbors = list(subgraph.neighbors(node)) if node in subgraph else []
+        if clip is not None and not graph.is_public(node):
+            neighbors = neighbors[:clip]
+        counts.append(sum(1 for i, u in enumerate(neighbors) for v in neighbors[i + 1:] if subgraph.has_edge(u, v)))
+    return np.array(counts, dtype=np.int64)
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+@pytest.mark.parametrize("clip", [None, 3, 10])
+def test_triangle_engine_matches_per_observer_loop(social_graph, policy, clip):
+    stats = LocalStatistics(social_graph, VisibilityOracle(policy=policy), 0)
+    assert np.array_equal(stats.triangles(clip=clip), reference_triangles(social_graph, policy, clip))
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+def test_triangle_engine_matches_view_traversal(social_graph, policy):
+    # Same counts from the generic map_views path over VisibleSubgraphView objects
+    from src.local_stats import local_triangles
+    stats = LocalStatistics(social_graph, VisibilityOracle(policy=policy), 0)
+    def clipped(i, node, view):
+        if node not in view:
+            return 0
+        neighbors = list(view.neighbors(node))
+        return local_triangles(view, neighbors if stats.public_mask[i] else neighbors[:4])
+    assert np.array_equal(stats.triangles(clip=4), np.array(stats.map_views(clipped), dtype=np.int64))
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+def test_view_order_matches_the_old_copies(policy):
+    # Insertion order scrambled so adjacency order, node order and set order all disagree
+    import networkx as nx
+    base = nx.barabasi_albert_graph(300, 3, seed=2)
+    rng = np.random.default_rng(2)
+    nodes, edges = list(base), list(base.edges())
+    rng.shuffle(nodes)
+    rng.shuffle(edges)
+    graph = nx.Graph()
+    graph.add_nodes_from(node * 7 % 1009 for node in nodes)
+    graph.add_edges_from((u * 7 % 1009, v * 7 % 1009) for u, v in edges)
+    social = SocialGraph()
+    social.graph = graph
+    oracle = VisibilityOracle(policy=policy)
+    for observer in list(graph)[:60]:
+        old = old_visible_subgraph(graph, observer, policy)
+        view = social.get_visible_subgraph(observer, oracle)
+        copy = view.to_networkx()
+        assert list(copy) == list(old)
+        for node in old:
+            assert list(view.neighbors(node)) == list(old.neighbors(node)) == list(copy.neighbors(node))
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+def test_clipped_triangle_count_matches_the_materialized_copies(social_graph, policy):
+    clip = 4
+    oracle = VisibilityOracle(policy=policy)
+    stats = social_graph.local_statistics(oracle)
+    # Private hubs above the clip bound are what the neighbor order decides
+    assert (~stats.public_mask & (stats.degrees() > clip)).sum() > 10
+    expected = 0
+    for node in stats.nodes:
+        copy = social_graph.get_visible_subgraph(node, oracle).to_networkx()
+        neighbors = list(copy.neighbors(node)) if node in copy else []
+        if not social_graph.is_public(node):
+            neighbors = neighbors[:clip]
+        expected += sum(1 for i, u in enumerate(neighbors) for v in neighbors[i + 1:] if copy.has_edge(u, v))
+    estimate, _ = GraphDPAlgorithms(social_graph, oracle, seed=0).triangle_count(1e12, D_max=clip)
+    assert estimate == pytest.approx(expected / 3.0, abs=1e-6)
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+@pytest.mark.parametrize("clip", [None, 5])
+def test_sampled_triangles_are_exact_when_samples_cover_every_pair(policy, clip):
+    stats = LocalStatistics(make_graph(num_nodes=200), VisibilityOracle(policy=policy), 0)
+    most = int((stats.degrees() * (stats.degrees() - 1) // 2).max())
+    estimates, variances, weights = stats.sampled_triangles(most, np.random.default_rng(0), clip)
+    assert np.array_equal(estimates, stats.triangles(clip=clip).astype(float))
+    assert not variances.any() and (weights == 1.0).all()
+
+
+def test_sampled_pair_ranks_are_distinct_and_in_range():
+    from src.triangles import _distinct_pair_ranks
+    pairs = np.array([0, 1, 3, 10, 45, 10**9], dtype=np.int64)
+    taken = np.minimum(pairs, 4)
+    owner, rank = _distinct_pair_ranks(pairs, taken, np.random.default_rng(1))
+    assert np.array_equal(np.bincount(owner, minlength=len(pairs)), taken)
+    assert ((rank >= 0) & (rank < pairs[owner])).all()
+    assert len(set(zip(owner.tolist(), rank.tolist()))) == len(owner)
+
+
+def test_sampled_triangles_are_unbiased_with_calibrated_variance():
+    stats = LocalStatistics(make_graph(num_nodes=300, avg_degree=12.0), VisibilityOracle(policy="1-hop"), 0)
+    exact = float(stats.triangles().sum())
+    rng = np.random.default_rng(0)
+    totals, variances = [], []
+    for _ in range(300):
+        estimates, variance, weights = stats.sampled_triangles(8, rng)
+        totals.append(estimates.sum())
+        variances.append(variance.sum())
+    assert (weights > 1.0).sum() > 50
+    # Mean within four standard errors; reported variance matches the spread
+    assert abs(np.mean(totals) - exact) < 4.0 * np.std(totals) / np.sqrt(len(totals))
+    assert np.mean(variances) == pytest.approx(np.var(totals), rel=0.25)
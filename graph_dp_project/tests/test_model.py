@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from conftest import make_graph
+from src.algorithms import GraphDPAlgorithms
+from src.model import SocialGraph, VisibilityOracle
+from src.utils import laplace_mechanism_batch
+
+STRATEGIES = ("random", "degree_top_k", "degree_probabilistic")
+
+
+def _baseline_top_k(nx_graph, num_public):
+    # The original selection: sort by degree (stable, so ties keep node order) and take the first k
+    ranked = sorted(dict(nx_graph.degree()).items(), key=lambda item: item[1], reverse=True)
+    return {node for node, _ in ranked[:num_public]}
+
+
+@pytest.mark.parametrize("fraction", [0.05, 0.2, 0.5])
+def test_degree_top_k_matches_the_sorted_selection(fraction):
+    graph = make_graph("networkx", num_nodes=500, avg_degree=4.0, public_fraction=fraction)
+    assert graph.public_nodes == _baseline_top_k(graph.graph, int(len(graph.graph) * fraction))
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_selection_size_and_seeding(backend, strategy):
+    graph = make_graph(backend, num_nodes=400, public_fraction=0.0)
+    chosen = []
+    for seed in (1, 1, 2):
+        graph.public_fraction, graph.public_strategy, graph.seed = 0.25, strategy, seed
+        graph._select_public_nodes()
+        chosen.append(graph.public_nodes)
+    assert all(len(nodes) == 100 and nodes <= set(graph.graph.nodes()) for nodes in chosen)
+    assert chosen[0] == chosen[1]
+    if strategy != "degree_top_k":
+        assert chosen[0] != chosen[2]
+
+
+def test_degree_probabilistic_skips_isolated_nodes():
+    graph = SocialGraph(public_fraction=0.2, public_strategy="degree_probabilistic", seed=0)
+    graph.graph.add_edges_from((i, i + 1) for i in range(0, 100, 2))
+    graph.graph.add_nodes_from(range(100, 200))
+    graph._select_public_nodes()
+    assert len(graph.public_nodes) == 40 and max(graph.public_nodes) < 100
+    # Without any edge the draw is uniform
+    empty = SocialGraph(public_fraction=0.5, public_strategy="degree_probabilistic", seed=0)
+    empty.graph.add_nodes_from(range(10))
+    empty._select_public_nodes()
+    assert len(empty.public_nodes) == 5
+
+
+
+def test_degree_histogram_bins_noisy_reports_like_np_histogram(social_graph):
+    algo = GraphDPAlgorithms(social_graph, VisibilityOracle(policy="1-hop"), seed=0)
+    histogram, _ = algo.degree_histogram(1.0, max_degree=15)
+    true_degrees = np.minimum(algo.stats.degrees(), 15).astype(float)
+    noisy = laplace_mechanism_batch(true_degrees, 1.0, 1.0, algo.stats.public_mask, np.random.default_rng(0))
+    expected, _ = np.histogram(noisy, bins=range(17))
+    assert histogram == expected.tolist()
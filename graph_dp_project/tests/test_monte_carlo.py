@@ -0,0 +1,55 @@
+import csv
+import pytest
+import src.monte_carlo as monte_carlo
+from src.monte_carlo import METRICS, TrialStore, run_trials, write_summary_csv
+from src.plot_results import load_results
+from conftest import make_graph
+
+EPSILONS = (0.5, 2.0)
+
+
+@pytest.fixture
+def csv_only(monkeypatch):
+    # The store must work without pyarrow, installed or not
+    monkeypatch.setattr(monte_carlo, "_pyarrow_available", lambda: False)
+
+
+def test_trials_round_trip_through_the_store_and_the_plot_loader(tmp_path, csv_only):
+    store = str(tmp_path / "trials")
+    graph = make_graph(num_nodes=80, avg_degree=6.0)
+    summaries = run_trials(graph, EPSILONS, trials=40, graph_name="tiny", policy="1-hop", store=store, seed=0)
+    assert len(summaries) == len(METRICS) * len(EPSILONS)
+
+    stored = TrialStore(store).columns()
+    assert len(stored["rel_error"]) == 40 * len(summaries)
+    assert set(stored["graph"].tolist()) == {"tiny"}
+
+    rows = load_results(store)
+    assert rows == TrialStore(store).summary_rows()
+    assert [(r["metric"], r["epsilon"]) for r in rows] == sorted((m, e) for m in METRICS for e in EPSILONS)
+    expected = {(s["metric"], s["epsilon"]): s for s in summaries}
+    for row in rows:
+        summary = expected[(row["metric"], row["epsilon"])]
+        assert (row["graph"], row["policy"], row["trials"]) == ("tiny", "1-hop", 40)
+        for key in ("mean_rel_error", "std_rel_error", "mean_estimate", "ci_low", "ci_high"):
+            assert row[key] == pytest.approx(summary[key], rel=1e-9, abs=1e-12), key
+
+
+def test_a_second_run_appends_to_the_store(tmp_path, csv_only):
+    store = str(tmp_path / "trials")
+    graph = make_graph(num_nodes=80, avg_degree=6.0)
+    for seed in (0, 1):
+        run_trials(graph, EPSILONS, trials=10, metrics=["EdgeCount"], store=store, seed=seed)
+    assert {row["trials"] for row in load_results(store)} == {20}
+    assert len(set(TrialStore(store).columns(["run_id"])["run_id"].tolist())) == 2
+
+
+def test_summary_csv_keeps_the_original_columns(tmp_path):
+    graph = make_graph(num_nodes=80, avg_degree=6.0)
+    summaries = run_trials(graph, EPSILONS, trials=10, metrics=["EdgeCount"], seed=0)
+    path = tmp_path / "results_comprehensive.csv"
+    write_summary_csv(summaries, str(path))
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0])[:7] == ["graph", "epsilon", "metric", "true_val", "est_val", "rel_error", "sensitivity"]
+    assert [float(r["rel_error"]) for r in rows] == [s["mean_rel_error"] for s in summaries]
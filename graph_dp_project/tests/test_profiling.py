@@ -0,0 +1,31 @@
+from conftest import make_graph
+from src.model import VisibilityOracle
+from src.algorithms import GraphDPAlgorithms
+from src.profiling import PhaseProfiler
+
+QUERIES = [{"query": "edge_count", "epsilon": 1.0}, {"query": "triangle_count", "epsilon": 1.0, "D_max": 10},
+           {"query": "k_star_count_smooth", "epsilon": 1.0, "k": 2}]
+
+
+def test_profiling_does_not_change_results():
+    oracle = VisibilityOracle(policy="2-hop")
+    plain = GraphDPAlgorithms(make_graph("csr"), oracle, seed=2).run_queries(QUERIES)
+    events = []
+    profiler = PhaseProfiler(callback=events.append)
+    profiled = GraphDPAlgorithms(make_graph("csr"), oracle, seed=2, profiler=profiler).run_queries(QUERIES)
+    assert plain["results"] == profiled["results"]
+
+    report = profiler.report()
+    assert {"noise", "local_compute"} <= set(report["phases"])
+    # Every query draws noise once over all 400 nodes
+    assert report["phases"]["noise"]["count"] == 3 * 400
+    # The callback saw every recorded phase
+    for name, phase in report["phases"].items():
+        assert sum(e["count"] for e in events if e["phase"] == name) == phase["count"]
+        assert abs(sum(e["seconds"] for e in events if e["phase"] == name) - phase["seconds"]) < 1e-9
+
+def test_outliers_keep_the_slowest_observers():
+    profiler = PhaseProfiler(top_k=3)
+    for node, seconds in enumerate([0.5, 0.1, 0.9, 0.3, 0.7]):
+        profiler.record_node(node, degree=node, seconds=seconds)
+    assert [entry["node"] for entry in profiler.outliers()] == [2, 4, 0]
@@ -0,0 +1,65 @@
+import networkx as nx
+import numpy as np
+import pytest
+from src.sampling import SAMPLERS, bfs_sample, random_walk_sample, sample_nodes, sample_subgraphs
+from src.utils import generate_power_law_graph, perform_random_walk
+
+
+@pytest.fixture
+def csr():
+    return generate_power_law_graph(500, avg_degree=6.0, seed=5)
+
+
+@pytest.mark.parametrize("method", sorted(SAMPLERS))
+def test_samples_are_reproducible_per_seed(csr, method):
+    first = sample_nodes(csr, method, 40, num_samples=3, seed=11)
+    again = sample_nodes(csr, method, 40, num_samples=3, seed=11)
+    assert all(np.array_equal(a, b) for a, b in zip(first, again))
+    # Sample i only depends on its own spawned stream
+    assert np.array_equal(sample_nodes(csr, method, 40, num_samples=1, seed=11)[0], first[0])
+    assert not np.array_equal(sample_nodes(csr, method, 40, num_samples=1, seed=12)[0], first[0])
+    for nodes in first:
+        assert len(np.unique(nodes)) == len(nodes) <= 40
+        assert np.isin(nodes, csr.node_ids).all()
+
+
+@pytest.mark.parametrize("method", sorted(SAMPLERS))
+def test_subgraphs_are_induced_on_the_sampled_nodes(csr, method):
+    full = csr.to_networkx()
+    nodes = sample_nodes(full, method, 30, seed=2)[0]
+    subgraph = next(sample_subgraphs(full, method, 30, seed=2))
+    expected = full.subgraph(nodes.tolist())
+    assert sorted(subgraph) == sorted(expected)
+    assert {frozenset(e) for e in subgraph.edges()} == {frozenset(e) for e in expected.edges()}
+
+
+def test_unknown_sampler_is_rejected(csr):
+    with pytest.raises(ValueError):
+        sample_nodes(csr, "snowball", 10)
+
+
+@pytest.mark.parametrize("sampler", [bfs_sample, random_walk_sample])
+def test_explicit_start_must_be_a_csr_index(csr, sampler):
+    assert sampler(csr, 10, np.random.default_rng(0), start=7)[0] == 7
+    for start in (-1, len(csr.node_ids)):
+        with pytest.raises(ValueError):
+            sampler(csr, 10, np.random.default_rng(0), start=start)
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+def test_random_walk_is_seeded_and_follows_edges(csr, backend):
+    graph = csr.to_networkx() if backend == "networkx" else csr
+    start = int(csr.node_ids[np.argmax(csr.degrees())])
+    np.random.seed(4)
+    path = perform_random_walk(graph, start, 50)
+    np.random.seed(4)
+    assert perform_random_walk(graph, start, 50) == path
+    assert path[0] == start and len(path) == 51
+    assert all(graph.has_edge(u, v) for u, v in zip(path, path[1:]))
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+def test_random_walk_rejects_a_missing_start_node(csr, backend):
+    graph = csr.to_networkx() if backend == "networkx" else csr
+    with pytest.raises(nx.NetworkXError, match="not in the graph"):
+        perform_random_walk(graph, 10**6, 5)
@@ -0,0 +1,79 @@
+import os
+import numpy as np
+import pytest
+from conftest import make_graph
+from src.model import SocialGraph
+from src.snapshot import default_snapshot_path, read_snapshot, snapshot_is_current
+
+
+@pytest.fixture
+def edge_list(tmp_path):
+    graph = make_graph(num_nodes=300)
+    path = tmp_path / "graph.txt"
+    np.savetxt(path, np.array(graph.graph.edges(), dtype=np.int64), fmt="%d")
+    return str(path)
+
+
+def _open(path, **kwargs):
+    return SocialGraph(path, public_fraction=0.2, backend="csr", snapshot=True, **kwargs)
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+def test_round_trip(edge_list, tmp_path, backend):
+    graph = SocialGraph(edge_list, public_fraction=0.2, public_strategy="random", backend=backend, seed=5)
+    path = str(tmp_path / "copy.gdps")
+    graph.save_snapshot(path)
+    loaded = SocialGraph(path, backend=backend)
+    assert loaded.public_nodes == graph.public_nodes
+    assert (loaded.public_fraction, loaded.public_strategy) == (0.2, "random")
+    assert {tuple(sorted(e)) for e in loaded.graph.edges()} == {tuple(sorted(e)) for e in graph.graph.edges()}
+    csr, public_mask, header = read_snapshot(path)
+    assert np.array_equal(csr.indptr, graph.as_csr().indptr) and np.array_equal(csr.indices, graph.as_csr().indices)
+    assert np.array_equal(public_mask, graph.public_mask)
+    assert header["metadata"]["seed"] == 5
+
+
+def test_current_snapshot_is_reused(edge_list):
+    first = _open(edge_list, public_strategy="random", seed=1)
+    inode = os.stat(default_snapshot_path(edge_list)).st_ino
+    second = _open(edge_list, public_strategy="random", seed=1)
+    assert os.stat(default_snapshot_path(edge_list)).st_ino == inode
+    assert second.public_nodes == first.public_nodes
+
+
+def test_snapshot_with_a_different_seed_is_rebuilt(edge_list):
+    first = _open(edge_list, public_strategy="random", seed=1)
+    snapshot = default_snapshot_path(edge_list)
+    assert not snapshot_is_current(snapshot, edge_list, {**first._selection(), "seed": 2})
+    second = _open(edge_list, public_strategy="random", seed=2)
+    assert second.public_nodes == SocialGraph(edge_list, public_fraction=0.2, public_strategy="random",
+                                              backend="csr", seed=2).public_nodes
+    assert second.public_nodes != first.public_nodes
+    assert read_snapshot(snapshot)[2]["metadata"]["seed"] == 2
+
+
+def test_unseeded_random_selection_is_never_reused(edge_list):
+    _open(edge_list, public_strategy="degree_probabilistic")
+    inode = os.stat(default_snapshot_path(edge_list)).st_ino
+    _open(edge_list, public_strategy="degree_probabilistic")
+    assert os.stat(default_snapshot_path(edge_list)).st_ino != inode
+
+
+def test_seed_does_not_matter_for_degree_top_k(edge_list):
+    first = _open(edge_list, seed=1)
+    assert snapshot_is_current(default_snapshot_path(edge_list), edge_list, _open(edge_list, seed=2)._selection())
+    assert "seed" not in first._selection()
+
+
+def test_snapshot_is_stale_once_the_source_changes(edge_list):
+    _open(edge_list)
+    snapshot = default_snapshot_path(edge_list)
+    assert snapshot_is_current(snapshot, edge_list, {"public_fraction": 0.2, "public_strategy": "degree_top_k"})
+    stat = os.stat(edge_list)
+    os.utime(edge_list, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert not snapshot_is_current(snapshot, edge_list, {"public_fraction": 0.2, "public_strategy": "degree_top_k"})
+    with open(edge_list, "a") as f:
+        f.write("100000 100001\n")
+    graph = _open(edge_list)
+    assert 100000 in graph.graph
+    assert snapshot_is_current(snapshot, edge_list, graph._selection())
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from conftest import make_graph
+from src.algorithms import GraphDPAlgorithms
+from src.csr import CSRGraph
+from src.model import SocialGraph, VisibilityOracle
+from src.streaming import StreamingRelease, tumbling_windows
+
+WINDOW = 250
+
+
+@pytest.fixture(scope="module")
+def stream():
+    edges = np.array(make_graph(num_nodes=300).graph.edges(), dtype=np.int64)
+    return edges[np.random.default_rng(0).permutation(len(edges))].tolist()
+
+
+def _batch_release(edges, policy, seed):
+    # The same window released on its own through run_queries
+    edges = np.array(edges, dtype=np.int64)
+    graph = SocialGraph(public_fraction=0.2, backend="csr")
+    graph.graph = CSRGraph.from_edges(edges[:, 0], edges[:, 1])
+    graph._select_public_nodes()
+    queries = [{"query": "edge_count", "epsilon": 0.5}, {"query": "triangle_count", "epsilon": 0.25, "D_max": 10},
+               {"query": "degree_histogram", "epsilon": 0.25, "max_degree": 20}]
+    results = GraphDPAlgorithms(graph, VisibilityOracle(policy=policy), seed=seed).run_queries(queries)["results"]
+    return {result["query"]: result["estimate"] for result in results}
+
+
+@pytest.mark.parametrize("policy", ["1-hop", "2-hop"])
+def test_every_window_matches_a_batch_release(stream, policy):
+    shares = {"edge_count": 0.5, "triangle_count": 0.25, "degree_histogram": 0.25}
+    streaming = StreamingRelease(1.0, window_size=WINDOW, shares=shares, policy=policy, public_fraction=0.2,
+                                 max_degree=20, D_max=10, max_pending=1, seed=3)
+    releases = list(streaming.releases(iter(stream)))
+    assert [r["window"] for r in releases] == list(range(-(-len(stream) // WINDOW)))
+    seeds = np.random.SeedSequence(3).spawn(len(releases))
+    for release, seed in zip(releases, seeds):
+        edges = stream[release["start"]:release["end"]]
+        assert release["num_edges"] == len(edges)
+        expected = _batch_release(edges, policy, seed)
+        assert {query: release[query] for query in expected} == expected
+        assert release["budget"]["total_epsilon"] == pytest.approx(1.0)
+
+
+def test_time_windows():
+    items = [(0, 1, 0.0), (1, 2, 0.5), (2, 3, 1.0), (3, 4, 3.2), (4, 5, 3.9)]
+    windows = list(tumbling_windows(iter(items), None, 1.0))
+    assert [(w["start"], w["end"], w["src"].tolist()) for w in windows] == [(0.0, 1.0, [0, 1]), (1.0, 2.0, [2]),
+                                                                             (3.0, 4.0, [3, 4])]
+
+
+def test_closing_early_stops_the_pipeline(stream):
+    consumed = []
+
+    def source():
+        for edge in stream:
+            consumed.append(edge)
+            yield edge
+    releases = StreamingRelease(1.0, window_size=50, max_pending=1, seed=0).releases(source())
+    next(releases)
+    releases.close()
+    # Backpressure: at most a few windows were read ahead of the consumer
+    assert len(consumed) <= 50 * 6 < len(stream)
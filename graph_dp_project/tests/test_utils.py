@@ -0,0 +1,33 @@
+import numpy as np
+from src.utils import histogram_counts, laplace_mechanism, laplace_mechanism_batch
+
+
+def test_batch_noise_keeps_public_values_exact():
+    values = np.arange(1000, dtype=float)
+    public = np.zeros(1000, dtype=bool)
+    public[::3] = True
+    noisy = laplace_mechanism_batch(values, 2.0, 0.5, public, np.random.default_rng(0))
+    assert np.array_equal(noisy[public], values[public])
+    assert (noisy[~public] != values[~public]).all()
+
+
+def test_batch_noise_is_reproducible_and_matches_scalar_scale():
+    values = np.zeros(200000)
+    sens = np.where(np.arange(200000) % 2 == 0, 1.0, 4.0)
+    a = laplace_mechanism_batch(values, sens, 2.0, rng=np.random.default_rng(7))
+    b = laplace_mechanism_batch(values, sens, 2.0, rng=np.random.default_rng(7))
+    assert np.array_equal(a, b)
+    # Laplace(b) has mean absolute deviation b = sensitivity / epsilon
+    assert np.isclose(np.abs(a[::2]).mean(), 0.5, rtol=0.02)
+    assert np.isclose(np.abs(a[1::2]).mean(), 2.0, rtol=0.02)
+    np.random.seed(0)
+    scalar = np.array([laplace_mechanism(0.0, 4.0, 2.0) for _ in range(20000)])
+    assert np.isclose(np.abs(scalar).mean(), 2.0, rtol=0.05)
+
+
+def test_histogram_counts_match_np_histogram():
+    rng = np.random.default_rng(1)
+    values = np.concatenate([rng.normal(10.0, 8.0, 5000), np.arange(-2, 25, 0.5), [20.0, 21.0, 21.5, -1e-9]])
+    for max_value in (0, 5, 20):
+        expected, _ = np.histogram(values, bins=range(max_value + 2))
+        assert np.array_equal(histogram_counts(values, max_value), expected)
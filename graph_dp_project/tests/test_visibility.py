@@ -0,0 +1,89 @@
+import networkx as nx
+import numpy as np
+import pytest
+from src.csr import CSRGraph
+from src.model import VisibilityOracle
+
+POLICIES = ["1-hop", "2-hop", "global", "none"]
+
+
+@pytest.fixture(scope="module")
+def graph():
+    g = nx.gnm_random_graph(300, 900, seed=1)
+    # Isolated nodes and a component of one edge
+    g.add_nodes_from([1000, 1001])
+    g.add_edge(1002, 1003)
+    return g
+
+
+@pytest.fixture(scope="module")
+def edges(graph):
+    rng = np.random.default_rng(0)
+    nodes = np.array(list(graph))
+    # Random pairs (mostly non-edges, some self pairs) and real edges
+    return np.vstack([rng.choice(nodes, (400, 2)), np.array(list(graph.edges())[:200])])
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+def test_visible_mask_matches_is_visible(graph, edges, policy):
+    oracle = VisibilityOracle(policy)
+    csr = CSRGraph.from_networkx(graph)
+    observers = np.random.default_rng(1).choice(np.array(list(graph)), 15).tolist() + [1000, 1002]
+    for observer in observers:
+        expected = np.array([oracle.is_visible(graph, observer, tuple(edge)) for edge in edges.tolist()])
+        assert np.array_equal(oracle.visible_mask(graph, observer, edges), expected), observer
+        assert np.array_equal(oracle.visible_mask(csr, observer, edges), expected), observer
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+def test_observers_seeing_matches_is_visible(graph, edges, policy):
+    oracle = VisibilityOracle(policy)
+    csr = CSRGraph.from_networkx(graph)
+    for edge in edges[::10].tolist():
+        expected = [node for node in sorted(graph) if oracle.is_visible(graph, node, tuple(edge))]
+        assert oracle.observers_seeing(csr, tuple(edge)).tolist() == expected, edge
+
+
+def test_missing_nodes(graph):
+    csr = CSRGraph.from_networkx(graph)
+    edges = np.array([[5000, 3], [5000, 5001], [7, 7]])
+    one_hop = VisibilityOracle("1-hop")
+    for observer in (5000, 3):
+        expected = [one_hop.is_visible(graph, observer, tuple(edge)) for edge in edges.tolist()]
+        assert one_hop.visible_mask(csr, observer, edges).tolist() == expected
+    assert one_hop.observers_seeing(csr, (5000, 3)).tolist() == sorted([3] + list(graph[3]))
+    with pytest.raises(nx.NodeNotFound):
+        VisibilityOracle("2-hop").visible_mask(csr, 5000, edges)
+
+
+def view_reference(csr, policy):
+    # Every statistic of view_statistics, read off each observer's VisibleSubgraphView
+    from src.model import VisibleSubgraphView
+    rows = []
+    for observer in csr.node_ids.tolist():
+        view = VisibleSubgraphView(csr, observer, policy)
+        copy = view.to_networkx()
+        neighbors = list(view.neighbors(observer)) if observer in view else []
+        common = [sum(1 for w in view.neighbors(v) if view.has_edge(observer, w)) for v in neighbors]
+        triangles = sum(1 for i, u in enumerate(neighbors) for v in neighbors[i + 1:] if view.has_edge(u, v))
+        rows.append((copy.number_of_nodes(), copy.number_of_edges(), len(neighbors), triangles, max(common, default=0)))
+    return np.array(rows, dtype=np.int64).T
+
+
+@pytest.mark.parametrize("policy", ["1-hop", "2-hop"])
+@pytest.mark.parametrize("max_nnz", [None, 64])
+def test_view_statistics_match_the_per_observer_views(graph, policy, max_nnz):
+    from src.neighborhoods import adjacency_matrix, iter_view_blocks, view_statistics
+    csr = CSRGraph.from_networkx(graph)
+    params = {} if max_nnz is None else {"max_nnz": max_nnz}
+    if max_nnz is not None:
+        # Small enough that both the view blocks and the 2-hop edge sub-blocks split
+        assert len(list(iter_view_blocks(adjacency_matrix(csr), policy, max_nnz))) > 10
+    stats = view_statistics(csr, policy, count_edges=True, **params)
+    nodes, visible_edges, degree, triangles, max_common = view_reference(csr, policy)
+    assert np.array_equal(stats["visible_nodes"], nodes)
+    assert np.array_equal(stats["visible_edges"], visible_edges)
+    assert np.array_equal(stats["degree"], degree)
+    assert np.array_equal(stats["triangles"], triangles)
+    assert np.array_equal(stats["max_common"], max_common)
+    assert "visible_edges" not in view_statistics(csr, policy, **params)